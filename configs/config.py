@@ -1,14 +1,22 @@
 import os
+import time
 import yaml
 import logging
-from dotenv import load_dotenv
-
-# Load environment variables from .env file
-load_dotenv()
+import threading
+from types import MappingProxyType
+from dotenv import dotenv_values
 
 class Config:
-    """Configuration class for WealthSync application"""
+    """Configuration class for WealthSync application
+
+    Pages and services should use get_config(), which returns a read-only
+    snapshot shared by the whole process; construct Config directly only
+    for a private, mutable configuration.
+    """
     def __init__(self, config_path=None):
+        # Snapshot version; 0 for configurations created outside get_config()
+        self.version = 0
+        
         # Default configuration values
         self.data_dir = "data"
         self.raw_data_dir = os.path.join(self.data_dir, "raw")
@@ -19,9 +27,16 @@ class Config:
         # Database configuration
         self.db_path = os.path.join(self.data_dir, "wealthsync.db")
         
+        # Deployment mode: "single" keeps all state per process, "shared" lets several
+        # replicas share data and refresh results through one SQLite database file
+        self.deployment_mode = os.environ.get("WEALTHSYNC_DEPLOYMENT_MODE", "single")
+        self.shared_db_path = os.environ.get("WEALTHSYNC_SHARED_DB", self.db_path)
+        
         # API Credentials
         self.notion_token = os.environ.get("NOTION_TOKEN", "")
         self.notion_database_id = os.environ.get("NOTION_DATABASE_ID", "")
+        # Extra Notion properties to import, e.g. "Account:select,Notes:rich_text"
+        self.notion_extra_properties = os.environ.get("NOTION_EXTRA_PROPERTIES", "")
         
         # Google Sheets configuration
         self.credentials_file = os.environ.get("GOOGLE_CREDENTIALS", "credentials.json")
@@ -29,15 +44,70 @@ class Config:
         self.stock_spreadsheet_id = os.environ.get("STOCK_SPREADSHEET_ID", "")
         self.finance_spreadsheet_id = os.environ.get("FINANCE_SPREADSHEET_ID", "")
         
-
+        # Provider response cache configuration
+        self.cache_dir = os.path.join(self.data_dir, "cache")
+        self.cache_max_bytes = int(os.environ.get("WEALTHSYNC_CACHE_MAX_BYTES", 256 * 1024 * 1024))
+        self.cache_ttls = {
+            'notion': 300,
+            'google_sheets': 300,
+            'yfinance': 3600
+        }
+        self.offline_mode = os.environ.get("WEALTHSYNC_OFFLINE", "").lower() in ("1", "true", "yes")
         
         # Data storage folders
         self.folder_path = self.raw_data_dir
         
+        # Currency the ledger's amounts are converted to and shown in
+        self.base_currency = os.environ.get("WEALTHSYNC_BASE_CURRENCY", "USD").strip().upper() or "USD"
+        
+        # Worker processes for Monte Carlo projections
+        self.projection_workers = int(os.environ.get("WEALTHSYNC_PROJECTION_WORKERS", min(4, os.cpu_count() or 1)))
+        
+        # Write the finance ledger as month partition files in addition to the full ledger
+        self.finance_partitions = os.environ.get("WEALTHSYNC_FINANCE_PARTITIONS", "").lower() in ("1", "true", "yes")
+        
         # Load configuration from file if provided
         if config_path:
             self.load_config(config_path)
     
+    def __setattr__(self, name, value):
+        if getattr(self, '_frozen', False):
+            raise AttributeError("Configuration snapshots are read-only; use copy() to change settings")
+        object.__setattr__(self, name, value)
+    
+    def freeze(self, version):
+        """Make this configuration a read-only snapshot with the given version"""
+        self.version = version
+        self.cache_ttls = MappingProxyType(dict(self.cache_ttls))
+        self.scope = tuple(self.scope)
+        self._derived = {}
+        self._derived_lock = threading.Lock()
+        self._frozen = True
+        return self
+    
+    def copy(self):
+        """Get a mutable copy of this configuration"""
+        config = Config.__new__(Config)
+        for name, value in self.__dict__.items():
+            if name not in ('_frozen', '_derived', '_derived_lock'):
+                object.__setattr__(config, name, value)
+        config.cache_ttls = dict(self.cache_ttls)
+        config.scope = list(self.scope)
+        return config
+    
+    def derived(self, name, build_fn):
+        """Get an object built from this snapshot with build_fn(config), built once per version
+
+        Lets services such as the shared store or response cache be reused
+        across renders until the configuration changes.
+        """
+        if not getattr(self, '_frozen', False):
+            return build_fn(self)
+        with self._derived_lock:
+            if name not in self._derived:
+                self._derived[name] = build_fn(self)
+            return self._derived[name]
+    
     def load_config(self, config_path):
         """Load configuration from YAML file"""
         try:
@@ -62,10 +132,20 @@ class Config:
                 'output_dir': self.output_dir,
                 'logs_dir': self.logs_dir,
                 'db_path': self.db_path,
+                'deployment_mode': self.deployment_mode,
+                'shared_db_path': self.shared_db_path,
                 'credentials_file': self.credentials_file,
-                'scope': self.scope,
+                'scope': list(self.scope),
                 'stock_spreadsheet_id': self.stock_spreadsheet_id,
-                'finance_spreadsheet_id': self.finance_spreadsheet_id
+                'finance_spreadsheet_id': self.finance_spreadsheet_id,
+                'cache_dir': self.cache_dir,
+                'cache_max_bytes': self.cache_max_bytes,
+                'cache_ttls': dict(self.cache_ttls),
+                'offline_mode': self.offline_mode,
+                'finance_partitions': self.finance_partitions,
+                'base_currency': self.base_currency,
+                'projection_workers': self.projection_workers,
+                'notion_extra_properties': self.notion_extra_properties
             }
             
             with open(config_path, 'w') as file:
@@ -81,4 +161,75 @@ class Config:
                          self.output_dir, self.logs_dir]:
             if not os.path.exists(directory):
                 os.makedirs(directory)
-                logging.info(f"Created directory: {directory}") 
\ No newline at end of file
+                logging.info(f"Created directory: {directory}") 
+
+class ConfigService:
+    """Process-wide configuration that is parsed once and reloaded when its files change
+
+    The .env file and optional YAML file are checked by modification time at
+    most every check_interval seconds. When either changed, a new snapshot is
+    built with the next version number; otherwise the current snapshot is
+    returned without re-reading anything.
+    """
+    def __init__(self, config_path=None, env_path=".env", check_interval=1.0):
+        self.config_path = config_path
+        self.env_path = env_path
+        self.check_interval = check_interval
+        self.version = 0
+        self._snapshot = None
+        self._file_mtimes = None
+        self._last_check = 0.0
+        self._env_keys = set()
+        self._lock = threading.Lock()
+    
+    def _mtimes(self):
+        return tuple(
+            os.stat(path).st_mtime_ns if path and os.path.exists(path) else None
+            for path in (self.env_path, self.config_path)
+        )
+    
+    def _load_env(self):
+        """Apply the .env file; variables set in the real environment take precedence"""
+        values = dotenv_values(self.env_path) if os.path.exists(self.env_path) else {}
+        for key in self._env_keys - set(values):
+            os.environ.pop(key, None)
+        for key, value in values.items():
+            if value is not None and (key not in os.environ or key in self._env_keys):
+                os.environ[key] = value
+                self._env_keys.add(key)
+    
+    def get(self):
+        """Get the current configuration snapshot"""
+        if self._snapshot is not None and time.monotonic() - self._last_check < self.check_interval:
+            return self._snapshot
+        
+        with self._lock:
+            self._last_check = time.monotonic()
+            mtimes = self._mtimes()
+            if self._snapshot is None or mtimes != self._file_mtimes:
+                self._load_env()
+                self.version += 1
+                self._snapshot = Config(self.config_path).freeze(self.version)
+                self._file_mtimes = mtimes
+                if self.version > 1:
+                    logging.info(f"Reloaded configuration (version {self.version})")
+            return self._snapshot
+
+
+# Configuration services shared by the process, keyed by YAML path
+_SERVICES = {}
+_SERVICES_LOCK = threading.Lock()
+
+
+def get_config(config_path=None):
+    """Get the current read-only configuration snapshot
+
+    Snapshots are shared across sessions and carry a version number that
+    changes whenever the .env or YAML file changes, so it can be used as a
+    cache key for anything derived from the configuration.
+    """
+    with _SERVICES_LOCK:
+        service = _SERVICES.get(config_path)
+        if service is None:
+            service = _SERVICES[config_path] = ConfigService(config_path)
+    return service.get()
@@ -2,10 +2,18 @@
 """
 Entry point for the WealthSync application.
 This script serves as the entry point to the Streamlit application.
+When given a subcommand (ingest, precompute, export, bench) it runs the
+headless batch CLI instead, e.g. `python main.py ingest`.
 """
 
-from wealth_sync_app import main
+import sys
 
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        # Run a headless batch job
+        from src.cli import main as cli_main
+        sys.exit(cli_main())
+
     # Run the Streamlit application main function directly
-    main() 
\ No newline at end of file
+    from wealth_sync_app import main
+    main()
@@ -1,47 +1,55 @@
 import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from src.services.data_manager import DataManager
-from src.services.data_providers import NotionData, GoogleSheetsData
-from configs.config import Config
+from src.services.refresh import refresh_finance_data, run_refresh
+from src.components.export_panel import render_export_panel
+from src.components.data_table import finance_column_config, date_column, format_money, money_column, render_paged_table
+from src.components.finance_charts import FINANCE_CHARTS
+from src.services.figure_cache import FigureCache
+from src.models.spending import CADENCES
+from configs.config import get_config
 from src.utils.logger import setup_logger
 
 # Set up logger
 logger = setup_logger("financial_data")
 
+# Average charges per month for each recurring cadence
+MONTHLY_OCCURRENCES = {name: 30.4 / period for name, (period, _) in CADENCES.items()}
+
 def update_financial_data():
     """Fetch and update financial data from sources"""
     with st.spinner("Fetching data from sources..."):
         try:
             # Get configuration
-            config = Config()
-            
-            # Initialize data providers
-            notion = NotionData(config.notion_token, config.notion_database_id)
-            google_sheets = GoogleSheetsData(config.credentials_file, config.scope)
-            
-            # Fetch data
-            notion_data = notion.fetch_data()
-            finance_data = google_sheets.fetch_finance_data(config.finance_spreadsheet_id)
+            config = get_config()
             
-            # Check if data was fetched successfully
-            if notion_data.empty and finance_data.empty:
-                st.error("No data fetched from any source. Please check your configuration.")
-                return False
-                
             # Initialize data manager
-            data_manager = DataManager(config.raw_data_dir)
+            data_manager = DataManager.from_config(config)
             
-            # Combine and save data
-            combined_finance = data_manager.combine_finance_data(notion_data, finance_data)
+            # Fetch, combine and save data (only one replica fetches in shared deployments)
+            summary = run_refresh(
+                "finance",
+                lambda: refresh_finance_data(config, data_manager),
+                data_manager
+            )
             
-            if not combined_finance.empty:
-                st.success(f"Successfully updated financial data with {len(combined_finance)} records!")
-                return True
-            else:
-                st.warning("No data was combined or saved.")
+            if summary.get("error"):
+                st.error(summary["error"])
+                return False
+            if summary.get("warning"):
+                st.warning(summary["warning"])
                 return False
+            
+            st.success(f"Successfully updated financial data with {summary['records']} records!")
+            if summary.get("quarantined"):
+                st.warning(f"{summary['quarantined']} rows failed validation and were quarantined.")
+            if summary.get("unconverted"):
+                st.warning(
+                    f"{summary['unconverted']} transactions are in a currency without exchange rates and were "
+                    "quarantined; they will be added once rates are available."
+                )
+            if summary.get("categorized"):
+                st.info(f"{summary['categorized']} uncategorized transactions were categorized automatically.")
+            return True
                 
         except Exception as e:
             logger.error(f"Error updating financial data: {e}")
@@ -63,13 +71,13 @@ def render_financial_data():
        
     
     # Load configuration and data
-    config = Config()
-    data_manager = DataManager(config.raw_data_dir)
+    config = get_config()
+    data_manager = DataManager.from_config(config)
     
-    # Load finance data
-    finance_data = data_manager.load_finance_data()
+    # Get the ledger date range from the date index
+    date_range = data_manager.finance_date_range()
     
-    if finance_data.empty:
+    if date_range is None:
         st.warning("No financial data available. Please click the 'Update Data' button to fetch data.")
         return
     
@@ -78,8 +86,8 @@ def render_financial_data():
         st.subheader("Date Range Filter")
         
         # Get min and max dates
-        min_date = finance_data['Date'].min().date()
-        max_date = finance_data['Date'].max().date()
+        min_date = date_range[0].date()
+        max_date = date_range[1].date()
         
         # Date range selector
         col1, col2 = st.columns(2)
@@ -88,9 +96,9 @@ def render_financial_data():
         with col2:
             end_date = st.date_input("End Date", max_date)
     
-    # Filter data by date
-    mask = (finance_data['Date'].dt.date >= start_date) & (finance_data['Date'].dt.date <= end_date)
-    filtered_data = finance_data.loc[mask]
+    # Filter data by date with a binary search over the sorted ledger
+    filtered_data = data_manager.query_finance(start_date, end_date)
+    data_version = data_manager.finance_version()
     
     if filtered_data.empty:
         st.warning("No data available for the selected date range.")
@@ -107,12 +115,12 @@ def render_financial_data():
         
         # Display metrics in columns
         col1, col2, col3 = st.columns(3)
-        col1.metric("Total Amount", f"${total_amount:,.2f}")
-        col2.metric("Average Transaction", f"${avg_amount:,.2f}")
+        col1.metric("Total Amount", format_money(total_amount))
+        col2.metric("Average Transaction", format_money(avg_amount))
         col3.metric("Transaction Count", transaction_count)
     
     # Create tabs for different views
-    tab1, tab2 = st.tabs(["Data Tables", "Charts and Visualizations"])
+    tab1, tab2, tab3 = st.tabs(["Data Tables", "Charts and Visualizations", "Spending Insights"])
     
     # Tab 1: Data Tables
     with tab1:
@@ -125,161 +133,132 @@ def render_financial_data():
         category_data.columns = ['Category', 'Total Amount', 'Average Amount', 'Transaction Count']
         category_data = category_data.sort_values('Total Amount', ascending=False)
         
-        # Format currency columns
-        category_data['Total Amount'] = category_data['Total Amount'].map('${:,.2f}'.format)
-        category_data['Average Amount'] = category_data['Average Amount'].map('${:,.2f}'.format)
-        
-        # Display category data
-        st.dataframe(category_data, use_container_width=True)
+        # Display category data; currency formatting is applied by the column config
+        st.dataframe(
+            category_data,
+            column_config={'Total Amount': money_column(), 'Average Amount': money_column()},
+            hide_index=True,
+            use_container_width=True
+        )
         
         # Monthly Summary Table
         st.subheader("Monthly Summary")
         
-        # Add month and year columns
-        filtered_data['Month'] = filtered_data['Date'].dt.to_period('M')
-        
-        # Group by month
-        monthly_table = filtered_data.groupby('Month')['Amount'].agg(['sum', 'mean', 'count'])
-        monthly_table = monthly_table.reset_index()
+        # Group by month start without adding a column to the ledger
+        months = filtered_data['Date'].values.astype('datetime64[M]')
+        monthly_table = filtered_data['Amount'].groupby(months).agg(['sum', 'mean', 'count'])
+        monthly_table = monthly_table.rename_axis('Month').reset_index()
         monthly_table.columns = ['Month', 'Total Amount', 'Average Amount', 'Transaction Count']
-        monthly_table['Month'] = monthly_table['Month'].astype(str)
         monthly_table = monthly_table.sort_values('Month', ascending=False)
         
-        # Format currency columns
-        monthly_table['Total Amount'] = monthly_table['Total Amount'].map('${:,.2f}'.format)
-        monthly_table['Average Amount'] = monthly_table['Average Amount'].map('${:,.2f}'.format)
-        
         # Display monthly data
-        st.dataframe(monthly_table, use_container_width=True)
+        st.dataframe(
+            monthly_table,
+            column_config={
+                'Month': date_column(date_format="YYYY-MM"),
+                'Total Amount': money_column(),
+                'Average Amount': money_column()
+            },
+            hide_index=True,
+            use_container_width=True
+        )
         
         # Transaction Details Table
         st.subheader("Transaction Details")
         
-        # Add a download button for CSV export
-        csv = filtered_data[['Date', 'Category', 'Description', 'Amount']].to_csv(index=False)
-        st.download_button(
-            label="Download as CSV",
-            data=csv,
-            file_name="financial_data.csv",
-            mime="text/csv",
+        # Export control; the file is only built when requested
+        render_export_panel(
+            config,
+            "financial_data",
+            {"start": start_date, "end": end_date},
+            data_version,
+            lambda: filtered_data[['Date', 'Category', 'Description', 'Amount']],
+            "financial_data",
         )
         
-        # Sort by date (newest first)
-        sorted_data = filtered_data.sort_values('Date', ascending=False)
+        # Search descriptions and categories through the full-text index
+        search_query = st.text_input("Search Transactions", "", placeholder="e.g. coffee, groc")
         
-        # Format the date and amount columns
-        display_data = sorted_data.copy()
-        display_data['Date'] = display_data['Date'].dt.strftime('%Y-%m-%d')
-        display_data['Amount'] = display_data['Amount'].map('${:,.2f}'.format)
-        
-        # Display the transaction table
-        st.dataframe(display_data[['Date', 'Category', 'Description', 'Amount']], use_container_width=True)
+        if search_query.strip():
+            search_limit = 1000
+            matches = data_manager.search_finance(search_query, start_date, end_date, limit=search_limit)
+            st.caption(f"{len(matches):,} matching transactions" + (" (showing the newest)" if len(matches) >= search_limit else ""))
+            render_paged_table(matches, "search_results", column_config=finance_column_config())
+        else:
+            # Display the transactions newest first, one page at a time
+            render_paged_table(
+                filtered_data[['Date', 'Category', 'Description', 'Amount']],
+                "transactions",
+                column_config=finance_column_config(),
+                newest_first=True
+            )
     
     # Tab 2: Charts and Visualizations
     with tab2:
+        # Figures are cached as serialized specs per date range, currency and data version
+        figure_cache = FigureCache.from_config(config)
+        chart_params = {"start": start_date, "end": end_date, "currency": config.base_currency}
+        
+        def chart(name):
+            return figure_cache.get(name, chart_params, data_version, lambda: FINANCE_CHARTS[name](filtered_data))
+        
         # Create a multi-column layout for charts
         col1, col2 = st.columns(2)
         
         # Spending by Category Pie Chart
         with col1:
             st.subheader("Spending by Category")
-            
-            # Prepare data for pie chart
-            pie_data = filtered_data.groupby('Category')['Amount'].sum().reset_index()
-            pie_data = pie_data.sort_values('Amount', ascending=False)
-            
-            # Create pie chart
-            fig_pie = px.pie(
-                pie_data, 
-                values='Amount', 
-                names='Category',
-                title='Spending Distribution',
-                hole=0.4,
-                color_discrete_sequence=px.colors.qualitative.Pastel
-            )
-            st.plotly_chart(fig_pie, use_container_width=True)
+            st.plotly_chart(chart("category_pie"), use_container_width=True)
         
         # Top Categories Bar Chart
         with col2:
             st.subheader("Top Spending Categories")
-            
-            # Get top categories
-            top_categories = filtered_data.groupby('Category')['Amount'].sum().sort_values(ascending=False).head(5)
-            top_categories = top_categories.reset_index()
-            
-            # Create bar chart
-            fig_bar = px.bar(
-                top_categories,
-                x='Category',
-                y='Amount',
-                title='Top 5 Spending Categories',
-                color='Amount',
-                color_continuous_scale='Viridis'
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)
+            st.plotly_chart(chart("top_categories_bar"), use_container_width=True)
         
         # Monthly Trend Analysis
         st.subheader("Monthly Spending Trend")
-        
-        # Group by month for visualization
-        monthly_data = filtered_data.groupby(filtered_data['Date'].dt.to_period('M'))['Amount'].sum()
-        monthly_data = monthly_data.reset_index()
-        monthly_data['Month'] = monthly_data['Date'].astype(str)
-        
-        # Create line chart with area fill
-        fig_line = px.line(
-            monthly_data, 
-            x='Month', 
-            y='Amount',
-            markers=True,
-            title='Monthly Spending Trend',
-            labels={'Amount': 'Total Amount ($)', 'Month': 'Month'},
-            line_shape='spline'
-        )
-        
-        # Add area under the line
-        fig_line.add_trace(
-            go.Scatter(
-                x=monthly_data['Month'],
-                y=monthly_data['Amount'],
-                mode='lines',
-                fill='tozeroy',
-                fillcolor='rgba(73, 176, 222, 0.2)',
-                line=dict(width=0.5),
-                showlegend=False
-            )
-        )
-        
-        # Customize layout
-        fig_line.update_layout(
-            xaxis_title="Month",
-            yaxis_title="Total Amount ($)",
-            hovermode="x unified"
-        )
-        
-        st.plotly_chart(fig_line, use_container_width=True)
+        st.plotly_chart(chart("monthly_trend"), use_container_width=True)
         
         # Category Comparison by Month
         st.subheader("Category Comparison by Month")
+        st.plotly_chart(chart("category_by_month"), use_container_width=True)
+    
+    # Tab 3: Spending Insights, read from the analysis stored with the ledger
+    with tab3:
+        st.subheader("Unusual Transactions")
+        anomalies = data_manager.load_spending_anomalies(start_date, end_date)
+        if anomalies.empty:
+            st.info("No unusual transactions in the selected date range.")
+        else:
+            st.caption("Amounts far above what is typical for their category (robust z-score).")
+            st.dataframe(
+                anomalies[['Date', 'Category', 'Description', 'Amount', 'TypicalAmount', 'ZScore']],
+                column_config={
+                    **finance_column_config(),
+                    'TypicalAmount': money_column("Typical Amount"),
+                    'ZScore': st.column_config.NumberColumn("Z-Score", format="%.1f")
+                },
+                hide_index=True,
+                use_container_width=True
+            )
         
-        # Get top categories
-        top_cats = filtered_data.groupby('Category')['Amount'].sum().nlargest(3).index.tolist()
-        
-        # Filter data for top categories
-        top_cat_data = filtered_data[filtered_data['Category'].isin(top_cats)]
-        
-        # Group by month and category
-        cat_month_data = top_cat_data.groupby([top_cat_data['Date'].dt.to_period('M'), 'Category'])['Amount'].sum().reset_index()
-        cat_month_data['Month'] = cat_month_data['Date'].astype(str)
-        
-        # Create grouped bar chart
-        fig_cat_month = px.bar(
-            cat_month_data,
-            x='Month',
-            y='Amount',
-            color='Category',
-            title='Top 3 Categories by Month',
-            barmode='group'
-        )
-        
-        st.plotly_chart(fig_cat_month, use_container_width=True) 
\ No newline at end of file
+        st.subheader("Recurring Charges")
+        recurring = data_manager.load_recurring_charges()
+        if recurring.empty:
+            st.info("No recurring charges detected.")
+        else:
+            active = recurring[recurring['Active']]
+            monthly_cost = (active['TypicalAmount'] * active['Cadence'].map(MONTHLY_OCCURRENCES)).sum()
+            col1, col2 = st.columns(2)
+            col1.metric("Active Recurring Charges", len(active))
+            col2.metric("Estimated Monthly Cost", format_money(monthly_cost))
+            st.dataframe(
+                recurring[['Merchant', 'Category', 'Cadence', 'TypicalAmount', 'Occurrences', 'LastDate', 'NextDate', 'Active']],
+                column_config={
+                    'TypicalAmount': money_column("Typical Amount"),
+                    'LastDate': date_column("Last Charge"),
+                    'NextDate': date_column("Next Expected")
+                },
+                hide_index=True,
+                use_container_width=True
+            )
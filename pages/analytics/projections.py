@@ -0,0 +1,102 @@
+import streamlit as st
+import numpy as np
+from src.services.data_manager import DataManager
+from src.services.projections import PortfolioProjector
+from src.models.projection import band_columns, dated_bands
+from src.components.data_table import format_money
+from configs.config import get_config
+from src.utils.logger import setup_logger
+
+# Set up logger
+logger = setup_logger("projections_page")
+
+# Simulated path counts offered on the page
+PATH_OPTIONS = [10000, 25000, 50000, 100000, 200000]
+
+def render_projection_results(bands):
+    """Render the projected bands and the values at the horizon"""
+    bands = dated_bands(bands)
+    final = bands.iloc[-1]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Median Net Worth", format_money(final['Total p50']))
+    col2.metric("Pessimistic (5th pct.)", format_money(final['Total p5']))
+    col3.metric("Optimistic (95th pct.)", format_money(final['Total p95']))
+    col4.metric("Chance of Negative Cash", f"{final['Cash Shortfall']:.0%}")
+
+    st.subheader("Projected Net Worth")
+    st.line_chart(bands[band_columns("Total")])
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.subheader("Portfolio Value")
+        st.line_chart(bands[band_columns("Portfolio")])
+    with col2:
+        st.subheader("Cash Balance")
+        st.line_chart(bands[band_columns("Cash")])
+
+def render_projections():
+    """Render the Monte Carlo projection page"""
+    st.title("Portfolio Projections")
+
+    # Load configuration and the bootstrap samples
+    config = get_config()
+    data_manager = DataManager.from_config(config)
+    projector = PortfolioProjector.from_config(config)
+    inputs = projector.inputs(data_manager)
+    median_spending = float(np.median(inputs['spending_pool']))
+
+    st.caption(
+        f"Monthly returns are drawn from {len(inputs['return_pool']):,} one-month windows of your holdings' "
+        f"price history and spending from {len(inputs['spending_pool']):,} months of transactions."
+    )
+
+    # Projection parameters
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        years = st.slider("Years", min_value=1, max_value=40, value=10)
+        start_portfolio = st.number_input("Starting Portfolio Value", min_value=0.0, value=round(inputs['current_value'], 2), step=1000.0)
+    with col2:
+        paths = st.select_slider("Simulated Paths", options=PATH_OPTIONS, value=100000)
+        start_cash = st.number_input("Starting Cash", value=0.0, step=1000.0)
+    with col3:
+        seed = st.number_input("Random Seed", min_value=0, value=0, step=1)
+        monthly_investment = st.number_input("Monthly Investment", min_value=0.0, value=0.0, step=100.0)
+    monthly_income = st.number_input(
+        "Monthly Income", min_value=0.0, value=max(round(median_spending, -2), 0.0), step=100.0,
+        help="Defaults to your median monthly spending."
+    )
+
+    params = {
+        "years": int(years),
+        "paths": int(paths),
+        "seed": int(seed),
+        "start_portfolio": float(start_portfolio),
+        "start_cash": float(start_cash),
+        "monthly_income": float(monthly_income),
+        "monthly_investment": float(monthly_investment),
+    }
+
+    # Projections already run with these parameters are shown right away
+    bands = projector.cached(inputs, params)
+    if bands is None:
+        if not st.button("Run Projection"):
+            st.info("Set the parameters and click 'Run Projection'.")
+            return
+
+        # Show the bands as batches of paths finish
+        progress = st.progress(0.0, text="Starting simulation...")
+        preview = st.empty()
+
+        def show_batch(partial, done, total):
+            progress.progress(done / total, text=f"Simulated {done:,} of {total:,} paths")
+            preview.line_chart(dated_bands(partial)[band_columns("Total")])
+
+        bands = projector.run(inputs, params, on_batch=show_batch)
+        progress.empty()
+        preview.empty()
+
+        if bands.empty:
+            st.error("The projection failed. Please check the logs for more details.")
+            return
+
+    render_projection_results(bands)
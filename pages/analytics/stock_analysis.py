@@ -2,9 +2,14 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from src.services.data_manager import DataManager
-from src.models.stock_analyzer import StockData, StockPredictor
-from src.services.data_providers import GoogleSheetsData
-from configs.config import Config
+from src.models.stock_analyzer import StockPredictor, FORECAST_MODEL_VERSION
+from src.models.indicators import INDICATOR_COLUMNS
+from src.models.features import FEATURE_COLUMNS, bar_dates, make_training_frame
+from src.services.feature_store import FeatureStore
+from src.services.forecast_cache import ForecastCache
+from src.services.refresh import refresh_stock_data, run_refresh
+from src.components.export_panel import render_export_panel
+from configs.config import get_config
 from src.utils.logger import setup_logger
 
 # Set up logger
@@ -15,31 +20,25 @@ def update_stock_data():
     with st.spinner("Fetching stock data..."):
         try:
             # Get configuration
-            config = Config()
+            config = get_config()
             
-            # Initialize Google Sheets data provider
-            google_sheets = GoogleSheetsData(config.credentials_file, config.scope)
+            # Initialize data manager
+            data_manager = DataManager.from_config(config)
             
-            # Fetch stock tickers
-            tickers = google_sheets.fetch_stock_list(config.stock_spreadsheet_id)
+            # Fetch and save stock data (only one replica fetches in shared deployments)
+            summary = run_refresh(
+                "stocks",
+                lambda: refresh_stock_data(config, data_manager),
+                data_manager
+            )
             
-            if not tickers:
-                st.error("No stock tickers found. Please check your Google Sheets configuration.")
+            if summary.get("error"):
+                st.error(summary["error"])
                 return False
-                
-            # Fetch stock data
-            stock_data_provider = StockData()
-            stock_data = stock_data_provider.fetch_stock_data(tickers)
-            
-            if not stock_data:
-                st.error("Failed to fetch any stock data.")
-                return False
-                
-            # Save stock data to files
-            data_manager = DataManager(config.raw_data_dir)
-            data_manager.save_stock_data(stock_data)
             
-            st.success(f"Successfully updated stock data for {len(stock_data)} tickers!")
+            st.success(f"Successfully updated stock data for {summary['tickers']} tickers!")
+            if summary.get("quarantined"):
+                st.warning(f"{summary['quarantined']} price bars failed validation and were quarantined.")
             return True
             
         except Exception as e:
@@ -62,21 +61,30 @@ def render_stock_analysis():
 
     
     # Load configuration and data
-    config = Config()
-    data_manager = DataManager(config.raw_data_dir)
+    config = get_config()
+    data_manager = DataManager.from_config(config)
     
-    # Get available stock tickers
-    data_files = data_manager.get_available_data_files()
-    available_tickers = list(data_files['stocks'].keys())
+    # Get available stock tickers from the ticker catalog
+    catalog = data_manager.load_ticker_catalog()
     
-    if not available_tickers:
+    if not catalog:
         st.warning("No stock data available. Please click the 'Update Stock Data' button to fetch stock data.")
         return
     
-    # Select ticker
-    ticker = st.selectbox("Select Stock", available_tickers)
+    # Search and select ticker
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        query = st.text_input("Search Ticker", "")
+    matching_tickers = data_manager.search_tickers(query, limit=100)
+    with col2:
+        ticker = st.selectbox("Select Stock", matching_tickers)
+    st.caption(f"Showing {len(matching_tickers)} of {len(catalog)} tickers")
     
     if ticker:
+        # Show catalog metadata for the selected ticker
+        entry = catalog[ticker]
+        st.caption(f"{entry['rows']} bars, last bar {entry['last_bar']}, updated {entry['updated']}")
+        
         # Load stock data
         stock_data = data_manager.load_stock_data(ticker)
         
@@ -91,9 +99,10 @@ def render_stock_analysis():
         # Technical indicators
         st.subheader("Technical Indicators")
         
-        # Calculate moving averages
-        stock_data['MA50'] = stock_data['Close'].rolling(window=50).mean()
-        stock_data['MA200'] = stock_data['Close'].rolling(window=200).mean()
+        # Moving averages and RSI, maintained incrementally alongside the ticker data
+        price_history = stock_data
+        indicators = data_manager.load_stock_indicators(ticker).reindex(index=bar_dates(stock_data), columns=INDICATOR_COLUMNS)
+        stock_data = stock_data.assign(**{column: indicators[column].to_numpy() for column in INDICATOR_COLUMNS})
         
         # Drop NaN values
         stock_data = stock_data.dropna()
@@ -105,13 +114,6 @@ def render_stock_analysis():
             'MA200': stock_data['MA200']
         })
         
-        # Calculate RSI
-        delta = stock_data['Close'].diff()
-        gain = delta.where(delta > 0, 0).rolling(window=14).mean()
-        loss = -delta.where(delta < 0, 0).rolling(window=14).mean()
-        rs = gain / loss
-        stock_data['RSI'] = 100 - (100 / (1 + rs))
-        
         # Plot RSI
         st.subheader("Relative Strength Index (RSI)")
         st.line_chart(stock_data['RSI'])
@@ -121,29 +123,30 @@ def render_stock_analysis():
         
         if st.button("Run Prediction Model"):
             with st.spinner("Training model and making predictions..."):
-                # Features for prediction
-                features = ['MA50', 'Volume']
-                target = 'Close'
+                # Features from the feature store; only new bars are computed
+                feature_store = FeatureStore.from_config(config)
+                training_data = make_training_frame(feature_store.get_features(ticker, price_history))
+                target = 'Target'
                 
-                if len(stock_data) > 10:  # Ensure enough data for prediction
+                if len(training_data) > 10:  # Ensure enough data for prediction
                     # Initialize predictor
                     predictor = StockPredictor()
                     
-                    # Train model and make predictions
-                    predictions = predictor.train_model(stock_data, features, target)
+                    # Train model to predict the next close and make predictions
+                    predictions = predictor.train_model(training_data, FEATURE_COLUMNS, target)
                     
                     if len(predictions) > 0:
                         # Display predictions
                         st.success("Prediction completed!")
                         
                         # Plot actual vs predicted
-                        st.subheader("Actual vs Predicted Prices")
+                        st.subheader("Actual vs Predicted Next-Day Close")
                         
                         # Create a dataframe for visualization
                         pred_df = pd.DataFrame({
-                            'Actual': stock_data[target].iloc[-len(predictions):].values,
+                            'Actual': training_data[target].iloc[-len(predictions):].values,
                             'Predicted': predictions
-                        })
+                        }, index=training_data.index[-len(predictions):])
                         
                         st.line_chart(pred_df)
                         
@@ -155,13 +158,42 @@ def render_stock_analysis():
                 else:
                     st.error(f"Not enough data for {ticker} to make predictions")
         
-        # Add a download button for CSV export
-        csv = stock_data.to_csv(index=False)
-        st.download_button(
-            label="Download Stock Data as CSV",
-            data=csv,
-            file_name=f"{ticker}_stock_data.csv",
-            mime="text/csv",
+        # Forward forecast, cached per ticker, model version and data version
+        st.subheader("Price Forecast")
+        col1, col2 = st.columns(2)
+        with col1:
+            horizon = st.slider("Forecast Horizon (trading days)", 5, 30, 10)
+        with col2:
+            level = st.select_slider("Confidence Level", options=[0.5, 0.8, 0.9, 0.95], value=0.9)
+        
+        feature_store = FeatureStore.from_config(config)
+        forecast = ForecastCache.from_config(config).get_or_compute(
+            ticker,
+            f"{FORECAST_MODEL_VERSION}:{feature_store.definition_hash}",
+            data_manager.stock_version(ticker),
+            {"horizon": horizon, "level": level},
+            lambda: StockPredictor().forecast(
+                {ticker: feature_store.get_features(ticker, price_history)}, FEATURE_COLUMNS, horizon, level
+            ).get(ticker)
+        )
+        
+        if forecast is not None and not forecast.empty:
+            # Recent closes followed by the forecast and its band
+            history = pd.DataFrame({'Close': price_history['Close'].to_numpy()[-60:]}, index=bar_dates(price_history)[-60:])
+            st.line_chart(pd.concat([history, forecast]))
+            st.caption(f"{int(level * 100)}% band from held-out residuals of one direct model per forecast day")
+        else:
+            st.info(f"Not enough data for {ticker} to forecast")
+        
+        # Export control; the file is only built when requested
+        render_export_panel(
+            config,
+            "stock_data",
+            {"ticker": ticker},
+            data_manager.stock_version(ticker),
+            lambda: stock_data,
+            f"{ticker}_stock_data",
+            label="Download Stock Data",
         )
         
         # Display raw data
@@ -1,65 +1,42 @@
 import streamlit as st
 import pandas as pd
-import os
 import datetime
 from src.services.data_manager import DataManager
-from configs.config import Config
-
-def get_last_updated_time(file_path):
-    """Get the last modified time of a file"""
-    if os.path.exists(file_path):
-        mod_time = os.path.getmtime(file_path)
-        return datetime.datetime.fromtimestamp(mod_time)
-    return None
+from src.components.data_table import finance_column_config, format_money
+from src.models.portfolio import NET_WORTH_COLUMNS
+from configs.config import get_config
 
 def load_dashboard_data():
-    """Load data for the dashboard"""
-    config = Config()
-    data_manager = DataManager(config.raw_data_dir)
-    
-    # Load finance data
-    finance_data = data_manager.load_finance_data()
-    
-    # Get available stock tickers
-    data_files = data_manager.get_available_data_files()
-    available_tickers = list(data_files['stocks'].keys())
-    
-    # Load stock data for the first available ticker
-    if available_tickers:
-        stock_data = data_manager.load_stock_data(available_tickers[0])
-        selected_ticker = available_tickers[0]
-    else:
-        stock_data = pd.DataFrame()
-        selected_ticker = None
-        
-    # Get last updated times
-    finance_latest_file = os.path.join(config.raw_data_dir, 'finance', 'finance_data_latest.csv')
-    finance_last_updated = get_last_updated_time(finance_latest_file)
-    
-    stock_last_updated = None
-    if selected_ticker:
-        stock_latest_file = os.path.join(config.raw_data_dir, 'stocks', selected_ticker, f'{selected_ticker}_latest.csv')
-        stock_last_updated = get_last_updated_time(stock_latest_file)
-        
-    return finance_data, stock_data, available_tickers, selected_ticker, finance_last_updated, stock_last_updated
+    """Load the dashboard summary written by the last refreshes"""
+    config = get_config()
+    data_manager = DataManager.from_config(config)
+    return data_manager.load_dashboard_summary()
+
+def format_updated(timestamp):
+    """Format an ISO timestamp from the summary for display"""
+    return datetime.datetime.fromisoformat(timestamp).strftime('%Y-%m-%d %H:%M')
 
 def render_dashboard():
-    """Render the main dashboard"""
+    """Render the main dashboard from the materialized summary"""
     st.title("WealthSync Dashboard")
     
     # Load data
-    finance_data, stock_data, available_tickers, selected_ticker, finance_last_updated, stock_last_updated = load_dashboard_data()
+    summary = load_dashboard_data()
+    finance = summary.get("finance") or {}
+    stocks = summary.get("stocks") or {}
+    net_worth = summary.get("net_worth")
+    selected_ticker = next(iter(sorted(stocks)), None)
     
     # Last updated info
     st.sidebar.subheader("Data Last Updated")
     
-    if finance_last_updated:
-        st.sidebar.write(f"Finance Data: {finance_last_updated.strftime('%Y-%m-%d %H:%M')}")
+    if finance.get("updated"):
+        st.sidebar.write(f"Finance Data: {format_updated(finance['updated'])}")
     else:
         st.sidebar.write("Finance Data: Never updated")
         
-    if stock_last_updated:
-        st.sidebar.write(f"Stock Data ({selected_ticker}): {stock_last_updated.strftime('%Y-%m-%d %H:%M')}")
+    if selected_ticker and stocks[selected_ticker].get("updated"):
+        st.sidebar.write(f"Stock Data ({selected_ticker}): {format_updated(stocks[selected_ticker]['updated'])}")
     else:
         st.sidebar.write("Stock Data: Never updated")
     
@@ -70,38 +47,73 @@ def render_dashboard():
     
     with col1:
         st.subheader("Financial Overview")
-        if not finance_data.empty:
-            # Calculate key metrics
-            total_amount = finance_data['Amount'].sum()
-            avg_amount = finance_data['Amount'].mean()
-            transaction_count = len(finance_data)
+        if finance.get("count"):
+            # Key metrics come from the ledger aggregates updated at each sync
+            total_amount = finance['total']
+            transaction_count = finance['count']
+            avg_amount = total_amount / transaction_count if transaction_count else 0.0
             
             # Display metrics
-            st.metric("Total Amount", f"${total_amount:,.2f}")
-            st.metric("Average Transaction", f"${avg_amount:,.2f}")
+            st.metric("Total Amount", format_money(total_amount))
+            st.metric("Average Transaction", format_money(avg_amount))
             st.metric("Transaction Count", transaction_count)
         else:
             st.info("No financial data available. Go to Financial Data page to update.")
     
     with col2:
         st.subheader("Stock Performance")
-        if not stock_data.empty and 'Close' in stock_data.columns:
-            ticker = selected_ticker if selected_ticker else "N/A"
-            st.write(f"Showing data for: {ticker}")
-            st.line_chart(stock_data['Close'])
+        if selected_ticker and stocks[selected_ticker].get("sparkline"):
+            entry = stocks[selected_ticker]
+            st.write(f"Showing data for: {selected_ticker}")
+            st.line_chart(pd.Series(entry['sparkline'], index=pd.to_datetime(entry['sparkline_dates']), name='Close'))
         else:
             st.info("No stock data available. Go to Stock Analysis page to update.")
     
+    # Latest close and one-year trend per ticker
+    if stocks:
+        st.subheader("Watchlist")
+        watchlist = pd.DataFrame([
+            {"Ticker": ticker, "Close": entry.get("last_close"), "Change": entry.get("change_pct"), "Trend": entry.get("sparkline") or []}
+            for ticker, entry in sorted(stocks.items())
+        ])
+        st.dataframe(
+            watchlist,
+            column_config={
+                "Close": st.column_config.NumberColumn(format="%.2f"),
+                "Change": st.column_config.NumberColumn("Change (%)", format="%+.2f%%"),
+                "Trend": st.column_config.LineChartColumn("1Y Trend"),
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+    
+    # Net worth over time
+    st.subheader("Net Worth")
+    if net_worth:
+        latest = net_worth['latest']
+        cost_basis = net_worth['cost_basis']
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Net Worth", format_money(latest['NetWorth']))
+        col2.metric("Holdings Value", format_money(latest['Holdings']))
+        col3.metric("Cost Basis", format_money(cost_basis), delta=format_money(latest['Holdings'] - cost_basis))
+        st.line_chart(pd.DataFrame(
+            {column: net_worth[column] for column in NET_WORTH_COLUMNS},
+            index=pd.to_datetime(net_worth['dates'])
+        ))
+    else:
+        st.info("No net worth data available. Add Quantity and Cost Basis columns to the stock sheet and update the data.")
+    
     # Show transactions by category
-    if not finance_data.empty and 'Category' in finance_data.columns:
+    if finance.get("by_category"):
         st.subheader("Spending by Category")
-        category_data = finance_data.groupby('Category')['Amount'].sum().sort_values(ascending=False)
+        category_data = pd.Series(finance['by_category'], dtype=float).sort_values(ascending=False)
         st.bar_chart(category_data)
     
     # Recent transactions
     st.subheader("Recent Transactions")
-    if not finance_data.empty:
-        recent_transactions = finance_data.sort_values('Date', ascending=False).head(5)
-        st.dataframe(recent_transactions[['Date', 'Category', 'Description', 'Amount']])
+    if finance.get("recent"):
+        recent = pd.DataFrame(finance['recent'])
+        recent['Date'] = pd.to_datetime(recent['Date'])
+        st.dataframe(recent, column_config=finance_column_config(), hide_index=True)
     else:
-        st.info("No transaction data available") 
\ No newline at end of file
+        st.info("No transaction data available")
@@ -1,6 +1,6 @@
 import streamlit as st
 import os
-from configs.config import Config
+from configs.config import get_config
 import yaml
 import datetime
 
@@ -24,7 +24,7 @@ def render_settings():
     st.title("Settings")
     
     # Load the current configuration
-    config = Config()
+    config = get_config()
     
     # Create tabs for different settings
     tab1, tab2, tab3 = st.tabs(["API Configuration", "Data Storage", "Logs Viewer"])
@@ -0,0 +1,835 @@
+"""
+Headless command-line interface for WealthSync.
+
+Runs the same provider, DataManager and model code as the Streamlit pages so
+that cron or container jobs can ingest data, precompute analytics, export
+data and run benchmarks without the UI:
+
+    python main.py ingest [--only finance stocks]
+    python main.py precompute
+    python main.py export finance --start 2024-01-01 --output finance.csv
+    python main.py bench
+    python main.py loadtest --sessions 50
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import tempfile
+import argparse
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+from configs.config import get_config
+from src.services.data_manager import DataManager
+from src.services.refresh import refresh_finance_data, refresh_stock_data, run_refresh
+from src.services.response_cache import ResponseCache
+from src.services.exporter import ExportService, EXPORT_FORMATS
+from src.models.stock_analyzer import StockPredictor, FORECAST_MODEL_VERSION
+from src.models.features import FEATURE_COLUMNS, bar_dates, make_training_frame
+from src.models.indicators import compute_indicators, update_indicators
+from src.models.spending import detect_recurring, merchant_keys, score_anomalies, update_histograms
+from src.services.feature_store import FeatureStore
+from src.services.forecast_cache import ForecastCache
+from src.components.finance_charts import FINANCE_CHARTS
+from src.services.notion_decoder import decode_pages, make_synthetic_pages
+from src.services.validation import validate_finance
+from src.services.categorizer import TransactionCategorizer
+from src.services.fx_rates import FxRateTable
+from src.services.price_panel import PricePanel, attach_price_panel
+from src.services.projections import PortfolioProjector
+from src.models.projection import BATCH_PATHS, PERCENTILES, band_columns, combine_batches, simulate_batch
+from src.utils.logger import setup_logger
+
+logger = setup_logger("cli")
+
+
+def timed(name, fn, *args, **kwargs):
+    """Run one stage and return its name, duration, result and error"""
+    start = time.perf_counter()
+    try:
+        result, error = fn(*args, **kwargs), None
+    except Exception as e:
+        logger.error(f"Stage {name} failed: {e}")
+        result, error = None, str(e)
+    return {"stage": name, "seconds": time.perf_counter() - start, "result": result, "error": error}
+
+
+def report(stages, as_json=False):
+    """Print per-stage timings and return the process exit code"""
+    if as_json:
+        print(json.dumps(stages, indent=2, default=str))
+    else:
+        width = max([len(stage["stage"]) for stage in stages] + [5])
+        print(f"{'stage':<{width}}  {'seconds':>9}  result")
+        for stage in stages:
+            outcome = f"ERROR: {stage['error']}" if stage["error"] else stage["result"]
+            print(f"{stage['stage']:<{width}}  {stage['seconds']:>9.3f}  {outcome}")
+
+    failed = [stage for stage in stages if stage["error"] or (isinstance(stage["result"], dict) and stage["result"].get("error"))]
+    return 1 if failed else 0
+
+
+# Ingest stages: name -> function(config, data_manager, cache)
+INGEST_STAGES = {
+    "finance": lambda config, data_manager, cache: run_refresh(
+        "finance", lambda: refresh_finance_data(config, data_manager, cache), data_manager
+    ),
+    "stocks": lambda config, data_manager, cache: run_refresh(
+        "stocks", lambda: refresh_stock_data(config, data_manager, cache), data_manager
+    ),
+}
+
+
+def cmd_ingest(args, config):
+    """Fetch all sources in parallel and save them"""
+    names = args.only or list(INGEST_STAGES)
+    cache = config.derived("response_cache", ResponseCache.from_config)
+
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        # Each stage gets its own DataManager. Both update the dashboard summary
+        # and shared store sync state, which DataManager merges under file locks
+        futures = [
+            executor.submit(timed, name, INGEST_STAGES[name], config, DataManager.from_config(config), cache)
+            for name in names
+        ]
+        stages = [future.result() for future in futures]
+    return report(stages, args.json)
+
+
+def precompute_finance_aggregates(config, data_manager):
+    """Load the ledger and make sure its aggregates are materialized"""
+    aggregates = data_manager.load_finance_aggregates()
+    return {"records": aggregates["count"], "categories": len(aggregates["by_category"])}
+
+
+def precompute_search_index(config, data_manager):
+    """Bring the transaction search index up to the current ledger version"""
+    rebuilt = data_manager.update_search_index()
+    return {"version": data_manager.finance_version(), "rebuilt": rebuilt}
+
+
+def precompute_stock_features(config, data_manager):
+    """Bring the feature store up to date for every ticker"""
+    feature_store = FeatureStore.from_config(config)
+    computed = {ticker: feature_store.update(ticker, data_manager.load_stock_data(ticker)) for ticker in data_manager.list_tickers()}
+    return {"tickers": len(computed), "rows_computed": sum(computed.values())}
+
+
+def precompute_stock_models(config, data_manager):
+    """Train the next-close prediction model for every ticker in one batch and save its error metrics"""
+    feature_store = FeatureStore.from_config(config)
+    datasets = {}
+    for ticker in data_manager.list_tickers():
+        training_data = make_training_frame(feature_store.get_features(ticker, data_manager.load_stock_data(ticker)))
+        if len(training_data) > 10:
+            datasets[ticker] = training_data
+
+    results = StockPredictor().train_batch(datasets, FEATURE_COLUMNS, 'Target')
+    metrics = {ticker: result["metrics"] for ticker, result in results.items()}
+
+    os.makedirs(config.output_dir, exist_ok=True)
+    metrics_file = os.path.join(config.output_dir, 'model_metrics.json')
+    with open(metrics_file, 'w') as file:
+        json.dump(metrics, file, indent=2)
+    return {"tickers": len(metrics)}
+
+
+def precompute_stock_forecasts(config, data_manager, horizon=10, level=0.9):
+    """Forecast every ticker in one batch and store the results in the forecast cache"""
+    feature_store = FeatureStore.from_config(config)
+    features_by_ticker = {
+        ticker: feature_store.get_features(ticker, data_manager.load_stock_data(ticker))
+        for ticker in data_manager.list_tickers()
+    }
+    forecasts = StockPredictor().forecast(features_by_ticker, FEATURE_COLUMNS, horizon, level)
+
+    forecast_cache = ForecastCache.from_config(config)
+    model_version = f"{FORECAST_MODEL_VERSION}:{feature_store.definition_hash}"
+    for ticker, forecast in forecasts.items():
+        forecast_cache.put(ticker, model_version, data_manager.stock_version(ticker), {"horizon": horizon, "level": level}, forecast)
+    return {"tickers": len(forecasts), "horizon": horizon}
+
+
+# Precompute stages, run in order: name -> function(config, data_manager)
+PRECOMPUTE_STAGES = {
+    "finance_aggregates": precompute_finance_aggregates,
+    "search_index": precompute_search_index,
+    "stock_features": precompute_stock_features,
+    "stock_models": precompute_stock_models,
+    "stock_forecasts": precompute_stock_forecasts,
+}
+
+
+def cmd_precompute(args, config):
+    """Precompute analytics artifacts so pages render from warm data"""
+    data_manager = DataManager.from_config(config)
+    names = args.only or list(PRECOMPUTE_STAGES)
+    stages = [timed(name, PRECOMPUTE_STAGES[name], config, data_manager) for name in names]
+    return report(stages, args.json)
+
+
+def cmd_export(args, config):
+    """Export the finance ledger or a ticker history to a file"""
+    data_manager = DataManager.from_config(config)
+    export_service = ExportService.from_config(config)
+
+    def export():
+        if args.dataset == "finance":
+            params = {"start": args.start, "end": args.end}
+            version = data_manager.finance_version()
+            frame_fn = lambda: data_manager.query_finance(args.start, args.end, ['Date', 'Category', 'Description', 'Amount'])
+            stem = "financial_data"
+        else:
+            if not args.ticker:
+                raise ValueError("--ticker is required for stock exports")
+            params = {"ticker": args.ticker}
+            version = data_manager.stock_version(args.ticker)
+            frame_fn = lambda: data_manager.load_stock_data(args.ticker)
+            stem = f"{args.ticker}_stock_data"
+
+        path = export_service.get_or_build(f"{args.dataset}_export", params, version, args.format, frame_fn)
+        output = args.output or f"{stem}{EXPORT_FORMATS[args.format][0]}"
+        shutil.copyfile(path, output)
+        return {"file": output, "bytes": os.path.getsize(output)}
+
+    return report([timed(f"export_{args.dataset}", export)], args.json)
+
+
+def bench_finance_load(config, data_manager):
+    """Time a cold load of the date-indexed ledger"""
+    from src.services import data_manager as data_manager_module
+    data_manager_module._FINANCE_STORE_CACHE.clear()
+    return {"rows": len(data_manager.load_finance_data())}
+
+
+def bench_finance_query(config, data_manager):
+    """Time a one-month range query and a latest-N query on the warm ledger"""
+    date_range = data_manager.finance_date_range()
+    if date_range is None:
+        return {"rows": 0}
+    start = date_range[1] - pd.DateOffset(months=1)
+    rows = len(data_manager.query_finance(start, date_range[1]))
+    data_manager.latest_finance(5)
+    return {"rows": rows}
+
+
+def bench_figures(config, data_manager):
+    """Time building and serializing each Financial Data chart over the full ledger"""
+    ledger = data_manager.query_finance()
+    timings = {}
+    for chart, build_fn in FINANCE_CHARTS.items():
+        start = time.perf_counter()
+        figure = build_fn(ledger)
+        built = time.perf_counter()
+        pio.to_json(figure, validate=False)
+        timings[chart] = {
+            "build_ms": round((built - start) * 1000, 2),
+            "serialize_ms": round((time.perf_counter() - built) * 1000, 2),
+        }
+    return timings
+
+
+def bench_notion_decode(config, data_manager, count=100000, repeat=3):
+    """Time decoding synthetic Notion pages against a per-row reference loop (best of repeat)"""
+    pages = make_synthetic_pages(count)
+
+    def reference_loop():
+        # Nested lookups per page, appended row by row
+        rows = []
+        for page in pages:
+            props = page["properties"]
+            rows.append([
+                props["Date"]["date"]["start"] if props["Date"]["date"] else None,
+                props["Category"]["select"]["name"] if props["Category"]["select"] else None,
+                props["Description"]["title"][0]["text"]["content"] if props["Description"]["title"] else None,
+                props["Amount"]["number"] if props["Amount"]["number"] else 0,
+                page["id"],
+            ])
+        return pd.DataFrame(rows, columns=["Date", "Category", "Description", "Amount", "PageId"])
+
+    timings = {}
+    for name, fn in (("decode_s", lambda: decode_pages(pages)), ("row_loop_s", reference_loop)):
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            runs.append(time.perf_counter() - start)
+        timings[name] = round(min(runs), 3)
+
+    return {"pages": count, **timings}
+
+
+def bench_batch_train(config, data_manager, tickers=500, rows=250):
+    """Time batched training of synthetic tickers against one sklearn fit per ticker
+
+    Raises if the batched coefficients or metrics drift from sklearn's.
+    """
+    rng = np.random.default_rng(0)
+    features = ['MA50', 'Volume']
+    datasets = {}
+    for i in range(tickers):
+        length = rows - i % 50
+        X = np.column_stack([rng.normal(100, 10, length), rng.normal(1e6, 1e5, length)])
+        y = X @ np.array([0.9, 2e-6]) + rng.normal(0, 1, length)
+        datasets[f"T{i:04d}"] = pd.DataFrame({'MA50': X[:, 0], 'Volume': X[:, 1], 'Close': y})
+
+    start = time.perf_counter()
+    results = StockPredictor().train_batch(datasets, features, 'Close')
+    batch_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    max_error = 0.0
+    for ticker, data in datasets.items():
+        predictor = StockPredictor()
+        predictions = predictor.train_model(data, features, 'Close')
+        max_error = max(
+            max_error,
+            float(np.max(np.abs(predictions - results[ticker]["predictions"]))),
+            abs(predictor.metrics["mse"] - results[ticker]["metrics"]["mse"]),
+        )
+    sklearn_s = time.perf_counter() - start
+
+    if max_error > 1e-6:
+        raise AssertionError(f"Batched results differ from sklearn by {max_error:.2e}")
+    return {"tickers": tickers, "batch_s": round(batch_s, 3), "sklearn_s": round(sklearn_s, 3), "max_error": max_error}
+
+
+def bench_indicators(config, data_manager, tickers=20, years=20):
+    """Time appending one bar to MA/RSI with stored rolling state against full recomputation
+
+    Uses synthetic daily histories; raises if indicators built by appending
+    in chunks differ from a full recomputation.
+    """
+    rng = np.random.default_rng(0)
+    bars = years * 252
+    histories = [100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars + 1))) for _ in range(tickers)]
+
+    start = time.perf_counter()
+    states = [compute_indicators(closes[:-1])[1] for closes in histories]
+    full_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for closes, state in zip(histories, states):
+        update_indicators(state, closes[-1:])
+    append_s = time.perf_counter() - start
+
+    # Build one history in uneven chunks and compare with a full recomputation
+    closes = histories[0]
+    frames, state = [], None
+    cuts = [0, 15, 199, 201, bars // 2, bars - 5, bars + 1]
+    for begin, end in zip(cuts, cuts[1:]):
+        if state is None:
+            frame, state = compute_indicators(closes[begin:end])
+        else:
+            frame, state = update_indicators(state, closes[begin:end])
+        frames.append(frame)
+    appended = pd.concat(frames, ignore_index=True)
+    expected, _ = compute_indicators(closes)
+    max_error = float(np.nanmax(np.abs(appended.to_numpy() - expected.to_numpy())))
+    if max_error > 1e-8 or not (appended.isna().to_numpy() == expected.isna().to_numpy()).all():
+        raise AssertionError(f"Appended indicators differ from full recomputation by {max_error:.2e}")
+
+    return {
+        "tickers": tickers,
+        "bars": bars,
+        "full_ms": round(full_s * 1000, 2),
+        "append_ms": round(append_s * 1000, 2),
+        "max_error": max_error,
+    }
+
+
+def bench_validation(config, data_manager, count=100000):
+    """Time validating synthetic Notion rows relative to merging them into an empty ledger"""
+    frame = decode_pages(make_synthetic_pages(count))
+
+    start = time.perf_counter()
+    valid, quarantined, report = validate_finance(frame, "notion")
+    validate_s = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        start = time.perf_counter()
+        DataManager(scratch_dir).combine_finance_data(valid, pd.DataFrame())
+        combine_s = time.perf_counter() - start
+
+    return {
+        "rows": count,
+        "quarantined": len(quarantined),
+        "validate_s": round(validate_s, 3),
+        "combine_s": round(combine_s, 3),
+        "overhead_pct": round(100 * validate_s / combine_s, 1),
+    }
+
+
+def bench_search(config, data_manager, queries=("co", "rent", "food gro")):
+    """Time full-text transaction searches, after bringing the index up to date"""
+    start = time.perf_counter()
+    data_manager.update_search_index()
+    index_s = time.perf_counter() - start
+
+    timings = {}
+    date_range = data_manager.finance_date_range()
+    for query in queries:
+        start = time.perf_counter()
+        matches = data_manager.search_finance(query)
+        timings[query] = {"rows": len(matches), "ms": round((time.perf_counter() - start) * 1000, 2)}
+        if date_range is not None:
+            start = time.perf_counter()
+            data_manager.search_finance(query, date_range[1] - pd.DateOffset(months=1), date_range[1])
+            timings[query]["last_month_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return {"index_s": round(index_s, 3), "queries": timings}
+
+
+def bench_categorize(config, data_manager, count=100000, batch=1000):
+    """Time training the categorizer, an incremental update and batch scoring of synthetic rows
+
+    Descriptions are merchant names with store numbers; a fifth of the rows
+    are held out and scored, and the accuracy on them is reported.
+    """
+    rng = np.random.default_rng(0)
+    merchants = {
+        "Food": ["WHOLE FOODS MKT", "TRADER JOES", "SAFEWAY", "STARBUCKS", "CHIPOTLE"],
+        "Transport": ["UBER TRIP", "LYFT RIDE", "SHELL OIL", "CHEVRON", "BART CLIPPER"],
+        "Utilities": ["PG&E", "COMCAST", "AT&T WIRELESS", "CITY WATER"],
+        "Fun": ["NETFLIX.COM", "SPOTIFY", "AMC THEATRES", "STEAM GAMES"],
+        "Health": ["CVS PHARMACY", "WALGREENS", "KAISER COPAY"],
+    }
+    names = np.array([name for names in merchants.values() for name in names])
+    labels = np.array([category for category, names in merchants.items() for _ in names])
+    picks = rng.integers(0, len(names), count)
+    frame = pd.DataFrame({
+        "Category": labels[picks],
+        "Description": [f"{name} #{number}" for name, number in zip(names[picks], rng.integers(1, 9999, count))],
+        "Amount": np.round(rng.gamma(2.0, 40.0, count), 2),
+    })
+    held_out = rng.random(count) < 0.2
+    history, unlabelled = frame[~held_out], frame[held_out]
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        categorizer = TransactionCategorizer(scratch_dir)
+        start = time.perf_counter()
+        categorizer.fit(history.iloc[batch:])
+        fit_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        categorizer.learn(history.iloc[:batch], lambda: history)
+        update_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        predicted = categorizer.predict(unlabelled)
+        predict_s = time.perf_counter() - start
+
+    return {
+        "train_rows": len(history),
+        "scored_rows": len(unlabelled),
+        "fit_s": round(fit_s, 3),
+        "update_ms": round(update_s * 1000, 2),
+        "predict_s": round(predict_s, 3),
+        "filled_pct": round(100 * float(pd.notna(predicted).mean()), 1),
+        "accuracy_pct": round(100 * float((predicted == unlabelled["Category"].to_numpy()).mean()), 1),
+    }
+
+
+def bench_spending(config, data_manager, batch=100):
+    """Time the full spending analysis of the ledger against an incremental update for one batch
+
+    The batch is the ledger's newest rows, treated as just inserted; the
+    full analysis includes computing every row's merchant key.
+    """
+    ledger = data_manager.load_finance_data().reset_index(drop=True)
+    if ledger.empty:
+        return {"skipped": "no finance data"}
+    descriptions = ledger["Description"]
+    ledger = ledger.drop(columns=["Merchant"], errors="ignore")
+    history, new_rows = ledger.iloc[:-batch], ledger.iloc[-batch:]
+
+    start = time.perf_counter()
+    ledger["Merchant"] = merchant_keys(descriptions)
+    histograms = update_histograms({}, ledger)
+    anomalies = score_anomalies(ledger, histograms)
+    recurring = detect_recurring(ledger)
+    full_s = time.perf_counter() - start
+
+    histograms = update_histograms({}, history)
+    start = time.perf_counter()
+    new_rows = new_rows.assign(Merchant=merchant_keys(new_rows["Description"]))
+    update_histograms(histograms, new_rows)
+    score_anomalies(new_rows, histograms)
+    detect_recurring(ledger[ledger["Merchant"].isin(new_rows["Merchant"].unique())])
+    incremental_s = time.perf_counter() - start
+
+    return {
+        "rows": len(ledger),
+        "anomalies": len(anomalies),
+        "recurring": len(recurring),
+        "full_ms": round(full_s * 1000, 2),
+        "incremental_ms": round(incremental_s * 1000, 2),
+    }
+
+
+def bench_fx_convert(config, data_manager, count=1000000):
+    """Time converting a synthetic multi-currency ledger to the base currency
+
+    Rates are synthetic business-day series, so weekend transactions use the
+    previous Friday's rate. Raises if the conversion differs from
+    pandas.merge_asof over the same rows.
+    """
+    rng = np.random.default_rng(0)
+    currencies = np.array([config.base_currency, "EUR", "GBP", "JPY", "CAD"], dtype=object)
+    rate_days = pd.bdate_range("2015-01-01", "2025-12-31")
+    frame = pd.DataFrame({
+        "Date": pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 4000, count), unit="D"),
+        "Currency": currencies[rng.integers(0, len(currencies), count)],
+        "Amount": np.round(rng.gamma(2.0, 40.0, count), 2),
+    })
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        fx_rates = FxRateTable(scratch_dir, config.base_currency)
+        for currency in currencies[1:]:
+            rates = pd.Series(np.exp(np.cumsum(rng.normal(0, 0.005, len(rate_days)))), index=rate_days)
+            fx_rates.update(currency, lambda start: rates[rates.index >= start], rate_days[0])
+        # Load the rate tables before timing
+        for currency in currencies[1:]:
+            fx_rates.rates(currency)
+
+        start = time.perf_counter()
+        converted = fx_rates.convert(frame["Amount"], frame["Currency"], frame["Date"])
+        convert_s = time.perf_counter() - start
+
+        # Reference: an as-of join per currency on a sample of rows
+        sample = frame.assign(Converted=converted).sample(20000, random_state=0)
+        max_error = 0.0
+        for currency, rows in sample.groupby("Currency"):
+            rows = rows.sort_values("Date")
+            if currency == config.base_currency:
+                expected = rows["Amount"].to_numpy()
+            else:
+                days, rates = fx_rates.rates(currency)
+                table = pd.DataFrame({"Date": pd.to_datetime(days.astype("datetime64[D]")).astype("datetime64[ns]"), "Rate": rates})
+                expected = (pd.merge_asof(rows, table, on="Date")["Rate"] * rows["Amount"].to_numpy()).to_numpy()
+            max_error = max(max_error, float(np.nanmax(np.abs(expected - rows["Converted"].to_numpy()))))
+    if max_error > 1e-9:
+        raise AssertionError(f"Converted amounts differ from merge_asof by {max_error:.2e}")
+
+    return {
+        "rows": count,
+        "currencies": len(currencies),
+        "convert_ms": round(convert_s * 1000, 2),
+        "max_error": max_error,
+    }
+
+
+def bench_net_worth(config, data_manager):
+    """Time the net worth series cold and cached
+
+    Raises if the holdings value differs from aligning each held ticker's
+    closes with pandas reindex/ffill.
+    """
+    holdings = data_manager.load_holdings()
+    held = holdings[holdings["Quantity"].fillna(0) != 0].groupby("Ticker")["Quantity"].sum()
+    if held.empty:
+        return {"skipped": "no holdings"}
+
+    from src.services import data_manager as data_manager_module
+    data_manager_module._NET_WORTH_CACHE.clear()
+    start = time.perf_counter()
+    series = data_manager.net_worth_series()
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data_manager.net_worth_series()
+    cached_s = time.perf_counter() - start
+
+    expected = pd.Series(0.0, index=series.index)
+    for ticker, quantity in held.items():
+        prices = data_manager.load_stock_data(ticker)
+        closes = pd.Series(prices["Close"].to_numpy(), index=bar_dates(prices))
+        closes = closes[~closes.index.duplicated(keep="last")]
+        expected += closes.reindex(series.index, method="ffill").fillna(0.0) * quantity
+    max_error = float(np.abs(expected.to_numpy() - series["Holdings"].to_numpy()).max())
+    if max_error > 1e-6:
+        raise AssertionError(f"Holdings value differs from the pandas reference by {max_error:.2e}")
+
+    return {
+        "days": len(series),
+        "tickers": len(held),
+        "cold_ms": round(cold_s * 1000, 2),
+        "cached_ms": round(cached_s * 1000, 2),
+        "max_error": max_error,
+    }
+
+
+def bench_dashboard_summary(config, data_manager):
+    """Time rebuilding the dashboard summary and reading it back cold and cached"""
+    from src.services import data_manager as data_manager_module
+    start = time.perf_counter()
+    summary = data_manager.update_dashboard_summary()
+    update_s = time.perf_counter() - start
+    if summary is None:
+        raise AssertionError("Dashboard summary could not be built")
+
+    data_manager_module._SUMMARY_CACHE.clear()
+    start = time.perf_counter()
+    data_manager.load_dashboard_summary()
+    cold_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    data_manager.load_dashboard_summary()
+    cached_s = time.perf_counter() - start
+
+    return {
+        "bytes": os.path.getsize(data_manager.summary_file),
+        "tickers": len(summary["stocks"]),
+        "update_ms": round(update_s * 1000, 2),
+        "load_cold_ms": round(cold_s * 1000, 2),
+        "load_cached_ms": round(cached_s * 1000, 2),
+    }
+
+
+def _panel_worker_returns(panel_dir):
+    """Worker: mean daily log return per ticker from the attached price panel"""
+    panel = attach_price_panel(panel_dir)
+    closes = panel.field("Close")
+    returns = [np.diff(np.log(column[~np.isnan(column)])).mean() for column in closes.T]
+    return dict(zip(panel.tickers, returns))
+
+
+def _csv_worker_returns(stocks_dir, tickers):
+    """Worker: mean daily log return per ticker, parsing each ticker's CSV"""
+    manager = DataManager(os.path.dirname(stocks_dir))
+    returns = {}
+    for ticker in tickers:
+        closes = manager.load_stock_data(ticker)["Close"].to_numpy(dtype=float)
+        returns[ticker] = np.diff(np.log(closes)).mean()
+    return returns
+
+
+def bench_price_panel(config, data_manager, workers=4):
+    """Time rebuilding the price panel and reading prices in worker processes
+
+    Each worker either attaches the panel or parses every ticker CSV, as a
+    process pool would without the panel. Raises if the results differ.
+    """
+    tickers = data_manager.list_tickers()
+    if not tickers:
+        return {"skipped": "no stock data"}
+
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        panel = PricePanel(scratch_dir)
+        start = time.perf_counter()
+        for ticker in tickers:
+            panel.update_ticker(ticker, data_manager.load_stock_data(ticker))
+        rebuild_s = time.perf_counter() - start
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(abs, range(workers)))
+            start = time.perf_counter()
+            from_panel = list(executor.map(_panel_worker_returns, [scratch_dir] * workers))
+            panel_s = time.perf_counter() - start
+
+            start = time.perf_counter()
+            from_csv = list(executor.map(_csv_worker_returns, [data_manager.stocks_dir] * workers, [tickers] * workers))
+            csv_s = time.perf_counter() - start
+
+        size = sum(os.path.getsize(os.path.join(scratch_dir, name)) for name in os.listdir(scratch_dir))
+
+    max_error = max(abs(from_panel[0][ticker] - from_csv[0][ticker]) for ticker in tickers)
+    if max_error > 1e-12:
+        raise AssertionError(f"Panel returns differ from the CSV histories by {max_error:.2e}")
+
+    return {
+        "tickers": len(tickers),
+        "panel_mb": round(size / 1e6, 2),
+        "rebuild_s": round(rebuild_s, 3),
+        "workers": workers,
+        "attach_ms": round(panel_s * 1000, 2),
+        "parse_csv_ms": round(csv_s * 1000, 2),
+    }
+
+
+def bench_projection(config, data_manager, paths=100000, years=10):
+    """Time a Monte Carlo projection on the process pool, then the cached repeat
+
+    Raises if the same seed gives different bands, or if the combined
+    batch percentiles of total net worth at the horizon are more than 2% of
+    the p5-p95 spread from the exact percentiles over all paths.
+    """
+    from src.services import forecast_cache as forecast_cache_module
+    forecast_cache_module._MEMORY_CACHE.clear()
+    with tempfile.TemporaryDirectory() as scratch_dir:
+        projector = PortfolioProjector(ForecastCache(scratch_dir), config.projection_workers)
+        inputs = projector.inputs(data_manager)
+        params = {
+            "years": years, "paths": paths, "seed": 7, "start_portfolio": max(inputs["current_value"], 10000.0),
+            "start_cash": 0.0, "monthly_income": float(np.median(inputs["spending_pool"])), "monthly_investment": 500.0,
+        }
+
+        batches = []
+        start = time.perf_counter()
+        bands = projector.run(inputs, params, on_batch=lambda partial, done, total: batches.append(done))
+        run_s = time.perf_counter() - start
+
+        start = time.perf_counter()
+        projector.run(inputs, params)
+        cached_s = time.perf_counter() - start
+
+    # The same seed must reproduce the bands when run serially in this process
+    sizes = [min(BATCH_PATHS, paths - offset) for offset in range(0, paths, BATCH_PATHS)]
+    seeds = np.random.SeedSequence(params["seed"]).spawn(len(sizes))
+    arguments = (
+        inputs["return_pool"], inputs["spending_pool"], params["start_portfolio"], params["start_cash"],
+        params["monthly_income"], params["monthly_investment"]
+    )
+    results = [simulate_batch(seed, size, years * 12, *arguments, keep_final=True) for seed, size in zip(seeds, sizes)]
+    serial = combine_batches(results)
+    if not np.allclose(serial["bands"][2, :, -1], bands.iloc[-1][band_columns("Total")].to_numpy()):
+        raise AssertionError("Projection bands are not reproducible for the same seed")
+
+    # Combined batch percentiles against the exact percentiles over all paths
+    exact = np.percentile(np.concatenate([result["final"] for result in results]), PERCENTILES)
+    spread = float(exact[-1] - exact[0])
+    max_gap = float(np.abs(serial["bands"][2, :, -1] - exact).max())
+    if spread and max_gap > 0.02 * abs(spread):
+        raise AssertionError(f"Combined percentiles differ from the exact percentiles by {max_gap:.2f}")
+
+    return {
+        "paths": paths,
+        "months": years * 12,
+        "workers": config.projection_workers,
+        "batches": len(batches),
+        "run_s": round(run_s, 3),
+        "cached_ms": round(cached_s * 1000, 2),
+    }
+
+
+# Benchmarks: name -> function(config, data_manager)
+BENCHMARKS = {
+    "finance_load": bench_finance_load,
+    "finance_query": bench_finance_query,
+    "figures": bench_figures,
+    "notion_decode": bench_notion_decode,
+    "batch_train": bench_batch_train,
+    "indicators": bench_indicators,
+    "validation": bench_validation,
+    "search": bench_search,
+    "categorize": bench_categorize,
+    "spending": bench_spending,
+    "fx_convert": bench_fx_convert,
+    "net_worth": bench_net_worth,
+    "dashboard_summary": bench_dashboard_summary,
+    "price_panel": bench_price_panel,
+    "projection": bench_projection,
+}
+
+
+def cmd_bench(args, config):
+    """Run benchmarks and report their timings"""
+    data_manager = DataManager.from_config(config)
+    names = args.only or list(BENCHMARKS)
+    stages = []
+    for name in names:
+        runs = [timed(name, BENCHMARKS[name], config, data_manager) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["seconds"])
+        stages.append(best)
+    return report(stages, args.json)
+
+
+def cmd_loadtest(args, config):
+    """Render the pages from concurrent headless sessions and report latency percentiles"""
+    from src.loadtest import run_load_test, scratch_directory
+
+    sizes = {"transactions": args.transactions, "tickers": args.tickers}
+    with scratch_directory(args.workdir, keep=args.keep) as workdir:
+        result = run_load_test(
+            config,
+            DataManager.from_config(config),
+            sessions=args.sessions,
+            iterations=args.iterations,
+            refresh_rate=args.refresh_rate,
+            sizes=sizes,
+        )
+    result["workdir"] = workdir
+
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+    else:
+        print(
+            f"{result['sessions']} sessions x {result['iterations']} iterations: {result['renders']} renders "
+            f"in {result['wall_seconds']}s, process peak RSS {result['process_peak_rss_mb']} MB"
+        )
+        print(f"{'page':<16} {'action':<18} {'renders':>7} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} {'max_ms':>9} {'errors':>6} {'rss_mb':>8}")
+        for row in result["pages"]:
+            rss = "" if row["peak_rss_mb"] is None else row["peak_rss_mb"]
+            print(
+                f"{row['page']:<16} {row['action']:<18} {row['renders']:>7} {row['p50_ms']:>9} {row['p95_ms']:>9} "
+                f"{row['p99_ms']:>9} {row['max_ms']:>9} {row['errors']:>6} {rss:>8}"
+            )
+
+    # Fail on render errors or when a page's p95 latency exceeds the budget
+    pages = [row for row in result["pages"] if row["action"] == "all"]
+    failed = any(row["errors"] for row in pages)
+    if args.max_p95_ms is not None:
+        failed = failed or any(row["p95_ms"] > args.max_p95_ms for row in pages)
+    return 1 if failed else 0
+
+
+def build_parser():
+    """Build the argument parser for all subcommands"""
+    parser = argparse.ArgumentParser(prog="wealthsync", description="WealthSync headless batch jobs")
+    parser.add_argument("--config", help="Path to a YAML configuration file")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Options every command accepts after its name; SUPPRESS keeps a --json
+    # given before the command from being reset by the subcommand's default
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", default=argparse.SUPPRESS, help="Print results as JSON")
+
+    ingest = subparsers.add_parser("ingest", parents=[common], help="Fetch data from all providers in parallel")
+    ingest.add_argument("--only", nargs="+", choices=list(INGEST_STAGES), help="Run only these stages")
+    ingest.set_defaults(func=cmd_ingest)
+
+    precompute = subparsers.add_parser("precompute", parents=[common], help="Precompute analytics and models")
+    precompute.add_argument("--only", nargs="+", choices=list(PRECOMPUTE_STAGES), help="Run only these stages")
+    precompute.set_defaults(func=cmd_precompute)
+
+    export = subparsers.add_parser("export", parents=[common], help="Export stored data to a file")
+    export.add_argument("dataset", choices=["finance", "stock"])
+    export.add_argument("--ticker", help="Ticker to export (stock exports)")
+    export.add_argument("--start", help="First date to include (finance exports)")
+    export.add_argument("--end", help="Last date to include (finance exports)")
+    export.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv", help="Export file format")
+    export.add_argument("--output", help="Output file path")
+    export.set_defaults(func=cmd_export)
+
+    bench = subparsers.add_parser("bench", parents=[common], help="Run benchmarks")
+    bench.add_argument("--only", nargs="+", choices=list(BENCHMARKS), help="Run only these benchmarks")
+    bench.add_argument("--repeat", type=int, default=3, help="Runs per benchmark; the best is reported")
+    bench.set_defaults(func=cmd_bench)
+
+    loadtest = subparsers.add_parser("loadtest", parents=[common], help="Load test page renders with concurrent headless sessions")
+    loadtest.add_argument("--sessions", type=int, default=10, help="Concurrent simulated users")
+    loadtest.add_argument("--iterations", type=int, default=3, help="Passes over the pages per session")
+    loadtest.add_argument("--refresh-rate", type=float, default=0.0, help="Chance per page visit of clicking Update")
+    loadtest.add_argument("--transactions", type=int, default=20000, help="Synthetic ledger size when seeding")
+    loadtest.add_argument("--tickers", type=int, default=20, help="Synthetic tickers when seeding")
+    loadtest.add_argument("--workdir", help="App working directory to reuse (seeded if empty); default is a temporary one")
+    loadtest.add_argument("--keep", action="store_true", help="Keep the temporary working directory")
+    loadtest.add_argument("--max-p95-ms", type=float, help="Exit non-zero if any page's p95 render latency exceeds this")
+    loadtest.set_defaults(func=cmd_loadtest)
+
+    return parser
+
+
+def main(argv=None):
+    """Run the command-line interface"""
+    args = build_parser().parse_args(argv)
+    config = get_config(args.config)
+    return args.func(args, config)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
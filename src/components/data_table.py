@@ -0,0 +1,64 @@
+import math
+import streamlit as st
+from configs.config import get_config
+
+# Display symbols for common base currencies; others are shown by their code
+CURRENCY_SYMBOLS = {"USD": "$", "EUR": "€", "GBP": "£", "JPY": "¥", "INR": "₹", "CAD": "CA$", "AUD": "A$"}
+
+def currency_prefix():
+    """Prefix for amounts in the configured base currency"""
+    currency = get_config().base_currency
+    return CURRENCY_SYMBOLS.get(currency, f"{currency} ")
+
+def format_money(value):
+    """Format an amount in the base currency, e.g. for st.metric"""
+    return f"{currency_prefix()}{value:,.2f}"
+
+def money_label(label):
+    """Chart axis label for amounts in the base currency, e.g. "Total Amount ($)" """
+    return f"{label} ({currency_prefix().strip()})"
+
+def money_column(label=None):
+    """Column config that displays a numeric column in the base currency"""
+    return st.column_config.NumberColumn(label, format=f"{currency_prefix()}%.2f")
+
+def date_column(label=None, date_format="YYYY-MM-DD"):
+    """Column config that displays a datetime column as a date"""
+    return st.column_config.DateColumn(label, format=date_format)
+
+def finance_column_config():
+    """Display formats for ledger rows; the frontend applies them, so columns keep their dtypes
+
+    Built per render so the currency follows configuration reloads.
+    """
+    return {
+        "Date": date_column(),
+        "Amount": money_column(),
+    }
+
+def render_paged_table(frame, key, column_config=None, page_size=100, newest_first=False):
+    """Render one page of a frame with st.dataframe
+
+    Only the visible page is sliced (a view, not a copy) and sent to the
+    browser. With newest_first the frame is read from the end, so a
+    date-sorted ledger shows its latest rows first without being reversed.
+    """
+    total = len(frame)
+    page_count = max(1, math.ceil(total / page_size))
+
+    page = 1
+    if page_count > 1:
+        col1, col2 = st.columns([1, 3])
+        with col1:
+            page = st.number_input("Page", min_value=1, max_value=page_count, value=1, key=f"{key}_page")
+        with col2:
+            st.caption(f"Page {page} of {page_count} ({total:,} rows)")
+
+    start = (page - 1) * page_size
+    stop = min(start + page_size, total)
+    if newest_first:
+        rows = frame.iloc[total - stop:total - start].iloc[::-1]
+    else:
+        rows = frame.iloc[start:stop]
+
+    st.dataframe(rows, column_config=column_config, hide_index=True, use_container_width=True)
@@ -0,0 +1,38 @@
+import os
+import json
+import streamlit as st
+from src.services.exporter import ExportService, EXPORT_FORMATS
+
+def render_export_panel(config, name, params, data_version, frame_fn, file_stem, label="Download as CSV"):
+    """Render an export control that only builds the export when the user asks for it
+
+    frame_fn is called lazily to produce the data; the generated file is
+    cached by the export service and served from disk on later requests.
+    """
+    export_service = ExportService.from_config(config)
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        fmt = st.selectbox("Format", export_service.available_formats(), key=f"export_format_{name}")
+
+    # Remember which export has been prepared for the current filters and format
+    state_key = f"export_ready_{name}"
+    request_key = json.dumps({"params": params, "version": data_version, "format": fmt}, sort_keys=True, default=str)
+    prepared = st.session_state.get(state_key)
+
+    with col2:
+        if prepared and prepared[0] == request_key and os.path.exists(prepared[1]):
+            extension, mime = EXPORT_FORMATS[fmt]
+            with open(prepared[1], 'rb') as file:
+                st.download_button(
+                    label=label,
+                    data=file,
+                    file_name=f"{file_stem}{extension}",
+                    mime=mime,
+                    key=f"export_download_{name}",
+                )
+        elif st.button("Prepare Export", key=f"export_prepare_{name}"):
+            with st.spinner("Building export..."):
+                path = export_service.get_or_build(name, params, data_version, fmt, frame_fn)
+            st.session_state[state_key] = (request_key, path)
+            st.rerun()
@@ -0,0 +1,106 @@
+import plotly.express as px
+import plotly.graph_objects as go
+from src.components.data_table import money_label
+
+def build_category_pie(filtered_data):
+    """Build the spending-by-category pie chart"""
+    # Prepare data for pie chart
+    pie_data = filtered_data.groupby('Category')['Amount'].sum().reset_index()
+    pie_data = pie_data.sort_values('Amount', ascending=False)
+
+    # Create pie chart
+    return px.pie(
+        pie_data,
+        values='Amount',
+        names='Category',
+        title='Spending Distribution',
+        hole=0.4,
+        color_discrete_sequence=px.colors.qualitative.Pastel
+    )
+
+def build_top_categories_bar(filtered_data):
+    """Build the top 5 spending categories bar chart"""
+    # Get top categories
+    top_categories = filtered_data.groupby('Category')['Amount'].sum().sort_values(ascending=False).head(5)
+    top_categories = top_categories.reset_index()
+
+    # Create bar chart
+    return px.bar(
+        top_categories,
+        x='Category',
+        y='Amount',
+        title='Top 5 Spending Categories',
+        color='Amount',
+        color_continuous_scale='Viridis'
+    )
+
+def build_monthly_trend(filtered_data):
+    """Build the monthly spending trend line chart with area fill"""
+    # Group by month for visualization
+    monthly_data = filtered_data.groupby(filtered_data['Date'].dt.to_period('M'))['Amount'].sum()
+    monthly_data = monthly_data.reset_index()
+    monthly_data['Month'] = monthly_data['Date'].astype(str)
+
+    amount_label = money_label("Total Amount")
+
+    # Create line chart with area fill
+    fig_line = px.line(
+        monthly_data,
+        x='Month',
+        y='Amount',
+        markers=True,
+        title='Monthly Spending Trend',
+        labels={'Amount': amount_label, 'Month': 'Month'},
+        line_shape='spline'
+    )
+
+    # Add area under the line
+    fig_line.add_trace(
+        go.Scatter(
+            x=monthly_data['Month'],
+            y=monthly_data['Amount'],
+            mode='lines',
+            fill='tozeroy',
+            fillcolor='rgba(73, 176, 222, 0.2)',
+            line=dict(width=0.5),
+            showlegend=False
+        )
+    )
+
+    # Customize layout
+    fig_line.update_layout(
+        xaxis_title="Month",
+        yaxis_title=amount_label,
+        hovermode="x unified"
+    )
+    return fig_line
+
+def build_category_by_month(filtered_data):
+    """Build the grouped bar chart comparing the top 3 categories by month"""
+    # Get top categories
+    top_cats = filtered_data.groupby('Category')['Amount'].sum().nlargest(3).index.tolist()
+
+    # Filter data for top categories
+    top_cat_data = filtered_data[filtered_data['Category'].isin(top_cats)]
+
+    # Group by month and category
+    cat_month_data = top_cat_data.groupby([top_cat_data['Date'].dt.to_period('M'), 'Category'])['Amount'].sum().reset_index()
+    cat_month_data['Month'] = cat_month_data['Date'].astype(str)
+
+    # Create grouped bar chart
+    return px.bar(
+        cat_month_data,
+        x='Month',
+        y='Amount',
+        color='Category',
+        title='Top 3 Categories by Month',
+        barmode='group'
+    )
+
+# Financial Data page charts: chart type -> builder(filtered_data)
+FINANCE_CHARTS = {
+    "category_pie": build_category_pie,
+    "top_categories_bar": build_top_categories_bar,
+    "monthly_trend": build_monthly_trend,
+    "category_by_month": build_category_by_month,
+}
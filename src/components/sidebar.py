@@ -1,5 +1,5 @@
 import streamlit as st
-from configs.config import Config
+from configs.config import get_config
 
 def render_sidebar():
     """Render the sidebar with configuration options"""
@@ -16,7 +16,7 @@ def render_sidebar():
     st.sidebar.header("Configuration")
     
     # Initialize configuration
-    config = Config()
+    config = get_config()
     
     # Display data sources status
     st.sidebar.subheader("Data Sources")
@@ -25,6 +25,8 @@ def render_sidebar():
     
     st.sidebar.write(f"Notion API: {'✅ Connected' if notion_connected else '❌ Not configured'}")
     st.sidebar.write(f"Google Sheets: {'✅ Connected' if sheets_connected else '❌ Not configured'}")
+    if config.offline_mode:
+        st.sidebar.write("Offline mode: serving cached data only")
     
     # Navigation
     st.sidebar.header("Navigation")
@@ -34,6 +36,7 @@ def render_sidebar():
         "Dashboard": "main",
         "Stock Analysis": "stock_analysis", 
         "Financial Data": "financial_data",
+        "Projections": "projections",
         "Settings": "settings"
     }
     
@@ -0,0 +1,354 @@
+"""
+Headless load test of the Streamlit pages.
+
+Seeds a scratch data directory through the real refresh pipeline with
+stand-in providers (no network access), then drives wealth_sync_app.py with
+Streamlit's app testing API from N concurrent sessions. Each session flips
+between pages and interacts with their widgets; every rerun is timed and
+the resident memory of the process is sampled while pages render:
+
+    python main.py loadtest --sessions 50 --iterations 3
+
+All sessions share this process, as they would share one Streamlit server,
+so in-process caches and the GIL are contended the same way.
+"""
+
+import os
+import sys
+import time
+import shutil
+import resource
+import tempfile
+import threading
+from contextlib import contextmanager
+from unittest import mock
+from unittest.mock import MagicMock
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+import src.services.refresh as refresh
+from src.services.notion_decoder import decode_pages, make_synthetic_pages
+from src.utils.logger import setup_logger
+
+logger = setup_logger("loadtest")
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_FILE = os.path.join(REPO_DIR, "wealth_sync_app.py")
+LOADTEST_PAGES = ["Dashboard", "Stock Analysis", "Financial Data"]
+
+# Queries typed into the transaction search box
+SEARCH_QUERIES = ["coffee", "uber", "rent", "gro", "net", "transaction 1"]
+
+MERCHANTS = {
+    "Food": ["WHOLE FOODS MKT", "TRADER JOES", "STARBUCKS COFFEE", "CHIPOTLE"],
+    "Transport": ["UBER TRIP", "SHELL OIL", "BART CLIPPER"],
+    "Utilities": ["PG&E", "COMCAST", "AT&T WIRELESS"],
+    "Fun": ["NETFLIX.COM", "SPOTIFY", "AMC THEATRES"],
+    "Rent": ["RENT PAYMENT"],
+}
+
+# Interval between resident memory samples
+RSS_SAMPLE_SECONDS = 0.02
+
+
+def make_fake_providers(transactions=20000, tickers=20, bars=500, seed=0):
+    """Build stand-ins for the Notion, Google Sheets, yfinance and exchange rate providers
+
+    They take the same constructor arguments as the real providers and
+    return deterministic synthetic data, so repeated refreshes see the same
+    records. Returns a dict of refresh module attribute name -> class.
+    """
+    class FakeNotionData:
+        def __init__(self, token, database_id, cache=None, extra_properties=None):
+            pass
+
+        def fetch_data(self):
+            return decode_pages(make_synthetic_pages(transactions // 2, seed=seed))
+
+    class FakeGoogleSheetsData:
+        def __init__(self, credentials_path, scope, cache=None):
+            pass
+
+        def fetch_holdings(self, spreadsheet_id):
+            rng = np.random.default_rng(seed)
+            return pd.DataFrame({
+                "Ticker": [f"SYN{i:03d}" for i in range(tickers)],
+                "Quantity": rng.integers(0, 200, tickers).astype(float),
+                "CostBasis": np.round(rng.uniform(1000, 20000, tickers), 2),
+            })
+
+        def fetch_finance_data(self, spreadsheet_id):
+            rng = np.random.default_rng(seed)
+            count = transactions - transactions // 2
+            names = np.array([name for names in MERCHANTS.values() for name in names])
+            labels = np.array([category for category, names in MERCHANTS.items() for _ in names], dtype=object)
+            picks = rng.integers(0, len(names), count)
+            categories = np.where(rng.random(count) < 0.1, None, labels[picks])
+            days = rng.integers(0, 5 * 365, count)
+            return pd.DataFrame({
+                "Date": (np.datetime64("2020-01-01") + days).astype(str),
+                "Category": categories,
+                "Description": [f"{name} #{number}" for name, number in zip(names[picks], rng.integers(1, 999, count))],
+                "Amount": np.round(rng.gamma(2.0, 40.0, count), 2),
+                "Currency": np.where(rng.random(count) < 0.05, "EUR", ""),
+            })
+
+    class FakeFxRateData:
+        def __init__(self, cache=None):
+            pass
+
+        def fetch_rates(self, currency, base_currency, start):
+            dates = pd.bdate_range("2019-01-01", "2025-12-31")
+            rates = 1.1 * np.exp(np.cumsum(np.random.default_rng(seed).normal(0, 0.003, len(dates))))
+            return pd.Series(rates, index=dates)[lambda series: series.index >= start]
+
+    class FakeStockData:
+        def __init__(self, cache=None):
+            pass
+
+        def iter_stock_data(self, tickers, period="1y"):
+            dates = pd.bdate_range(end="2024-06-28", periods=bars, tz="America/New_York", name="Date")
+            for i, ticker in enumerate(tickers):
+                rng = np.random.default_rng(seed + i)
+                close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+                yield ticker, pd.DataFrame({
+                    "Open": close * 0.995,
+                    "High": close * 1.01,
+                    "Low": close * 0.985,
+                    "Close": close,
+                    "Volume": rng.integers(100000, 1000000, bars),
+                    "Dividends": 0.0,
+                    "Stock Splits": 0.0,
+                }, index=dates)
+
+    return {
+        "NotionData": FakeNotionData,
+        "GoogleSheetsData": FakeGoogleSheetsData,
+        "StockData": FakeStockData,
+        "FxRateData": FakeFxRateData,
+    }
+
+
+@contextmanager
+def fake_providers(**sizes):
+    """Route every refresh through the stand-in providers while the context is active"""
+    with mock.patch.multiple(refresh, **make_fake_providers(**sizes)):
+        yield
+
+
+def seed_data(config, data_manager):
+    """Fill the data directory by running both refreshes (call inside fake_providers)"""
+    finance = refresh.refresh_finance_data(config, data_manager)
+    stocks = refresh.refresh_stock_data(config, data_manager)
+    return {"finance": finance, "stocks": stocks}
+
+
+@contextmanager
+def shared_runtime():
+    """Let concurrent AppTest sessions share one stand-in Streamlit runtime
+
+    AppTest installs a mock runtime for each run and removes it afterwards,
+    so runs in parallel threads would tear down each other's runtime.
+    Sharing one also matches a real server, where st.cache_data entries are
+    shared by all sessions.
+    """
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    with mock.patch.object(Runtime, "instance", classmethod(lambda cls: runtime)), \
+            mock.patch.object(Runtime, "exists", classmethod(lambda cls: True)):
+        yield runtime
+
+
+def _rss_bytes():
+    """Current resident set size of this process (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm", "r") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class RenderRecorder:
+    """Collects render timings and the peak RSS seen while each page was rendering
+
+    RSS is process-wide, so a page's peak includes whatever other sessions
+    were rendering at the same time.
+    """
+    def __init__(self):
+        self.samples = []
+        self.peak_rss = {}
+        self._active = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self):
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self):
+        while not self._stop.wait(RSS_SAMPLE_SECONDS):
+            rss = _rss_bytes()
+            with self._lock:
+                for page, active in self._active.items():
+                    if active:
+                        self.peak_rss[page] = max(self.peak_rss.get(page, 0), rss)
+
+    def render(self, at, page, action):
+        """Rerun a session's script and record how long it took"""
+        with self._lock:
+            self._active[page] = self._active.get(page, 0) + 1
+        start = time.perf_counter()
+        try:
+            at.run()
+            errors = len(at.exception) + len(at.error)
+        except Exception as e:
+            logger.error(f"Render of {page} ({action}) failed: {e}")
+            errors = 1
+        seconds = time.perf_counter() - start
+        rss = _rss_bytes()
+        with self._lock:
+            self._active[page] -= 1
+            self.peak_rss[page] = max(self.peak_rss.get(page, 0), rss)
+            self.samples.append({"page": page, "action": action, "seconds": seconds, "errors": errors})
+
+
+def _widget(elements, label):
+    return next((element for element in elements if element.label == label), None)
+
+
+def page_actions(at, page, rng, refresh_rate=0.0):
+    """Yield (action name, apply function) pairs of realistic interactions with a page
+
+    Widgets are looked up after each rerun, since the page content depends
+    on earlier interactions.
+    """
+    if page == "Stock Analysis":
+        select = _widget(at.selectbox, "Select Stock")
+        if select is not None and select.options:
+            yield "select_ticker", lambda: select.set_value(select.options[rng.integers(len(select.options))])
+        horizon = _widget(at.slider, "Forecast Horizon (trading days)")
+        if horizon is not None:
+            yield "forecast_horizon", lambda: horizon.set_value(int(rng.integers(5, 31)))
+        predict = _widget(at.button, "Run Prediction Model")
+        if predict is not None:
+            yield "predict", predict.click
+        update = _widget(at.button, "🔄 Update Stock Data")
+        if update is not None and rng.random() < refresh_rate:
+            yield "refresh", update.click
+    elif page == "Financial Data":
+        start = _widget(at.date_input, "Start Date")
+        end = _widget(at.date_input, "End Date")
+        if start is not None and end is not None:
+            months = int(rng.integers(1, 25))
+            yield "date_range", lambda: start.set_value(max(start.min, (pd.Timestamp(end.value) - pd.DateOffset(months=months)).date()))
+        search = _widget(at.text_input, "Search Transactions")
+        if search is not None:
+            yield "search", lambda: search.set_value(SEARCH_QUERIES[rng.integers(len(SEARCH_QUERIES))])
+        search = _widget(at.text_input, "Search Transactions")
+        if search is not None:
+            yield "clear_search", lambda: search.set_value("")
+        update = _widget(at.button, "🔄 Update Data")
+        if update is not None and rng.random() < refresh_rate:
+            yield "refresh", update.click
+
+
+def run_session(recorder, session_id, iterations, pages=LOADTEST_PAGES, refresh_rate=0.0, timeout=120, seed=0):
+    """Simulate one user: open the app, then visit the pages in random order and use their widgets"""
+    rng = np.random.default_rng(seed + session_id)
+    at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+    recorder.render(at, "Dashboard", "open")
+    for _ in range(iterations):
+        for page in rng.permutation(pages):
+            at.sidebar.radio[0].set_value(page)
+            recorder.render(at, page, "navigate")
+            for action, apply in page_actions(at, page, rng, refresh_rate):
+                apply()
+                recorder.render(at, page, action)
+
+
+def summarize(samples, peak_rss):
+    """Aggregate render samples into latency percentiles per page and per page action"""
+    frame = pd.DataFrame(samples)
+    rows = []
+    for keys, group in [((page, "all"), group) for page, group in frame.groupby("page")] + list(frame.groupby(["page", "action"])):
+        milliseconds = group["seconds"].to_numpy() * 1000
+        p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+        rows.append({
+            "page": keys[0],
+            "action": keys[1],
+            "renders": len(group),
+            "p50_ms": round(float(p50), 1),
+            "p95_ms": round(float(p95), 1),
+            "p99_ms": round(float(p99), 1),
+            "max_ms": round(float(milliseconds.max()), 1),
+            "errors": int(group["errors"].sum()),
+            "peak_rss_mb": round(peak_rss.get(keys[0], 0) / 2 ** 20, 1) if keys[1] == "all" else None,
+        })
+    return sorted(rows, key=lambda row: (row["page"], row["action"] != "all", row["action"]))
+
+
+def run_load_test(config, data_manager, sessions=10, iterations=3, refresh_rate=0.0, sizes=None, seed=0):
+    """Seed data if needed, warm the app up with one session, then run the concurrent sessions
+
+    Runs with the current directory as the app's working directory. Returns
+    the per-page summary rows and run metadata.
+    """
+    # The app imports its pages relative to the repository, wherever it runs from
+    if REPO_DIR not in sys.path:
+        sys.path.insert(0, REPO_DIR)
+
+    with fake_providers(**(sizes or {})), shared_runtime():
+        seeded = None
+        if data_manager.finance_date_range() is None or not data_manager.list_tickers():
+            seeded = seed_data(config, data_manager)
+
+        # Imports, module caches and cached artifacts are built once, as on a warm server
+        with RenderRecorder() as warmup:
+            run_session(warmup, 0, 1, seed=seed)
+
+        started = time.perf_counter()
+        with RenderRecorder() as recorder:
+            with ThreadPoolExecutor(max_workers=sessions) as executor:
+                futures = [
+                    executor.submit(run_session, recorder, session_id, iterations, refresh_rate=refresh_rate, seed=seed)
+                    for session_id in range(sessions)
+                ]
+                for future in futures:
+                    future.result()
+        wall_seconds = time.perf_counter() - started
+
+    return {
+        "sessions": sessions,
+        "iterations": iterations,
+        "renders": len(recorder.samples),
+        "wall_seconds": round(wall_seconds, 2),
+        "process_peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "seeded": seeded,
+        "pages": summarize(recorder.samples, recorder.peak_rss),
+    }
+
+
+@contextmanager
+def scratch_directory(path=None, keep=False):
+    """Change into a working directory for the app, a temporary one unless path is given"""
+    previous = os.getcwd()
+    directory = path or tempfile.mkdtemp(prefix="wealthsync_loadtest_")
+    os.makedirs(directory, exist_ok=True)
+    os.chdir(directory)
+    try:
+        yield directory
+    finally:
+        os.chdir(previous)
+        if path is None and not keep:
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,92 @@
+import json
+import hashlib
+import pandas as pd
+from src.models.indicators import wilder_rsi
+
+# Feature definitions: name -> (kind, parameters). Every feature only looks
+# back in time, so rows already computed never change when new bars arrive.
+FEATURE_DEFINITIONS = {
+    "return_1": ("return", {"periods": 1}),
+    "return_2": ("return", {"periods": 2}),
+    "return_5": ("return", {"periods": 5}),
+    "return_10": ("return", {"periods": 10}),
+    "volatility_10": ("volatility", {"window": 10}),
+    "volatility_20": ("volatility", {"window": 20}),
+    "ma20_ratio": ("ma_ratio", {"window": 20}),
+    "ma50_ratio": ("ma_ratio", {"window": 50}),
+    "rsi_14": ("rsi", {"window": 14, "smoothing": "wilder"}),
+    "volume_ratio_20": ("volume_ratio", {"window": 20}),
+    "day_of_week": ("calendar", {"field": "dayofweek"}),
+    "month": ("calendar", {"field": "month"}),
+}
+FEATURE_COLUMNS = list(FEATURE_DEFINITIONS)
+
+# Wilder RSI depends on the whole history; after this many windows of
+# warm-up the starting point's weight is below 1e-8, so RSI computed from a
+# tail of the history matches the full-history value
+RSI_WARMUP_WINDOWS = 20
+
+
+def _lookback(kind, params):
+    if kind == "rsi":
+        return params["window"] * RSI_WARMUP_WINDOWS
+    return params.get("window", params.get("periods", 0))
+
+
+# Bars of history needed before a row's features are all defined
+FEATURE_LOOKBACK = 1 + max(_lookback(kind, params) for kind, params in FEATURE_DEFINITIONS.values())
+
+
+def feature_definition_hash(definitions=FEATURE_DEFINITIONS):
+    """Hash the feature definitions; stored features are only reused under the same hash"""
+    payload = json.dumps(definitions, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:12]
+
+
+def bar_dates(prices):
+    """Get tz-naive bar dates from a stored price history (Date column or DatetimeIndex)"""
+    dates = prices['Date'] if 'Date' in prices.columns else prices.index.to_series()
+    return pd.DatetimeIndex(pd.to_datetime(dates, utc=True)).tz_localize(None).normalize()
+
+
+def _compute_feature(kind, params, close, volume, returns, dates):
+    """Compute one feature column from close prices, volumes and daily returns"""
+    if kind == "return":
+        return close.pct_change(params["periods"])
+    if kind == "volatility":
+        return returns.rolling(params["window"]).std()
+    if kind == "ma_ratio":
+        return close / close.rolling(params["window"]).mean() - 1
+    if kind == "rsi":
+        # Same Wilder RSI as the indicators shown on the stock page
+        return pd.Series(wilder_rsi(close.to_numpy(), params["window"])[0], index=close.index)
+    if kind == "volume_ratio":
+        return volume / volume.rolling(params["window"]).mean()
+    if kind == "calendar":
+        return pd.Series(getattr(dates, params["field"]), index=close.index, dtype=float)
+    raise ValueError(f"Unknown feature kind: {kind}")
+
+
+def build_features(prices, definitions=FEATURE_DEFINITIONS):
+    """Build the feature frame for a price history, indexed by bar date
+
+    Includes the Close column so targets can be derived at training time.
+    Early rows whose lookback windows are incomplete contain NaN.
+    """
+    dates = bar_dates(prices)
+    close = pd.Series(prices['Close'].to_numpy(dtype=float), index=dates)
+    volume = pd.Series(prices['Volume'].to_numpy(dtype=float), index=dates)
+    returns = close.pct_change()
+
+    features = pd.DataFrame({'Close': close}, index=dates)
+    for name, (kind, params) in definitions.items():
+        features[name] = _compute_feature(kind, params, close, volume, returns, dates)
+    features.index.name = 'Date'
+    return features
+
+
+def make_training_frame(features, horizon=1):
+    """Add the Target column (Close `horizon` bars ahead) and drop incomplete rows"""
+    frame = features.copy()
+    frame['Target'] = frame['Close'].shift(-horizon)
+    return frame.dropna()
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+
+# Moving average columns and their windows
+MA_WINDOWS = {"MA50": 50, "MA200": 200}
+RSI_WINDOW = 14
+INDICATOR_COLUMNS = list(MA_WINDOWS) + ["RSI"]
+
+# Closes kept in the rolling state; enough for the longest moving average
+STATE_TAIL = max(MA_WINDOWS.values())
+
+
+def _rsi(avg_gain, avg_loss):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
+def _wilder(seed, values, window=RSI_WINDOW):
+    """Continue Wilder smoothing from seed over values: avg = avg + (value - avg) / window"""
+    if len(values) <= 64:
+        # A plain recurrence is cheaper than building a Series for a few new bars
+        smoothed, average = np.empty(len(values)), seed
+        for i, value in enumerate(values):
+            average = (average * (window - 1) + value) / window
+            smoothed[i] = average
+        return smoothed
+    smoothed = pd.Series(np.concatenate([[seed], values])).ewm(alpha=1 / window, adjust=False).mean()
+    return smoothed.to_numpy()[1:]
+
+
+def wilder_rsi(closes, window=RSI_WINDOW):
+    """Wilder RSI over a close history; NaN for the first window closes
+
+    Smoothing is seeded with the simple average of the first window moves.
+    Returns the RSI per close and the final average gain and loss (None
+    before window moves), from which update_indicators continues.
+    """
+    closes = np.asarray(closes, dtype=float)
+    delta = np.diff(closes)
+    rsi = np.full(len(closes), np.nan)
+    if len(delta) < window:
+        return rsi, None, None
+
+    gains, losses = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+    seed_gain, seed_loss = gains[:window].mean(), losses[:window].mean()
+    avg_gains = np.concatenate([[seed_gain], _wilder(seed_gain, gains[window:], window)])
+    avg_losses = np.concatenate([[seed_loss], _wilder(seed_loss, losses[window:], window)])
+    rsi[window:] = _rsi(avg_gains, avg_losses)
+    return rsi, float(avg_gains[-1]), float(avg_losses[-1])
+
+
+def compute_indicators(closes):
+    """Compute MA50, MA200 and Wilder RSI over a full close history
+
+    Returns the indicator frame (one row per close) and the rolling state
+    needed to extend it with update_indicators.
+    """
+    closes = np.asarray(closes, dtype=float)
+    series = pd.Series(closes)
+    frame = pd.DataFrame({column: series.rolling(window).mean() for column, window in MA_WINDOWS.items()})
+
+    frame["RSI"], avg_gain, avg_loss = wilder_rsi(closes)
+
+    state = {
+        "rows": len(closes),
+        "tail": closes[-STATE_TAIL:].tolist(),
+        "avg_gain": avg_gain,
+        "avg_loss": avg_loss,
+    }
+    return frame, state
+
+
+def update_indicators(state, new_closes):
+    """Extend indicators by new closes in O(k) using the stored rolling state
+
+    Returns the indicator rows for the new closes and the updated state.
+    """
+    new_closes = np.asarray(new_closes, dtype=float)
+    tail = np.asarray(state["tail"], dtype=float)
+    if state["avg_gain"] is None or state["rows"] <= STATE_TAIL:
+        # The state still holds the whole history, so recomputing is just as cheap
+        frame, new_state = compute_indicators(np.concatenate([tail, new_closes]))
+        return frame.iloc[len(tail):].reset_index(drop=True), new_state
+
+    extended = np.concatenate([tail, new_closes])
+    sums = np.concatenate([[0.0], np.cumsum(extended)])
+    positions = np.arange(len(tail), len(extended)) + 1
+    frame = pd.DataFrame({
+        column: (sums[positions] - sums[positions - window]) / window
+        for column, window in MA_WINDOWS.items()
+    })
+
+    delta = np.diff(extended[len(tail) - 1:])
+    avg_gains = _wilder(state["avg_gain"], np.clip(delta, 0, None))
+    avg_losses = _wilder(state["avg_loss"], np.clip(-delta, 0, None))
+    frame["RSI"] = _rsi(avg_gains, avg_losses)
+
+    new_state = {
+        "rows": state["rows"] + len(new_closes),
+        "tail": extended[-STATE_TAIL:].tolist(),
+        "avg_gain": float(avg_gains[-1]),
+        "avg_loss": float(avg_losses[-1]),
+    }
+    return frame, new_state
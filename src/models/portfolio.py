@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+HOLDINGS_COLUMNS = ["Ticker", "Quantity", "CostBasis"]
+NET_WORTH_COLUMNS = ["Holdings", "Cash", "NetWorth"]
+
+# Stock sheet headers recognized for each holdings column (compared lowercase, without spaces)
+HOLDINGS_HEADERS = {
+    "Quantity": ("quantity", "qty", "shares", "units"),
+    "CostBasis": ("costbasis", "cost", "totalcost"),
+}
+
+
+def parse_holdings(rows):
+    """Build holdings from the stock sheet's values (a header row, then one row per ticker)
+
+    Tickers are read from the first column. Quantity and CostBasis (the total
+    cost of the position) are found by header name and are NaN when the sheet
+    has no such column or a cell is not a number.
+    """
+    if not rows:
+        return pd.DataFrame(columns=HOLDINGS_COLUMNS)
+    header = [str(name).strip().lower().replace(" ", "").replace("_", "") for name in rows[0]]
+    body = [row for row in rows[1:] if row and str(row[0]).strip()]
+    holdings = pd.DataFrame({"Ticker": [str(row[0]).strip().upper() for row in body]})
+
+    for column, aliases in HOLDINGS_HEADERS.items():
+        position = next((header.index(alias) for alias in aliases if alias in header), None)
+        values = [row[position] if position is not None and position < len(row) else None for row in body]
+        cleaned = pd.Series(values, dtype=object).astype(str).str.replace(r"[$,\s]", "", regex=True)
+        holdings[column] = pd.to_numeric(cleaned, errors='coerce').to_numpy(dtype=float)
+    return holdings[HOLDINGS_COLUMNS]
+
+
+def price_panel(closes, dates):
+    """Align close prices into a (dates x tickers) matrix
+
+    closes maps each ticker to a Series of closes indexed by tz-naive dates.
+    Each date takes the ticker's last close on or before it (NaN before its
+    first bar), found with one binary search per ticker.
+    """
+    days = dates.values.astype('datetime64[D]').astype(np.int64)
+    panel = np.full((len(dates), len(closes)), np.nan)
+    for column, series in enumerate(closes.values()):
+        series = series.dropna()
+        series = series[~series.index.duplicated(keep='last')].sort_index()
+        bar_days = series.index.values.astype('datetime64[D]').astype(np.int64)
+        positions = np.searchsorted(bar_days, days, side='right') - 1
+        traded = positions >= 0
+        panel[traded, column] = series.to_numpy(dtype=float)[positions[traded]]
+    return panel
+
+
+def net_worth_series(dates, panel, quantities, cash_dates, cash_flows):
+    """Daily holdings value, cumulative cash and their sum
+
+    Holdings value is the price panel times the quantity vector, counting
+    tickers as worth nothing before their first bar. Cash flows are summed
+    per day with one bincount and accumulated; flows after the last date
+    count on the last date.
+    """
+    holdings = np.nan_to_num(panel) @ np.nan_to_num(np.asarray(quantities, dtype=float))
+
+    days = dates.values.astype('datetime64[D]').astype(np.int64)
+    cash_dates = pd.DatetimeIndex(cash_dates)
+    flow_days = cash_dates.values.astype('datetime64[D]').astype(np.int64)
+    flows = np.asarray(cash_flows, dtype=float)
+    dated = ~cash_dates.isna() & ~np.isnan(flows)
+    offsets = np.clip(flow_days[dated] - days[0], 0, len(days) - 1)
+    cash = np.cumsum(np.bincount(offsets, weights=flows[dated], minlength=len(days)))
+
+    return pd.DataFrame(
+        {"Holdings": holdings, "Cash": cash, "NetWorth": holdings + cash},
+        index=pd.DatetimeIndex(dates, name="Date")
+    )[NET_WORTH_COLUMNS]
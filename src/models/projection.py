@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+# Percentile bands reported for each projected series
+PERCENTILES = [5, 25, 50, 75, 95]
+SERIES = ["Portfolio", "Cash", "Total"]
+
+# Paths simulated per batch; batches are the unit of work given to a process
+BATCH_PATHS = 5000
+
+# Trading days per simulated month
+MONTH_DAYS = 21
+
+
+def monthly_returns(values):
+    """Overlapping one-month log returns of a series with one value per trading day
+
+    Every window of MONTH_DAYS consecutive daily returns is one sample, so
+    a year of history gives a couple of hundred monthly returns to draw
+    from. Shorter histories are scaled up from their daily returns.
+    """
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values) & (values > 0)]
+    daily = np.diff(np.log(values))
+    if not len(daily):
+        return np.zeros(1)
+    if len(daily) < MONTH_DAYS:
+        return daily * MONTH_DAYS
+    cumulative = np.concatenate([[0.0], np.cumsum(daily)])
+    return cumulative[MONTH_DAYS:] - cumulative[:-MONTH_DAYS]
+
+
+def band_columns(series):
+    return [f"{series} p{percentile}" for percentile in PERCENTILES]
+
+
+def simulate_batch(seed, paths, months, return_pool, spending_pool, start_portfolio, start_cash,
+                   monthly_income=0.0, monthly_investment=0.0, keep_final=False):
+    """Simulate one batch of monthly portfolio and cash paths
+
+    Each month draws a portfolio return from return_pool and a spending
+    amount from spending_pool, both with replacement. Income goes to cash,
+    and the monthly investment moves from cash into the portfolio before
+    that month's return. All paths advance together as (paths x months)
+    arrays. seed is an int or np.random.SeedSequence. Returns the batch's
+    path count, its percentile bands as a (series, percentiles, months + 1)
+    array and the share of paths with negative cash each month; with
+    keep_final, also each path's final total.
+    """
+    rng = np.random.default_rng(seed)
+    growth = np.exp(rng.choice(np.asarray(return_pool, dtype=float), size=(paths, months)))
+    spending = rng.choice(np.asarray(spending_pool, dtype=float), size=(paths, months))
+
+    # P[t+1] = (P[t] + c) * g[t], solved with cumulative products and sums
+    cumulative_growth = np.cumprod(growth, axis=1)
+    previous_growth = np.concatenate([np.ones((paths, 1)), cumulative_growth[:, :-1]], axis=1)
+    invested = start_portfolio + monthly_investment * np.cumsum(1.0 / previous_growth, axis=1)
+    portfolio = np.concatenate([np.full((paths, 1), float(start_portfolio)), cumulative_growth * invested], axis=1)
+
+    flows = monthly_income - monthly_investment - spending
+    cash = np.concatenate([np.full((paths, 1), float(start_cash)), start_cash + np.cumsum(flows, axis=1)], axis=1)
+
+    bands = np.stack([np.percentile(values, PERCENTILES, axis=0) for values in (portfolio, cash, portfolio + cash)])
+    result = {"paths": paths, "bands": bands, "shortfall": (cash < 0).mean(axis=0)}
+    if keep_final:
+        result["final"] = portfolio[:, -1] + cash[:, -1]
+    return result
+
+
+def combine_batches(results):
+    """Combine batch results, weighting each batch's percentiles by its path count
+
+    Averaging the percentiles of equal, independent batches approximates
+    the percentiles of all paths closely at thousands of paths per batch,
+    without sending the paths between processes.
+    """
+    weights = np.array([result["paths"] for result in results], dtype=float)
+    weights /= weights.sum()
+    bands = np.tensordot(weights, np.stack([result["bands"] for result in results]), axes=1)
+    shortfall = weights @ np.stack([result["shortfall"] for result in results])
+    return {"paths": int(sum(result["paths"] for result in results)), "bands": bands, "shortfall": shortfall}
+
+
+def bands_frame(combined):
+    """Turn combined results into a frame of monthly bands indexed by month offset"""
+    frame = pd.DataFrame(
+        {
+            column: combined["bands"][series, position]
+            for series, name in enumerate(SERIES)
+            for position, column in enumerate(band_columns(name))
+        },
+        index=pd.RangeIndex(combined["bands"].shape[-1], name='Month')
+    )
+    frame["Cash Shortfall"] = combined["shortfall"]
+    return frame
+
+
+def dated_bands(bands, start=None):
+    """Index monthly bands by date, counting month offsets from start (default today)"""
+    start = pd.Timestamp(start or pd.Timestamp.now()).normalize()
+    dated = bands.copy()
+    dated.index = pd.DatetimeIndex([start + pd.DateOffset(months=int(month)) for month in bands.index], name='Date')
+    return dated
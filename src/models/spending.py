@@ -0,0 +1,197 @@
+import numpy as np
+import pandas as pd
+
+# Per-category histograms of log1p(|amount|); amounts up to 1e9 fit in the range
+HIST_BINS = 256
+HIST_MAX = 21.0
+BIN_WIDTH = HIST_MAX / HIST_BINS
+
+# Robust z-score (0.6745 * deviation / MAD) above which a transaction is unusually
+# large, for categories with enough history to judge
+ANOMALY_Z = 3.5
+MIN_CATEGORY_ROWS = 20
+
+# Recurring cadences: name -> (period in days, tolerance in days)
+CADENCES = {
+    "weekly": (7, 1),
+    "biweekly": (14, 2),
+    "monthly": (30.4, 4),
+    "quarterly": (91.3, 7),
+    "yearly": (365.25, 10),
+}
+
+# A merchant is recurring when it has enough charges, most of them on its
+# cadence, and amounts that stay close to their median
+MIN_OCCURRENCES = 3
+MIN_REGULAR_SHARE = 0.75
+MAX_AMOUNT_SPREAD = 0.2
+
+ANOMALY_COLUMNS = ["TransactionId", "Date", "Category", "Description", "Amount", "ZScore", "TypicalAmount"]
+RECURRING_COLUMNS = [
+    "Merchant", "Category", "Cadence", "Occurrences", "TypicalAmount", "FirstDate", "LastDate", "NextDate", "DueBy"
+]
+
+
+def _category_keys(categories):
+    return pd.Series(categories).fillna("Uncategorized").astype(str).to_numpy()
+
+
+def _log_amounts(amounts):
+    return np.log1p(np.abs(pd.to_numeric(pd.Series(amounts), errors='coerce').to_numpy(dtype=float)))
+
+
+def update_histograms(histograms, frame, sign=1):
+    """Add (sign=1) or remove (sign=-1) a frame's rows in the per-category amount histograms"""
+    if frame.empty:
+        return histograms
+
+    values = _log_amounts(frame["Amount"])
+    valid = ~np.isnan(values)
+    codes, categories = pd.factorize(_category_keys(frame["Category"])[valid])
+    bins = np.clip((values[valid] / BIN_WIDTH).astype(int), 0, HIST_BINS - 1)
+    counts = np.zeros((len(categories), HIST_BINS), dtype=np.int64)
+    np.add.at(counts, (codes, bins), 1)
+
+    for category, row in zip(categories, counts):
+        current = np.asarray(histograms.get(category, np.zeros(HIST_BINS, dtype=np.int64))) + sign * row
+        if current.sum() > 0:
+            histograms[category] = np.clip(current, 0, None).tolist()
+        else:
+            histograms.pop(category, None)
+    return histograms
+
+
+def category_statistics(histograms):
+    """Median and MAD of log amounts per category, estimated from the histograms
+
+    Returns a frame indexed by category with count, median and mad columns.
+    """
+    centers = (np.arange(HIST_BINS) + 0.5) * BIN_WIDTH
+    rows = {}
+    for category, counts in histograms.items():
+        counts = np.asarray(counts, dtype=float)
+        total = counts.sum()
+        cumulative = np.cumsum(counts)
+
+        # Interpolate the median within the bin that holds it
+        position = int(np.searchsorted(cumulative, total / 2))
+        before = cumulative[position - 1] if position else 0.0
+        median = (position + (total / 2 - before) / counts[position]) * BIN_WIDTH
+
+        # Median absolute deviation over the bin centers, at least one bin wide
+        distances = np.abs(centers - median)
+        order = np.argsort(distances)
+        middle = int(np.searchsorted(np.cumsum(counts[order]), total / 2))
+        mad = max(float(distances[order][middle]), BIN_WIDTH)
+        rows[category] = (int(total), float(median), mad)
+    return pd.DataFrame.from_dict(rows, orient="index", columns=["count", "median", "mad"])
+
+
+def score_anomalies(frame, histograms):
+    """Score rows against their category's amount distribution and keep the unusual ones
+
+    Only unusually large amounts are flagged; small ones are rarely worth a
+    look. Returns the unusual rows with their robust z-score and their
+    category's typical (median) amount.
+    """
+    if frame.empty or not histograms:
+        return pd.DataFrame(columns=ANOMALY_COLUMNS)
+
+    stats = category_statistics(histograms)
+    stats = stats[stats["count"] >= MIN_CATEGORY_ROWS]
+    positions = stats.index.get_indexer(_category_keys(frame["Category"]))
+    known = positions >= 0
+
+    z_scores = np.full(len(frame), np.nan)
+    typical = np.full(len(frame), np.nan)
+    medians, mads = stats["median"].to_numpy(), stats["mad"].to_numpy()
+    z_scores[known] = 0.6745 * (_log_amounts(frame["Amount"])[known] - medians[positions[known]]) / mads[positions[known]]
+    typical[known] = np.expm1(medians[positions[known]])
+
+    unusual = np.nan_to_num(z_scores) > ANOMALY_Z
+    result = frame[unusual].assign(ZScore=z_scores[unusual].round(2), TypicalAmount=typical[unusual].round(2))
+    return result[ANOMALY_COLUMNS]
+
+
+def merchant_keys(descriptions):
+    """Normalize descriptions to merchant keys: lowercase, without digits or punctuation
+
+    Each distinct description is normalized once, so repeated descriptions
+    cost a hash lookup.
+    """
+    codes, uniques = pd.factorize(pd.Series(descriptions).fillna("").astype(str))
+    normalized = (
+        pd.Series(uniques, dtype=object).str.lower()
+        .str.replace(r"[^a-z]+", " ", regex=True)
+        .str.strip()
+        .to_numpy()
+    )
+    keys = np.full(len(codes), "", dtype=object)
+    keys[codes >= 0] = normalized[codes[codes >= 0]]
+    return keys
+
+
+def detect_recurring(frame):
+    """Find merchants charged on a regular cadence
+
+    The frame needs a Merchant column of merchant_keys. Rows are grouped by
+    merchant with one sort by (merchant, date), so the cost is O(n log n)
+    rather than comparing transactions pairwise. Returns one row per
+    recurring merchant.
+    """
+    dates = pd.to_datetime(frame["Date"], errors='coerce')
+    rows = pd.DataFrame({
+        "Merchant": frame["Merchant"].fillna("").to_numpy(),
+        "Category": frame["Category"].to_numpy(),
+        "Amount": pd.to_numeric(frame["Amount"], errors='coerce').to_numpy(),
+        "Date": dates.to_numpy(),
+    })
+    rows = rows[(rows["Merchant"] != "") & rows["Date"].notna() & rows["Amount"].notna()]
+    if rows.empty:
+        return pd.DataFrame(columns=RECURRING_COLUMNS)
+    rows = rows.sort_values(["Merchant", "Date"], kind="stable")
+
+    # Days since the same merchant's previous charge
+    same_merchant = rows["Merchant"].to_numpy()[1:] == rows["Merchant"].to_numpy()[:-1]
+    days = np.diff(rows["Date"].to_numpy().astype("datetime64[D]").astype(np.int64)).astype(float)
+    rows["Interval"] = np.concatenate([[np.nan], np.where(same_merchant, days, np.nan)])
+
+    groups = rows.groupby("Merchant", sort=False)
+    summary = groups.agg(
+        Occurrences=("Date", "size"),
+        FirstDate=("Date", "first"),
+        LastDate=("Date", "last"),
+        Category=("Category", "last"),
+        TypicalAmount=("Amount", "median"),
+        MedianInterval=("Interval", "median"),
+    )
+    summary = summary[summary["Occurrences"] >= MIN_OCCURRENCES]
+    if summary.empty:
+        return pd.DataFrame(columns=RECURRING_COLUMNS)
+
+    # Match each merchant's median interval to the nearest cadence
+    names = list(CADENCES)
+    periods = np.array([CADENCES[name][0] for name in names])
+    tolerances = np.array([CADENCES[name][1] for name in names])
+    nearest = np.abs(summary["MedianInterval"].to_numpy()[:, None] - periods).argmin(axis=1)
+    matched = np.abs(summary["MedianInterval"].to_numpy() - periods[nearest]) <= tolerances[nearest]
+    summary["Cadence"] = np.array(names, dtype=object)[nearest]
+    summary["Period"] = periods[nearest]
+    summary["Tolerance"] = tolerances[nearest]
+    summary = summary[matched]
+
+    # Share of intervals on the cadence and spread of the amounts, per merchant
+    rows = rows[rows["Merchant"].isin(summary.index)].copy()
+    period = rows["Merchant"].map(summary["Period"])
+    tolerance = rows["Merchant"].map(summary["Tolerance"])
+    rows["Regular"] = (rows["Interval"] - period).abs() <= tolerance
+    rows["Spread"] = (rows["Amount"] / rows["Merchant"].map(summary["TypicalAmount"]) - 1).abs()
+    groups = rows[rows["Interval"].notna()].groupby("Merchant")
+    summary["RegularShare"] = groups["Regular"].mean()
+    summary["AmountSpread"] = rows.groupby("Merchant")["Spread"].median()
+
+    summary = summary[(summary["RegularShare"] >= MIN_REGULAR_SHARE) & (summary["AmountSpread"] <= MAX_AMOUNT_SPREAD)]
+    summary["NextDate"] = summary["LastDate"] + pd.to_timedelta(summary["Period"].round(), unit="D")
+    summary["DueBy"] = summary["NextDate"] + pd.to_timedelta(summary["Tolerance"], unit="D")
+    summary["TypicalAmount"] = summary["TypicalAmount"].round(2)
+    return summary.reset_index()[RECURRING_COLUMNS]
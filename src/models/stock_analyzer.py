@@ -4,28 +4,49 @@ import numpy as np
 from sklearn.model_selection import train_test_split
 from sklearn.linear_model import LinearRegression
 from sklearn.metrics import mean_squared_error
+from src.models.features import make_training_frame
 from src.utils.logger import setup_logger
 
 logger = setup_logger("stock_analyzer")
 
+# Version of the forecasting method; part of the forecast cache key
+FORECAST_MODEL_VERSION = "direct-ols-1"
+
 class StockData:
     """Class to manage stock data from yfinance"""
-    def __init__(self):
+    def __init__(self, cache=None):
         self.stock_data = {}
+        self.cache = cache
 
-    def fetch_stock_data(self, tickers):
-        """Fetch stock data from yfinance"""
+    def _fetch_history(self, ticker, period):
+        """Fetch price history for a ticker, through the response cache if configured"""
+        fetch_fn = lambda: yf.Ticker(ticker).history(period=period)
+        if not self.cache:
+            return fetch_fn()
+        history = self.cache.fetch("yfinance", {"ticker": ticker, "period": period}, fetch_fn)
+        return history if history is not None else pd.DataFrame()
+
+    def iter_stock_data(self, tickers, period="1y"):
+        """Fetch stock data from yfinance one ticker at a time, yielding (ticker, history)
+
+        Histories are not retained, so callers can save and release each one
+        as soon as it arrives.
+        """
         for ticker in tickers:
             try:
-                stock = yf.Ticker(ticker)
-                history = stock.history(period="1y")
+                history = self._fetch_history(ticker, period)
                 if not history.empty:
-                    self.stock_data[ticker] = history
                     logger.info(f"Successfully fetched data for {ticker} ({len(history)} records)")
+                    yield ticker, history
                 else:
                     logger.warning(f"No data available for {ticker}")
             except Exception as e:
                 logger.error(f"Error fetching data for {ticker}: {e}")
+
+    def fetch_stock_data(self, tickers):
+        """Fetch stock data from yfinance"""
+        for ticker, history in self.iter_stock_data(tickers):
+            self.stock_data[ticker] = history
         
         return self.stock_data
 
@@ -34,6 +55,7 @@ class StockPredictor:
     def __init__(self):
         self.model = LinearRegression()
         self.models = {}  # Store models for different tickers
+        self.metrics = {}
 
     def train_model(self, data, features, target):
         """Train model with data"""
@@ -57,6 +79,7 @@ class StockPredictor:
             # Calculate error metrics
             mse = mean_squared_error(y_test, predictions)
             rmse = np.sqrt(mse)
+            self.metrics = {"mse": float(mse), "rmse": float(rmse)}
             logger.info(f"Model performance - MSE: {mse:.4f}, RMSE: {rmse:.4f}")
             
             return predictions
@@ -64,6 +87,116 @@ class StockPredictor:
             logger.error(f"Error training model: {e}")
             return []
 
+    def train_batch(self, datasets, features, target, test_size=0.2):
+        """Train one linear model per ticker in a single vectorized pass
+
+        datasets maps ticker -> DataFrame. Each history is split like
+        train_model (last test_size share held out, no shuffling), and the
+        training rows of all tickers are stacked into one zero-padded
+        (tickers, rows, features) array. Padded rows have zero features and
+        targets after centering, so they do not affect the fit, and all
+        least-squares problems are solved with one batched pseudo-inverse.
+        Returns ticker -> {"coef", "intercept", "predictions", "metrics"};
+        fitted models are also kept in self.models.
+        """
+        tickers = [ticker for ticker, data in datasets.items() if not data.empty and len(data) >= 10]
+        if not tickers:
+            logger.warning("Not enough data for batch training")
+            return {}
+
+        try:
+            lengths = np.array([len(datasets[ticker]) for ticker in tickers])
+            test_lengths = np.ceil(lengths * test_size).astype(int)
+            train_lengths = lengths - test_lengths
+            max_length = lengths.max()
+
+            # Stack all histories into padded arrays with a mask of valid rows
+            X = np.zeros((len(tickers), max_length, len(features)))
+            y = np.zeros((len(tickers), max_length))
+            for i, ticker in enumerate(tickers):
+                X[i, :lengths[i]] = datasets[ticker][features].to_numpy(dtype=float)
+                y[i, :lengths[i]] = datasets[ticker][target].to_numpy(dtype=float)
+            rows = np.arange(max_length)
+            train_mask = rows[None, :] < train_lengths[:, None]
+            test_mask = (rows[None, :] >= train_lengths[:, None]) & (rows[None, :] < lengths[:, None])
+
+            # Center on the training rows, as LinearRegression does, then zero the other rows
+            X_mean = (X * train_mask[..., None]).sum(axis=1) / train_lengths[:, None]
+            y_mean = (y * train_mask).sum(axis=1) / train_lengths
+            X_train = np.where(train_mask[..., None], X - X_mean[:, None, :], 0.0)
+            y_train = np.where(train_mask, y - y_mean[:, None], 0.0)
+
+            # Solve every least-squares problem at once
+            coef = np.einsum('tfn,tn->tf', np.linalg.pinv(X_train), y_train)
+            intercept = y_mean - np.einsum('tf,tf->t', X_mean, coef)
+
+            # Predict all rows and score the held-out ones
+            predictions = np.einsum('tnf,tf->tn', X, coef) + intercept[:, None]
+            squared_errors = np.where(test_mask, (predictions - y) ** 2, 0.0)
+            mse = squared_errors.sum(axis=1) / test_lengths
+        except Exception as e:
+            logger.error(f"Error batch training models: {e}")
+            return {}
+
+        results = {}
+        for i, ticker in enumerate(tickers):
+            metrics = {"mse": float(mse[i]), "rmse": float(np.sqrt(mse[i]))}
+            self.models[ticker] = {"coef": coef[i], "intercept": float(intercept[i]), "features": list(features)}
+            results[ticker] = {
+                "coef": dict(zip(features, coef[i].tolist())),
+                "intercept": float(intercept[i]),
+                "predictions": predictions[i, train_lengths[i]:lengths[i]],
+                "metrics": metrics,
+            }
+        logger.info(f"Batch trained models for {len(results)} tickers")
+        return results
+
+    def forecast(self, features_by_ticker, features, horizon=10, level=0.9):
+        """Forecast the close for each of the next `horizon` bars of every ticker
+
+        Uses direct forecasting: one linear model per (ticker, step) predicts
+        the close `step` bars ahead from the latest feature row, and all of
+        them are trained in one train_batch call. Confidence bands are the
+        level-quantile of each model's absolute errors on its held-out rows
+        (split-conformal style), so they always contain the point forecast.
+        Returns ticker -> DataFrame with Forecast, Lower and Upper columns
+        indexed by the forecast business dates.
+        """
+        datasets = {}
+        for ticker, feature_frame in features_by_ticker.items():
+            for step in range(1, horizon + 1):
+                datasets[(ticker, step)] = make_training_frame(feature_frame, step)
+        results = self.train_batch(datasets, features, 'Target')
+
+        forecasts = {}
+        for ticker, feature_frame in features_by_ticker.items():
+            steps = [step for step in range(1, horizon + 1) if (ticker, step) in results]
+            latest = feature_frame[features].dropna()
+            if not steps or latest.empty:
+                continue
+
+            # Apply every step's model to the latest feature row at once
+            coefs = np.stack([self.models[(ticker, step)]["coef"] for step in steps])
+            intercepts = np.array([self.models[(ticker, step)]["intercept"] for step in steps])
+            points = coefs @ latest.iloc[-1].to_numpy(dtype=float) + intercepts
+
+            # Residual-based band widths from each step's held-out errors
+            widths = np.array([
+                np.quantile(np.abs(
+                    datasets[(ticker, step)]['Target'].to_numpy()[-len(results[(ticker, step)]["predictions"]):]
+                    - results[(ticker, step)]["predictions"]
+                ), level)
+                for step in steps
+            ])
+
+            dates = pd.bdate_range(latest.index[-1] + pd.offsets.BDay(1), periods=len(steps), name='Date')
+            forecasts[ticker] = pd.DataFrame({
+                'Forecast': points,
+                'Lower': points - widths,
+                'Upper': points + widths,
+            }, index=dates)
+        return forecasts
+
     def predict(self, data, features):
         """Predict prices with new data"""
         if data.empty:
@@ -0,0 +1,159 @@
+import os
+import pickle
+import threading
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from src.utils.logger import setup_logger
+
+logger = setup_logger("categorizer")
+
+# Hashed character n-gram features per description; the vectorizer is
+# stateless, so only the linear model has to be stored
+HASH_FEATURES = 2 ** 16
+
+# Predictions less certain than this leave the row uncategorized
+MIN_CONFIDENCE = 0.5
+
+# Rows vectorized and scored per batch
+SCORE_BATCH_ROWS = 50000
+
+# Loaded models shared by all sessions in this process: path -> (mtime_ns, model)
+_MODEL_CACHE = {}
+_MODEL_LOCK = threading.Lock()
+
+
+def missing_categories(categories):
+    """Mask of missing or blank categories"""
+    categories = pd.Series(categories)
+    missing = categories.isna().to_numpy()
+    if categories.dtype == object:
+        present = ~missing
+        missing[present] = categories[present].astype(str).str.strip().to_numpy() == ""
+    return missing
+
+
+class TransactionCategorizer:
+    """Text classifier that fills in missing transaction categories
+
+    Descriptions are hashed into character n-gram features and scored by a
+    linear model trained on the categories the sources provided (never on
+    its own predictions). New labelled rows update the model with
+    partial_fit; it is refit from the labelled history only when a category
+    it has not seen appears, since a linear model's classes are fixed.
+    """
+    def __init__(self, model_dir, min_confidence=MIN_CONFIDENCE):
+        self.model_dir = model_dir
+        self.model_file = os.path.join(model_dir, 'categorizer.pkl')
+        self.min_confidence = min_confidence
+        self.vectorizer = HashingVectorizer(
+            analyzer='char_wb', ngram_range=(3, 5), n_features=HASH_FEATURES, alternate_sign=False
+        )
+
+        if not os.path.exists(self.model_dir):
+            os.makedirs(self.model_dir)
+            logger.info(f"Created directory: {self.model_dir}")
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a categorizer from the application configuration"""
+        return cls(os.path.join(config.processed_data_dir, 'models'))
+
+    def _features(self, frame):
+        """Hash descriptions, with the amount's direction as an extra token"""
+        descriptions = frame["Description"].fillna("").astype(str)
+        direction = np.where(pd.to_numeric(frame["Amount"], errors='coerce') < 0, " credit", " debit")
+        return self.vectorizer.transform(descriptions + direction)
+
+    def load(self):
+        """Load the stored model, or None before the first training"""
+        if not os.path.exists(self.model_file):
+            return None
+
+        mtime = os.stat(self.model_file).st_mtime_ns
+        with _MODEL_LOCK:
+            cached = _MODEL_CACHE.get(self.model_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            with open(self.model_file, 'rb') as file:
+                model = pickle.load(file)
+        except Exception as e:
+            logger.error(f"Error loading categorizer model: {e}")
+            return None
+        with _MODEL_LOCK:
+            _MODEL_CACHE[self.model_file] = (mtime, model)
+        return model
+
+    def _save(self, model):
+        tmp_file = f"{self.model_file}.tmp"
+        with open(tmp_file, 'wb') as file:
+            pickle.dump(model, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, self.model_file)
+        with _MODEL_LOCK:
+            _MODEL_CACHE[self.model_file] = (os.stat(self.model_file).st_mtime_ns, model)
+
+    def _labelled(self, frame):
+        if frame.empty:
+            return frame
+        return frame[~missing_categories(frame["Category"])]
+
+    def fit(self, history):
+        """Train a new model on every labelled row of the history
+
+        Returns True if a model was trained (at least two categories are needed).
+        """
+        labelled = self._labelled(history)
+        classes = np.unique(labelled["Category"].astype(str)) if not labelled.empty else []
+        if len(classes) < 2:
+            logger.info("Not enough categorized transactions to train the categorizer")
+            return False
+
+        classifier = SGDClassifier(loss='log_loss', alpha=1e-5, random_state=0)
+        classifier.fit(self._features(labelled), labelled["Category"].astype(str))
+        self._save({"classifier": classifier, "trained_rows": len(labelled)})
+        logger.info(f"Trained categorizer on {len(labelled)} transactions in {len(classes)} categories")
+        return True
+
+    def learn(self, rows, history):
+        """Update the model with newly labelled rows
+
+        history is a callable returning the labelled ledger history; it is
+        only called when the model has to be refit. Returns "updated",
+        "refit" or None when the model did not change.
+        """
+        labelled = self._labelled(rows)
+        model = self.load()
+        if model is not None and labelled.empty:
+            return None
+
+        if model is None or not set(labelled["Category"].astype(str)) <= set(model["classifier"].classes_):
+            return "refit" if self.fit(history()) else None
+
+        classifier = model["classifier"]
+        classifier.partial_fit(self._features(labelled), labelled["Category"].astype(str))
+        self._save({"classifier": classifier, "trained_rows": model["trained_rows"] + len(labelled)})
+        logger.info(f"Updated categorizer with {len(labelled)} transactions")
+        return "updated"
+
+    def predict(self, frame):
+        """Predict categories for a frame's rows in vectorized batches
+
+        Returns an object array with None where no model exists or the
+        prediction is below the confidence threshold.
+        """
+        categories = np.full(len(frame), None, dtype=object)
+        model = self.load()
+        if model is None or frame.empty:
+            return categories
+
+        classifier = model["classifier"]
+        for start in range(0, len(frame), SCORE_BATCH_ROWS):
+            stop = start + SCORE_BATCH_ROWS
+            probabilities = classifier.predict_proba(self._features(frame.iloc[start:stop]))
+            best = probabilities.argmax(axis=1)
+            confident = probabilities[np.arange(len(best)), best] >= self.min_confidence
+            categories[start:stop] = np.where(confident, classifier.classes_[best], None)
+        return categories
@@ -1,16 +1,136 @@
+import re
 import pandas as pd
+import numpy as np
 import os
+import json
+import threading
 from datetime import datetime
 import logging
+from src.services.shared_store import SharedStore
+from src.services.search_index import TransactionSearchIndex
+from src.services.categorizer import missing_categories, TransactionCategorizer
+from src.services.fx_rates import FxRateTable, normalize_currencies
+from src.services.price_panel import PricePanel
+from src.services.notion_decoder import parse_schema
+from src.models.features import bar_dates
+from src.models.portfolio import HOLDINGS_COLUMNS, net_worth_series, price_panel
+from src.models.indicators import compute_indicators, update_indicators
+from src.models.spending import (
+    ANOMALY_COLUMNS, RECURRING_COLUMNS, detect_recurring, merchant_keys, score_anomalies, update_histograms
+)
+from src.utils.file_lock import file_lock
 from src.utils.logger import setup_logger
 
 logger = setup_logger("data_manager")
 
+FINANCE_COLUMNS = ["Date", "Category", "Description", "Amount"]
+LEDGER_KEY_COLUMNS = ["TransactionId", "Source", "RowHash"]
+# Amount is in the base currency; OriginalAmount is the source amount in its Currency.
+# AutoCategorized marks categories filled in by the categorizer rather than the source
+LEDGER_COLUMNS = FINANCE_COLUMNS + ["Currency", "OriginalAmount"] + LEDGER_KEY_COLUMNS + ["AutoCategorized"]
+
+# Number of ticker saves between ticker catalog writes
+CATALOG_FLUSH_EVERY = 50
+
+# Dashboard summary contents: recent transactions, sparkline points over the
+# last year of bars, and points of the net worth series
+SUMMARY_RECENT_ROWS = 5
+SPARKLINE_BARS = 252
+SPARKLINE_POINTS = 60
+NET_WORTH_POINTS = 180
+
+# Date-indexed ledgers shared by DataManager instances in this process,
+# keyed by file path and invalidated by file modification time
+_FINANCE_STORE_CACHE = {}
+
+# Spending analysis results shared the same way: path -> (mtime_ns, frame)
+_SPENDING_CACHE = {}
+
+# Net worth series per data directory: base_path -> (data versions, frame)
+_NET_WORTH_CACHE = {}
+
+# Dashboard summaries: path -> (mtime_ns, summary)
+_SUMMARY_CACHE = {}
+
+# The data quality log is rotated to a single .1 backup at this size
+QUALITY_LOG_MAX_BYTES = 1024 * 1024
+
+# Search indexes shared by DataManager instances in this process: path -> index
+_SEARCH_INDEXES = {}
+_SEARCH_INDEX_LOCK = threading.Lock()
+
+
+def _tmp_path(path):
+    """A temporary file name next to path that no other thread or process writes"""
+    return f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+
+
+def _tail_lines(path, count, block_size=64 * 1024):
+    """Read the last count lines of a text file, reading backwards from the end in blocks"""
+    with open(path, 'rb') as file:
+        file.seek(0, os.SEEK_END)
+        position, data = file.tell(), b""
+        while position > 0 and data.count(b"\n") <= count:
+            step = min(block_size, position)
+            position -= step
+            file.seek(position)
+            data = file.read(step) + data
+    return [line.decode('utf-8') for line in data.splitlines()[-count:]] if count > 0 else []
+
+
+def _sample_positions(length, points):
+    """Evenly spaced positions covering 0..length-1, always including both ends"""
+    return np.unique(np.linspace(0, length - 1, min(length, points)).round().astype(int)) if length else np.array([], dtype=int)
+
+
+def _sparkline(prices):
+    """Catalog fields describing a ticker's recent closes for the dashboard"""
+    closes = prices['Close'].to_numpy(dtype=float)[-SPARKLINE_BARS:]
+    dates = bar_dates(prices)[-SPARKLINE_BARS:]
+    positions = _sample_positions(len(closes), SPARKLINE_POINTS)
+    return {
+        "last_close": round(float(closes[-1]), 4),
+        "change_pct": round(float(closes[-1] / closes[-2] - 1) * 100, 2) if len(closes) > 1 else 0.0,
+        "sparkline": [round(float(close), 4) for close in closes[positions]],
+        "sparkline_dates": [str(date.date()) for date in dates[positions]],
+    }
+
 class DataManager:
     """Class to combine and store data in CSV files"""
-    def __init__(self, base_path):
+    def __init__(self, base_path, partition_finance=False, store=None, categorizer=None, base_currency="USD",
+                 extra_columns=None):
         self.base_path = base_path
+        self.partition_finance = partition_finance
+        self.store = store
+        self.categorizer = categorizer
+        self.base_currency = base_currency
+        # User-defined source columns (NOTION_EXTRA_PROPERTIES) kept after the ledger columns
+        self.extra_columns = [column for column in extra_columns or [] if column not in LEDGER_COLUMNS]
+        self.last_changes = {}
         self._ensure_data_directory()
+        self.fx_rates = FxRateTable(os.path.join(self.base_path, 'fx'), base_currency)
+        self.price_panel = PricePanel(os.path.join(self.stocks_dir, 'panel'))
+        if self.store is not None:
+            self.sync_from_store()
+
+    @classmethod
+    def from_config(cls, config, store=None):
+        """Create a data manager from the application configuration"""
+        if store is None:
+            store = config.derived("shared_store", SharedStore.from_config)
+        try:
+            extra_columns = [spec.column for spec in parse_schema(config.notion_extra_properties)]
+        except ValueError as e:
+            logger.error(f"Ignoring NOTION_EXTRA_PROPERTIES: {e}")
+            extra_columns = []
+        return cls(
+            config.raw_data_dir,
+            partition_finance=config.finance_partitions,
+            store=store,
+            categorizer=config.derived("categorizer", TransactionCategorizer.from_config),
+            base_currency=config.base_currency,
+            extra_columns=extra_columns
+        )
         
     def _ensure_data_directory(self):
         """Ensure the directory for data storage exists"""
@@ -27,29 +147,287 @@ class DataManager:
                 os.makedirs(directory)
                 logger.info(f"Created directory: {directory}")
 
+        self.finance_state_file = os.path.join(self.finance_dir, 'finance_state.json')
+        self.partitions_dir = os.path.join(self.finance_dir, 'partitions')
+        self.catalog_file = os.path.join(self.stocks_dir, 'catalog.json')
+        self.holdings_file = os.path.join(self.stocks_dir, 'holdings.csv')
+        self.summary_file = os.path.join(self.base_path, 'dashboard_summary.json')
+        self.quality_file = os.path.join(self.base_path, 'quality_metrics.jsonl')
+        self.search_index_file = os.path.join(self.finance_dir, 'finance_search.db')
+        self.spending_state_file = os.path.join(self.finance_dir, 'spending_state.json')
+        self.anomalies_file = os.path.join(self.finance_dir, 'spending_anomalies.csv')
+        self.recurring_file = os.path.join(self.finance_dir, 'recurring_charges.csv')
+        self._catalog = None
+        self._catalog_dirty = 0
+
+    def _publish_file(self, path):
+        """Mirror a data file into the shared store (an empty payload marks a deletion)"""
+        if self.store is None:
+            return
+        relative_path = os.path.relpath(path, self.base_path).replace(os.sep, '/')
+        data = b""
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                data = file.read()
+        version = self.store.put_bytes(f"file:{relative_path}", data)
+        self._save_synced_versions({relative_path: version})
+
+    def _load_synced_versions(self):
+        try:
+            if os.path.exists(self.synced_versions_file):
+                with open(self.synced_versions_file, 'r') as file:
+                    return json.load(file)
+        except Exception as e:
+            logger.error(f"Error loading shared store sync state: {e}")
+        return {}
+
+    def _save_synced_versions(self, updates):
+        """Merge updated file versions into the sync state shared by every DataManager on this directory"""
+        with file_lock(f"{self.synced_versions_file}.lock"):
+            self._synced_versions = {**self._load_synced_versions(), **updates}
+            tmp_file = _tmp_path(self.synced_versions_file)
+            with open(tmp_file, 'w') as file:
+                json.dump(self._synced_versions, file)
+            os.replace(tmp_file, self.synced_versions_file)
+
+    def sync_from_store(self):
+        """Pull data files that other replicas have published since the last sync"""
+        if self.store is None:
+            return
+        self.synced_versions_file = os.path.join(self.base_path, '.shared_versions.json')
+        self._synced_versions = self._load_synced_versions()
+        try:
+            pulled = {}
+            for key, version in self.store.versions("file:").items():
+                relative_path = key[len("file:"):]
+                if self._synced_versions.get(relative_path) == version:
+                    continue
+
+                path = os.path.join(self.base_path, *relative_path.split('/'))
+                data = self.store.get_bytes(key)
+                if data:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    tmp_path = f"{path}.tmp"
+                    with open(tmp_path, 'wb') as file:
+                        file.write(data)
+                    os.replace(tmp_path, path)
+                elif os.path.exists(path):
+                    os.remove(path)
+                pulled[relative_path] = version
+
+            if pulled:
+                self._save_synced_versions(pulled)
+                logger.info(f"Pulled {len(pulled)} updated data files from the shared store")
+                # Index the pulled ledger now rather than on the first search
+                if self._synced_versions.get("finance/finance_state.json") is not None:
+                    self._search_index().rebuild_in_background(self.finance_version(), self.load_finance_data)
+        except Exception as e:
+            logger.error(f"Error syncing from shared store: {e}")
+
     def _get_timestamp(self):
         """Get current timestamp for file naming"""
         return datetime.now().strftime("%Y%m%d_%H%M%S")
 
+    def _prepare_finance_source(self, df, source):
+        """Normalize one source frame and give each row a stable transaction identity
+
+        Notion rows are identified by their page id. Sheet rows are identified by
+        an "ID" column when the sheet has one, otherwise by a hash of the row
+        contents (with an occurrence counter so identical rows stay distinct).
+        RowHash fingerprints the source fields so edited rows can be detected.
+        Rows without a Currency are in the base currency. Extra columns are
+        carried through as they come from the source.
+        """
+        df = df.copy()
+        for col in FINANCE_COLUMNS + ["Currency"] + self.extra_columns:
+            if col not in df.columns:
+                df[col] = None
+
+        if df.empty:
+            return pd.DataFrame(columns=LEDGER_COLUMNS + self.extra_columns)
+        df["Currency"] = normalize_currencies(df["Currency"], self.base_currency)
+
+        # Fingerprint the raw source values before any type conversion; only
+        # foreign-currency rows include the currency and only rows with extra
+        # values include the extras, so existing hashes stay valid
+        row_hash = pd.util.hash_pandas_object(df[FINANCE_COLUMNS].astype(str), index=False).values
+        foreign = df["Currency"].to_numpy() != self.base_currency
+        if foreign.any():
+            row_hash[foreign] = pd.util.hash_pandas_object(
+                df.loc[foreign, FINANCE_COLUMNS + ["Currency"]].astype(str), index=False
+            ).values
+        if self.extra_columns:
+            extended = df[self.extra_columns].notna().any(axis=1).to_numpy()
+            if extended.any():
+                row_hash[extended] = pd.util.hash_pandas_object(
+                    df.loc[extended, FINANCE_COLUMNS + ["Currency"] + self.extra_columns].astype(str), index=False
+                ).values
+        df["RowHash"] = row_hash.view("int64")
+        df["OriginalAmount"] = pd.to_numeric(df["Amount"], errors='coerce')
+        df["Source"] = source
+        df["AutoCategorized"] = False
+
+        if source == "notion" and "PageId" in df.columns:
+            df["TransactionId"] = "notion:" + df["PageId"].astype(str)
+        elif "ID" in df.columns:
+            df["TransactionId"] = f"{source}:" + df["ID"].astype(str)
+        else:
+            occurrence = df.groupby("RowHash").cumcount()
+            df["TransactionId"] = f"{source}:" + df["RowHash"].astype(str) + ":" + occurrence.astype(str)
+
+        df = df.drop_duplicates("TransactionId", keep="last")
+        return df[LEDGER_COLUMNS + self.extra_columns]
+
+    def _aggregate_delta(self, aggregates, frame, sign):
+        """Apply the rows of a frame to the running ledger aggregates with the given sign"""
+        if frame.empty:
+            return
+
+        aggregates["total"] += sign * float(frame["Amount"].sum())
+        aggregates["count"] += sign * len(frame)
+
+        dates = frame["Date"].values
+        months = np.where(pd.isna(dates), None, dates.astype("datetime64[M]").astype(str))
+        for bucket, keys in (("by_category", frame["Category"].values), ("by_month", months)):
+            grouped = frame["Amount"].groupby(keys).agg(["sum", "count"])
+            for key, row in grouped.iterrows():
+                entry = aggregates[bucket].setdefault(str(key), {"sum": 0.0, "count": 0})
+                entry["sum"] += sign * float(row["sum"])
+                entry["count"] += sign * int(row["count"])
+                if entry["count"] <= 0:
+                    del aggregates[bucket][str(key)]
+
+    def _empty_aggregates(self):
+        return {"total": 0.0, "count": 0, "by_category": {}, "by_month": {}}
+
+    def load_finance_state(self):
+        """Load the ledger sync state (data version, last changes and aggregates)"""
+        try:
+            if os.path.exists(self.finance_state_file):
+                with open(self.finance_state_file, 'r') as file:
+                    return json.load(file)
+        except Exception as e:
+            logger.error(f"Error loading finance state: {e}")
+        return {"version": 0, "last_sync": None, "last_changes": {}, "aggregates": self._empty_aggregates()}
+
+    def _save_finance_state(self, state):
+        tmp_file = f"{self.finance_state_file}.tmp"
+        with open(tmp_file, 'w') as file:
+            json.dump(state, file, indent=2)
+        os.replace(tmp_file, self.finance_state_file)
+
+    def load_finance_aggregates(self):
+        """Load the ledger aggregates, rebuilding them once for ledgers saved before they existed"""
+        state = self.load_finance_state()
+        if state["version"] == 0:
+            ledger = self.load_finance_data()
+            if not ledger.empty:
+                self._aggregate_delta(state["aggregates"], ledger, 1)
+        return state["aggregates"]
+
+    def finance_version(self):
+        """Get the current version of the finance ledger, bumped on every change"""
+        return self.load_finance_state()["version"]
+
     def combine_finance_data(self, notion_data, google_data):
-        """Combine financial data from Notion and Google Sheets"""
-        try:
-            # Ensure both dataframes have the same columns
-            required_columns = ["Date", "Category", "Description", "Amount"]
-            for df in [notion_data, google_data]:
-                for col in required_columns:
-                    if col not in df.columns:
-                        df[col] = None
-            
-            # Combine data
-            combined_finance = pd.concat([notion_data, google_data], ignore_index=True)
-            
+        """Merge financial data from Notion and Google Sheets into the stored ledger
+
+        Only inserts, updates and deletes since the last sync are applied. Rows
+        are deleted only for sources that returned data in this sync, so a
+        failed fetch never wipes out that source's history. Rows arriving
+        without a category are categorized by the classifier when one is
+        configured; rows it recategorizes after a refit count as updates.
+        """
+        try:
+            sources = {"notion": notion_data, "sheets": google_data}
+            prepared = [self._prepare_finance_source(df, source) for source, df in sources.items()]
+            incoming = pd.concat([df for df in prepared if not df.empty] or prepared, ignore_index=True)
+            synced_sources = [source for source, df in sources.items() if not df.empty]
+
             # Convert date strings to datetime objects
-            combined_finance["Date"] = pd.to_datetime(combined_finance["Date"], errors='coerce')
-            
+            incoming["Date"] = pd.to_datetime(incoming["Date"], errors='coerce')
+
+            # Amounts are stored in the base currency, at the rate of their transaction date
+            incoming["Amount"] = self.fx_rates.convert(incoming["OriginalAmount"], incoming["Currency"], incoming["Date"])
+
+            # Rows in a currency with no stored rates are quarantined rather than stored
+            # without an amount; they are added (or restored) once rates exist
+            unconverted = incoming[incoming["Amount"].isna() & incoming["OriginalAmount"].notna()]
+            if not unconverted.empty:
+                self.quarantine_rows("finance", "missing_rates", unconverted)
+                incoming = incoming.drop(index=unconverted.index)
+
+            existing = self.load_finance_data()
+            state = self.load_finance_state()
+            if existing.empty or "TransactionId" not in existing.columns:
+                # Legacy ledger without record identity: rebuild from scratch
+                existing = pd.DataFrame(columns=LEDGER_COLUMNS)
+                state["aggregates"] = self._empty_aggregates()
+            if "Currency" not in existing.columns:
+                existing["Currency"] = self.base_currency
+                existing["OriginalAmount"] = existing["Amount"]
+            if "AutoCategorized" not in existing.columns:
+                existing["AutoCategorized"] = False
+            if "Merchant" not in existing.columns:
+                existing["Merchant"] = merchant_keys(existing["Description"])
+            for column in self.extra_columns:
+                if column not in existing.columns:
+                    existing[column] = None
+
+            existing = existing.set_index("TransactionId", drop=False)
+            rebuild_partitions = state["version"] == 0 or not os.path.exists(self.partitions_dir)
+            incoming = incoming.set_index("TransactionId", drop=False)
+
+            # Diff incoming rows against the stored ledger by transaction identity
+            is_new = ~incoming.index.isin(existing.index)
+            inserts = incoming[is_new]
+
+            common = incoming[~is_new]
+            changed = common["RowHash"].values != existing.loc[common.index, "RowHash"].values
+            updates = common[changed]
+            replaced = existing.loc[updates.index]
+
+            is_gone = existing["Source"].isin(synced_sources) & ~existing.index.isin(incoming.index)
+            deletes = existing[is_gone]
+
+            # Stored foreign-currency rows whose rates changed since they were converted
+            reconverted = self._reconvert(existing.drop(index=updates.index.union(deletes.index)))
+            if not reconverted.empty:
+                updates = pd.concat([frame for frame in (updates, reconverted) if not frame.empty])
+                replaced = existing.loc[updates.index]
+
+            if inserts.empty and updates.empty and deletes.empty:
+                logger.info("Finance ledger is up to date, no changes to apply")
+                self.last_changes = {"inserted": inserts, "updated": updates, "deleted": deletes, "unconverted": unconverted}
+                return existing.reset_index(drop=True)
+
+            # Merchant keys group recurring charges; only new and edited rows need them
+            inserts = inserts.assign(Merchant=merchant_keys(inserts["Description"]))
+            updates = updates.assign(Merchant=merchant_keys(updates["Description"]))
+
+            # Fill in missing categories of new and edited rows
+            inserts, updates, recategorized = self._categorize(existing, inserts, updates, deletes)
+            if not recategorized.empty:
+                updates = pd.concat([updates, recategorized])
+                replaced = existing.loc[updates.index]
+            categorized = pd.concat([frame[frame["AutoCategorized"].astype(bool)] for frame in (inserts, updates)])
+
+            # Apply the change set to the ledger
+            drop_ids = updates.index.union(deletes.index)
+            combined_finance = pd.concat(
+                [frame for frame in (existing.drop(index=drop_ids), inserts, updates) if not frame.empty]
+            )
+
             # Sort by date
-            combined_finance = combined_finance.sort_values("Date")
-            
+            combined_finance = combined_finance.sort_values("Date", kind="stable", na_position="first").reset_index(drop=True)
+
+            # Update downstream aggregates with the deltas only
+            aggregates = state["aggregates"]
+            self._aggregate_delta(aggregates, inserts, 1)
+            self._aggregate_delta(aggregates, updates, 1)
+            self._aggregate_delta(aggregates, replaced, -1)
+            self._aggregate_delta(aggregates, deletes, -1)
+
             # Save to CSV
             timestamp = self._get_timestamp()
             finance_file = os.path.join(self.finance_dir, f'finance_data_{timestamp}.csv')
@@ -58,8 +436,38 @@ class DataManager:
             # Also save a latest version
             latest_file = os.path.join(self.finance_dir, 'finance_data_latest.csv')
             combined_finance.to_csv(latest_file, index=False)
+            self._publish_file(latest_file)
+
+            # Rewrite only the month partitions touched by this change set
+            if self.partition_finance:
+                if rebuild_partitions:
+                    touched = combined_finance["Date"].dropna()
+                else:
+                    touched = pd.concat([inserts["Date"], updates["Date"], replaced["Date"], deletes["Date"]]).dropna()
+                self._write_finance_partitions(combined_finance, set(np.unique(touched.values.astype("datetime64[M]")).astype(str)))
+
+            self._update_search_index(state["version"], combined_finance, inserts, updates, deletes)
+            self._update_spending_analysis(state["version"], combined_finance, inserts, updates, replaced, deletes)
+
+            state["version"] += 1
+            state["last_sync"] = datetime.now().isoformat()
+            state["last_changes"] = {
+                "inserted": len(inserts),
+                "updated": len(updates),
+                "deleted": len(deletes),
+                "categorized": len(categorized)
+            }
+            self._save_finance_state(state)
+            self._publish_file(self.finance_state_file)
+            self.last_changes = {
+                "inserted": inserts, "updated": updates, "deleted": deletes, "categorized": categorized,
+                "unconverted": unconverted
+            }
             
-            logger.info(f"Saved {len(combined_finance)} combined finance records to CSV")
+            logger.info(
+                f"Applied {len(inserts)} inserts, {len(updates)} updates and {len(deletes)} deletes; "
+                f"ledger now has {len(combined_finance)} records"
+            )
             logger.info(f"Files saved: \n- {finance_file}\n- {latest_file}")
             
             return combined_finance
@@ -67,35 +475,286 @@ class DataManager:
             logger.error(f"Error combining finance data: {e}")
             return pd.DataFrame()
 
+    def _reconvert(self, ledger):
+        """Convert the ledger's foreign-currency rows again and return those whose amount changed
+
+        Rates may arrive after a transaction was stored (or be revised), so
+        each sync re-runs the vectorized conversion over the stored
+        foreign-currency rows.
+        """
+        foreign = ledger[ledger["Currency"].to_numpy() != self.base_currency]
+        if foreign.empty:
+            return foreign
+        amounts = self.fx_rates.convert(foreign["OriginalAmount"], foreign["Currency"], foreign["Date"])
+        stored = pd.to_numeric(foreign["Amount"], errors='coerce').to_numpy(dtype=float)
+        changed = ~np.isclose(amounts, stored, equal_nan=True)
+        if changed.any():
+            logger.info(f"Re-converted {int(changed.sum())} foreign-currency transactions with updated rates")
+        return foreign[changed].assign(Amount=amounts[changed])
+
+    def update_fx_rates(self, fx_data, currencies):
+        """Extend the stored exchange rates; currencies maps each currency to the earliest date needed
+
+        fx_data is a rate provider such as FxRateData. Changed rate files are
+        published to the shared store.
+        """
+        for currency, start in currencies.items():
+            try:
+                rate_file = self.fx_rates.update(
+                    currency, lambda since: fx_data.fetch_rates(currency, self.base_currency, since), start
+                )
+                if rate_file:
+                    self._publish_file(rate_file)
+            except Exception as e:
+                logger.error(f"Error updating {currency} exchange rates: {e}")
+
+    def _categorize(self, existing, inserts, updates, deletes):
+        """Train the categorizer on newly labelled rows and predict the unlabelled ones
+
+        Only inserted and updated rows are scored, except after the model is
+        refit (e.g. a new category appeared), when the ledger's remaining
+        uncategorized rows are scored too and returned as recategorized rows.
+        Returns the (inserts, updates, recategorized) frames.
+        """
+        recategorized = existing.iloc[:0]
+        if self.categorizer is None:
+            return inserts, updates, recategorized
+
+        try:
+            kept = existing.drop(index=updates.index.union(deletes.index))
+            incoming = pd.concat([inserts, updates])
+
+            def history():
+                # Train only on categories the sources provided
+                labelled = [kept[~kept["AutoCategorized"].astype(bool)], incoming]
+                return pd.concat([frame for frame in labelled if not frame.empty] or labelled)
+
+            if self.categorizer.learn(incoming, history) == "refit":
+                missing = missing_categories(kept["Category"])
+                recategorized = self._predict_categories(kept[missing])
+                recategorized = recategorized[recategorized["AutoCategorized"].astype(bool)]
+            return self._predict_categories(inserts), self._predict_categories(updates), recategorized
+        except Exception as e:
+            logger.error(f"Error categorizing transactions: {e}")
+            return inserts, updates, existing.iloc[:0]
+
+    def _predict_categories(self, frame):
+        """Fill the frame's missing categories with confident predictions"""
+        missing = missing_categories(frame["Category"])
+        if not missing.any():
+            return frame
+
+        predicted = np.full(len(frame), None, dtype=object)
+        predicted[missing] = self.categorizer.predict(frame[missing])
+        filled = pd.notna(predicted)
+        frame = frame.copy()
+        frame["Category"] = frame["Category"].astype(object)
+        frame.loc[filled, "Category"] = predicted[filled]
+        frame.loc[filled, "AutoCategorized"] = True
+        return frame
+
+    def _search_index(self):
+        """Get the process-wide search index for this data directory, opening it once"""
+        with _SEARCH_INDEX_LOCK:
+            index = _SEARCH_INDEXES.get(self.search_index_file)
+            if index is None:
+                index = _SEARCH_INDEXES[self.search_index_file] = TransactionSearchIndex(self.search_index_file)
+            return index
+
+    def _update_search_index(self, previous_version, ledger, inserts, updates, deletes):
+        """Apply a ledger change set to the search index, rebuilding it if it was behind"""
+        try:
+            index = self._search_index()
+            with index.exclusive():
+                if index.version() == previous_version:
+                    index.apply_changes(inserts, updates, deletes, previous_version + 1)
+                else:
+                    index.rebuild(ledger, previous_version + 1)
+        except Exception as e:
+            # Searches fall back to scanning the ledger until the index is rebuilt
+            logger.error(f"Error updating search index: {e}")
+
+    def update_search_index(self):
+        """Bring the search index up to the current ledger version; returns True if it was rebuilt"""
+        return self._search_index().ensure_version(self.finance_version(), self.load_finance_data)
+
+    def _scan_finance(self, query, start, end, limit):
+        """Search by scanning the ledger, matching the index's token prefix semantics"""
+        tokens = re.findall(r"\w+", query.lower())
+        rows = self.query_finance(start, end, columns=FINANCE_COLUMNS)
+        if not tokens or rows.empty:
+            return pd.DataFrame(columns=FINANCE_COLUMNS)
+
+        words = (rows["Description"].fillna("").astype(str) + " " + rows["Category"].fillna("").astype(str)).str.lower()
+        matched = np.ones(len(rows), dtype=bool)
+        for token in tokens:
+            matched &= words.str.contains(rf"(?:^|\W){re.escape(token)}", regex=True).to_numpy()
+        return rows[matched].iloc[::-1].head(limit).reset_index(drop=True)
+
+    def search_finance(self, query, start=None, end=None, limit=500):
+        """Search transaction descriptions and categories by token prefixes within a date range
+
+        Returns matching rows newest first. The index is kept current when the
+        ledger is written or pulled from another replica. If it is still
+        behind, it is rebuilt in the background rather than in this call, and
+        until then searches read the previous index, or scan the ledger when
+        no index was ever built.
+        """
+        try:
+            index = self._search_index()
+            indexed_version, version = index.version(), self.finance_version()
+            if indexed_version != version:
+                index.rebuild_in_background(version, self.load_finance_data)
+                if indexed_version < 0:
+                    return self._scan_finance(query, start, end, limit)
+            return index.search(query, start, end, limit)
+        except Exception as e:
+            logger.error(f"Error searching finance data: {e}")
+            return pd.DataFrame()
+
+    def save_ticker_data(self, ticker, df, timestamp=None):
+        """Save one ticker's history to CSV files and record it in the ticker catalog"""
+        if df.empty:
+            return []
+        timestamp = timestamp or self._get_timestamp()
+
+        # Create ticker directory if it doesn't exist
+        ticker_dir = os.path.join(self.stocks_dir, ticker)
+        if not os.path.exists(ticker_dir):
+            os.makedirs(ticker_dir)
+        
+        # Save timestamped version
+        stock_file = os.path.join(ticker_dir, f'{ticker}_{timestamp}.csv')
+        df.to_csv(stock_file)
+        
+        # Save latest version
+        latest_file = os.path.join(ticker_dir, f'{ticker}_latest.csv')
+        df.to_csv(latest_file)
+        self._publish_file(latest_file)
+        self.update_stock_indicators(ticker, df)
+        self._update_price_panel(ticker, df)
+
+        # Record the ticker's metadata; the catalog is flushed in batches
+        catalog = self.load_ticker_catalog()
+        catalog[ticker] = {
+            "last_bar": str(pd.Timestamp(df.index.max()).date()),
+            "rows": len(df),
+            "file": os.path.relpath(latest_file, self.base_path).replace(os.sep, '/'),
+            "updated": datetime.now().isoformat(timespec='seconds'),
+            **_sparkline(df),
+        }
+        self._catalog_dirty += 1
+        if self._catalog_dirty >= CATALOG_FLUSH_EVERY:
+            self.flush_ticker_catalog()
+        
+        logger.info(f"Saved {len(df)} records for {ticker}")
+        return [stock_file, latest_file]
+
     def save_stock_data(self, stock_data):
         """Save stock data to CSV files"""
+        timestamp = self._get_timestamp()
+        saved_files = []
+        
+        for ticker, df in stock_data.items():
+            try:
+                saved_files.extend(self.save_ticker_data(ticker, df, timestamp))
+            except Exception as e:
+                logger.error(f"Error saving stock data for {ticker}: {e}")
+        
+        self.flush_ticker_catalog()
+        logger.info(f"Stock data saved to {len(saved_files)} files")
+
+    def _update_price_panel(self, ticker, df):
+        """Write a saved ticker's history into the price panel (kept per replica, not published)"""
         try:
-            timestamp = self._get_timestamp()
-            saved_files = []
-            
-            for ticker, df in stock_data.items():
-                if not df.empty:
-                    # Create ticker directory if it doesn't exist
-                    ticker_dir = os.path.join(self.stocks_dir, ticker)
-                    if not os.path.exists(ticker_dir):
-                        os.makedirs(ticker_dir)
-                    
-                    # Save timestamped version
-                    stock_file = os.path.join(ticker_dir, f'{ticker}_{timestamp}.csv')
-                    df.to_csv(stock_file)
-                    saved_files.append(stock_file)
-                    
-                    # Save latest version
-                    latest_file = os.path.join(ticker_dir, f'{ticker}_latest.csv')
-                    df.to_csv(latest_file)
-                    saved_files.append(latest_file)
-                    
-                    logger.info(f"Saved {len(df)} records for {ticker}")
-            
-            logger.info(f"Stock data saved to {len(saved_files)} files")
-            
+            self.price_panel.update_ticker(ticker, df, self.stock_version(ticker))
         except Exception as e:
-            logger.error(f"Error saving stock data: {e}")
+            logger.error(f"Error updating price panel for {ticker}: {e}")
+
+    def load_price_panel(self):
+        """Attach the price panel, first updating tickers saved elsewhere since it was written
+
+        Histories pulled from other replicas, or saved before the panel
+        existed, are written in on first use. Returns a PanelView or None.
+        """
+        try:
+            index = self.price_panel.load_index() or {"versions": {}}
+            for ticker in self.list_tickers():
+                version = self.stock_version(ticker)
+                if version and index["versions"].get(ticker) != version:
+                    self._update_price_panel(ticker, self.load_stock_data(ticker))
+            return self.price_panel.attach()
+        except Exception as e:
+            logger.error(f"Error loading price panel: {e}")
+            return None
+
+    def _build_ticker_catalog(self):
+        """Build the ticker catalog from the stored files (for data saved before the catalog existed)"""
+        catalog = {}
+        for ticker in sorted(os.listdir(self.stocks_dir)):
+            latest_file = os.path.join(self.stocks_dir, ticker, f'{ticker}_latest.csv')
+            if not os.path.isfile(latest_file):
+                continue
+            # Count rows and read the last bar date without parsing the whole file
+            rows, last_line = -1, ""
+            with open(latest_file, 'r') as file:
+                for line in file:
+                    rows += 1
+                    last_line = line
+            catalog[ticker] = {
+                "last_bar": last_line.split(',', 1)[0][:10] if rows > 0 else None,
+                "rows": max(rows, 0),
+                "file": os.path.relpath(latest_file, self.base_path).replace(os.sep, '/'),
+                "updated": datetime.fromtimestamp(os.path.getmtime(latest_file)).isoformat(timespec='seconds'),
+            }
+        logger.info(f"Built ticker catalog with {len(catalog)} tickers")
+        return catalog
+
+    def load_ticker_catalog(self):
+        """Load the ticker catalog: {ticker: {last_bar, rows, file, updated}}"""
+        if self._catalog is None:
+            try:
+                if os.path.exists(self.catalog_file):
+                    with open(self.catalog_file, 'r') as file:
+                        self._catalog = json.load(file)
+                else:
+                    self._catalog = self._build_ticker_catalog()
+                    self._catalog_dirty = 1
+                    self.flush_ticker_catalog()
+            except Exception as e:
+                logger.error(f"Error loading ticker catalog: {e}")
+                self._catalog = {}
+        return self._catalog
+
+    def flush_ticker_catalog(self):
+        """Write pending ticker catalog changes to disk"""
+        if not self._catalog_dirty or self._catalog is None:
+            return
+        tmp_file = f"{self.catalog_file}.tmp"
+        with open(tmp_file, 'w') as file:
+            json.dump(self._catalog, file)
+        os.replace(tmp_file, self.catalog_file)
+        self._publish_file(self.catalog_file)
+        self._catalog_dirty = 0
+
+    def list_tickers(self):
+        """Get all tickers with stored price history, sorted"""
+        return sorted(self.load_ticker_catalog())
+
+    def search_tickers(self, query="", limit=50):
+        """Find tickers matching a search string, prefix matches first"""
+        query = query.strip().upper()
+        tickers = self.list_tickers()
+        if not query:
+            return tickers[:limit]
+        prefix = [ticker for ticker in tickers if ticker.upper().startswith(query)]
+        contains = [ticker for ticker in tickers if query in ticker.upper() and not ticker.upper().startswith(query)]
+        return (prefix + contains)[:limit]
+
+    def stock_version(self, ticker):
+        """Get a version token for a ticker's stored history (changes whenever it is saved)"""
+        latest_file = os.path.join(self.stocks_dir, ticker, f'{ticker}_latest.csv')
+        return os.stat(latest_file).st_mtime_ns if os.path.exists(latest_file) else 0
 
     def load_stock_data(self, ticker):
         """Load latest stock data for a ticker"""
@@ -114,14 +773,430 @@ class DataManager:
             logger.error(f"Error loading stock data for {ticker}: {e}")
             return pd.DataFrame()
 
+    def _indicator_files(self, ticker):
+        ticker_dir = os.path.join(self.stocks_dir, ticker)
+        return os.path.join(ticker_dir, f'{ticker}_indicators.csv'), os.path.join(ticker_dir, f'{ticker}_indicators.json')
+
+    def update_stock_indicators(self, ticker, df):
+        """Bring a ticker's stored MA50/MA200/RSI up to date with its price history
+
+        The indicators are kept next to the ticker's data together with their
+        rolling state (recent closes and Wilder averages), so bars appended
+        after the last stored bar are computed in O(k). A full recompute only
+        happens when the stored bars no longer line up with the history.
+        Returns the number of indicator rows computed.
+        """
+        if df.empty:
+            return 0
+        indicators_file, state_file = self._indicator_files(ticker)
+        dates = bar_dates(df)
+        closes = df['Close'].to_numpy(dtype=float)
+
+        state = None
+        if os.path.exists(state_file) and os.path.exists(indicators_file):
+            with open(state_file, 'r') as file:
+                state = json.load(file)
+
+        position = dates.searchsorted(pd.Timestamp(state["last_bar"])) if state else len(dates)
+        if position < len(dates) and dates[position] == pd.Timestamp(state["last_bar"]) \
+                and np.isclose(closes[position], state["tail"][-1]):
+            new_rows = len(dates) - position - 1
+            if new_rows == 0:
+                return 0
+            frame, state = update_indicators(state, closes[position + 1:])
+            frame.index = dates[position + 1:]
+            frame.to_csv(indicators_file, mode='a', header=False)
+        else:
+            frame, state = compute_indicators(closes)
+            frame.index = pd.DatetimeIndex(dates, name='Date')
+            frame.to_csv(indicators_file)
+
+        state["last_bar"] = str(dates[-1].date())
+        with open(state_file, 'w') as file:
+            json.dump(state, file)
+        self._publish_file(indicators_file)
+        self._publish_file(state_file)
+        return len(frame)
+
+    def load_stock_indicators(self, ticker):
+        """Load a ticker's stored indicators indexed by bar date, computing them if missing"""
+        try:
+            indicators_file, _ = self._indicator_files(ticker)
+            if not os.path.exists(indicators_file):
+                self.update_stock_indicators(ticker, self.load_stock_data(ticker))
+            if not os.path.exists(indicators_file):
+                return pd.DataFrame()
+            return pd.read_csv(indicators_file, index_col='Date', parse_dates=['Date'])
+        except Exception as e:
+            logger.error(f"Error loading indicators for {ticker}: {e}")
+            return pd.DataFrame()
+
+    def save_holdings(self, holdings):
+        """Save the holdings read from the stock sheet (Ticker, Quantity, CostBasis)"""
+        tmp_file = f"{self.holdings_file}.tmp"
+        holdings[HOLDINGS_COLUMNS].to_csv(tmp_file, index=False)
+        os.replace(tmp_file, self.holdings_file)
+        self._publish_file(self.holdings_file)
+        logger.info(f"Saved holdings for {len(holdings)} tickers")
+
+    def load_holdings(self):
+        """Load the stored holdings, or an empty frame before the first stock refresh"""
+        try:
+            if os.path.exists(self.holdings_file):
+                return pd.read_csv(self.holdings_file)[HOLDINGS_COLUMNS]
+        except Exception as e:
+            logger.error(f"Error loading holdings: {e}")
+        return pd.DataFrame(columns=HOLDINGS_COLUMNS)
+
+    def net_worth_series(self):
+        """Daily net worth: held quantities times aligned closes plus cumulative ledger cash flows
+
+        Current quantities are applied over the whole price history. Ledger
+        amounts are spending, so each transaction's cash flow is its negated
+        amount. The series is cached in-process until the ledger, the
+        holdings or a held ticker's history changes.
+        """
+        try:
+            holdings = self.load_holdings()
+            quantities = holdings[holdings["Quantity"].fillna(0) != 0].groupby("Ticker")["Quantity"].sum()
+            holdings_mtime = os.stat(self.holdings_file).st_mtime_ns if os.path.exists(self.holdings_file) else 0
+            versions = (
+                self.finance_version(),
+                holdings_mtime,
+                tuple((ticker, self.stock_version(ticker)) for ticker in quantities.index),
+            )
+            cached = _NET_WORTH_CACHE.get(self.base_path)
+            if cached and cached[0] == versions:
+                return cached[1]
+
+            closes = {}
+            for ticker in quantities.index:
+                prices = self.load_stock_data(ticker)
+                if not prices.empty:
+                    closes[ticker] = pd.Series(prices['Close'].to_numpy(dtype=float), index=bar_dates(prices))
+            ledger = self.load_finance_data()
+            ledger_dates = ledger["Date"].dropna() if not ledger.empty else pd.Series(dtype='datetime64[ns]')
+
+            bounds = [series.index[[0, -1]] for series in closes.values() if len(series)]
+            if len(ledger_dates):
+                bounds.append(pd.DatetimeIndex([ledger_dates.iloc[0], ledger_dates.iloc[-1]]))
+            if not bounds:
+                return pd.DataFrame()
+            dates = pd.date_range(min(b.min() for b in bounds), max(b.max() for b in bounds), freq='D').normalize()
+
+            series = net_worth_series(
+                dates,
+                price_panel(closes, dates),
+                quantities.loc[list(closes)].to_numpy(),
+                ledger["Date"] if not ledger.empty else [],
+                -pd.to_numeric(ledger["Amount"], errors='coerce').to_numpy(dtype=float) if not ledger.empty else [],
+            )
+            _NET_WORTH_CACHE[self.base_path] = (versions, series)
+            return series
+        except Exception as e:
+            logger.error(f"Error computing net worth: {e}")
+            return pd.DataFrame()
+
+    def _finance_summary(self):
+        """Dashboard figures for the ledger: aggregates and the latest transactions"""
+        aggregates = self.load_finance_aggregates()
+        recent = self.latest_finance(SUMMARY_RECENT_ROWS, columns=FINANCE_COLUMNS)
+        if not recent.empty:
+            recent = recent.assign(Date=recent["Date"].dt.strftime('%Y-%m-%d'))
+        latest_file = os.path.join(self.finance_dir, 'finance_data_latest.csv')
+        return {
+            "version": self.finance_version(),
+            "total": aggregates["total"],
+            "count": aggregates["count"],
+            "by_category": {category: entry["sum"] for category, entry in aggregates["by_category"].items()},
+            "recent": recent.to_dict(orient="records"),
+            "updated": datetime.fromtimestamp(os.path.getmtime(latest_file)).isoformat(timespec='seconds')
+            if os.path.exists(latest_file) else None,
+        }
+
+    def _stocks_summary(self):
+        """Dashboard figures per ticker, taken from the ticker catalog"""
+        catalog = self.load_ticker_catalog()
+        for ticker, entry in catalog.items():
+            if "sparkline" not in entry:
+                # Catalogs written before sparklines were stored are filled in once
+                prices = self.load_stock_data(ticker)
+                if prices.empty:
+                    continue
+                entry.update(_sparkline(prices))
+                self._catalog_dirty += 1
+        self.flush_ticker_catalog()
+        fields = ("last_bar", "last_close", "change_pct", "sparkline", "sparkline_dates", "updated")
+        return {ticker: {field: entry.get(field) for field in fields} for ticker, entry in catalog.items()}
+
+    def _net_worth_summary(self):
+        """A downsampled net worth series with the latest values"""
+        series = self.net_worth_series()
+        if series.empty:
+            return None
+        holdings = self.load_holdings()
+        positions = _sample_positions(len(series), NET_WORTH_POINTS)
+        sampled = series.iloc[positions].round(2)
+        return {
+            "dates": [str(date.date()) for date in sampled.index],
+            **{column: sampled[column].tolist() for column in sampled.columns},
+            "latest": {column: round(float(value), 2) for column, value in series.iloc[-1].items()},
+            "cost_basis": round(float(holdings.loc[holdings["Quantity"].fillna(0) != 0, "CostBasis"].sum()), 2),
+        }
+
+    def update_dashboard_summary(self, sections=("finance", "stocks")):
+        """Rebuild sections of the dashboard summary artifact and write it
+
+        Refreshes call this for the data they changed, so the dashboard can
+        render from one small file instead of the ledger and price histories.
+        The net worth series depends on both and is rebuilt every time.
+        """
+        try:
+            builders = {"finance": self._finance_summary, "stocks": self._stocks_summary}
+            built = {section: builders[section]() for section in sections}
+            # Finance and stock refreshes can run at the same time (ingest), so
+            # the file is re-read and merged under its lock
+            with file_lock(f"{self.summary_file}.lock"):
+                summary = {}
+                if os.path.exists(self.summary_file):
+                    with open(self.summary_file, 'r') as file:
+                        summary = json.load(file)
+                summary.update(built)
+                summary.setdefault("finance", None)
+                summary.setdefault("stocks", {})
+                summary["net_worth"] = self._net_worth_summary()
+                summary["generated"] = datetime.now().isoformat(timespec='seconds')
+
+                tmp_file = _tmp_path(self.summary_file)
+                with open(tmp_file, 'w') as file:
+                    json.dump(summary, file)
+                os.replace(tmp_file, self.summary_file)
+                self._publish_file(self.summary_file)
+            return summary
+        except Exception as e:
+            logger.error(f"Error updating dashboard summary: {e}")
+            return None
+
+    def _read_dashboard_summary(self):
+        if not os.path.exists(self.summary_file):
+            return None
+        mtime = os.stat(self.summary_file).st_mtime_ns
+        cached = _SUMMARY_CACHE.get(self.summary_file)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        with open(self.summary_file, 'r') as file:
+            summary = json.load(file)
+        _SUMMARY_CACHE[self.summary_file] = (mtime, summary)
+        return summary
+
+    def load_dashboard_summary(self):
+        """Load the dashboard summary, building it once for data saved before it existed
+
+        A section is rebuilt if its data changed without a refresh (e.g. an
+        older replica): finance when the ledger version differs, stocks when
+        the catalog has other tickers or bars. The returned dict is shared by
+        the process and must not be modified.
+        """
+        try:
+            summary = self._read_dashboard_summary()
+            if summary is None:
+                return self.update_dashboard_summary() or {}
+
+            stale = []
+            if (summary.get("finance") or {}).get("version") != self.finance_version():
+                stale.append("finance")
+            last_bars = {ticker: entry.get("last_bar") for ticker, entry in self.load_ticker_catalog().items()}
+            if last_bars != {ticker: entry.get("last_bar") for ticker, entry in (summary.get("stocks") or {}).items()}:
+                stale.append("stocks")
+            if stale:
+                summary = self.update_dashboard_summary(sections=stale)
+            return summary or {}
+        except Exception as e:
+            logger.error(f"Error loading dashboard summary: {e}")
+            return {}
+
+    def quarantine_rows(self, dataset, source, rows):
+        """Save rows that failed validation to a timestamped side file for review"""
+        if rows.empty:
+            return None
+        quarantine_dir = os.path.join(self.base_path, 'quarantine', dataset)
+        os.makedirs(quarantine_dir, exist_ok=True)
+        quarantine_file = os.path.join(quarantine_dir, f'{source}_{self._get_timestamp()}.csv')
+        rows.to_csv(quarantine_file, index=dataset == 'stocks')
+        logger.info(f"Quarantined {len(rows)} {dataset} rows from {source} to {quarantine_file}")
+        return quarantine_file
+
+    def record_quality_metrics(self, report):
+        """Append a validation report to the data quality log, rotating it once it reaches QUALITY_LOG_MAX_BYTES"""
+        if os.path.exists(self.quality_file) and os.path.getsize(self.quality_file) >= QUALITY_LOG_MAX_BYTES:
+            os.replace(self.quality_file, f"{self.quality_file}.1")
+        with open(self.quality_file, 'a') as file:
+            file.write(json.dumps({"timestamp": datetime.now().isoformat(timespec='seconds'), **report}) + "\n")
+
+    def load_quality_metrics(self, limit=100):
+        """Load the most recent validation reports, newest first, reading only the end of the log"""
+        lines = []
+        for path in (self.quality_file, f"{self.quality_file}.1"):
+            if len(lines) < limit and os.path.exists(path):
+                lines = _tail_lines(path, limit - len(lines)) + lines
+        return [json.loads(line) for line in reversed(lines) if line.strip()]
+
+    def _load_spending_state(self):
+        try:
+            if os.path.exists(self.spending_state_file):
+                with open(self.spending_state_file, 'r') as file:
+                    return json.load(file)
+        except Exception as e:
+            logger.error(f"Error loading spending analysis state: {e}")
+        return {"version": -1, "histograms": {}}
+
+    def _update_spending_analysis(self, previous_version, ledger, inserts, updates, replaced, deletes, rebuild=False):
+        """Update spending anomalies and recurring charges with a ledger change set
+
+        The per-category amount histograms are adjusted by the changed rows,
+        only new and edited rows are scored, and recurring charges are
+        re-detected only for the merchants the change set touched. Everything
+        is rebuilt from the ledger when the stored results are behind it (or
+        with rebuild).
+        """
+        try:
+            state = self._load_spending_state()
+            incremental = (
+                not rebuild and state["version"] == previous_version
+                and os.path.exists(self.anomalies_file) and os.path.exists(self.recurring_file)
+            )
+            if incremental:
+                histograms = state["histograms"]
+                for frame, sign in ((inserts, 1), (updates, 1), (replaced, -1), (deletes, -1)):
+                    update_histograms(histograms, frame, sign)
+
+                # Rescore rows that were added or edited
+                anomalies = pd.read_csv(self.anomalies_file)
+                anomalies = anomalies[~anomalies["TransactionId"].isin(updates.index.union(deletes.index))]
+                anomalies = pd.concat(
+                    [frame for frame in (anomalies, score_anomalies(pd.concat([inserts, updates]), histograms)) if not frame.empty]
+                    or [anomalies]
+                )
+
+                # Re-detect only merchants with added, edited or removed charges
+                touched = pd.concat([inserts, updates, replaced, deletes])["Merchant"].unique()
+                recurring = pd.read_csv(self.recurring_file)
+                recurring = pd.concat([
+                    frame for frame in (
+                        recurring[~recurring["Merchant"].isin(touched)],
+                        detect_recurring(ledger[ledger["Merchant"].isin(touched)])
+                    ) if not frame.empty
+                ] or [recurring])
+            else:
+                histograms = update_histograms({}, ledger)
+                anomalies = score_anomalies(ledger, histograms)
+                recurring = detect_recurring(ledger)
+
+            anomalies["Date"] = pd.to_datetime(anomalies["Date"], errors='coerce')
+            anomalies.sort_values("Date", kind="stable").to_csv(self.anomalies_file, index=False)
+            recurring.sort_values("TypicalAmount", ascending=False).to_csv(self.recurring_file, index=False)
+
+            tmp_file = f"{self.spending_state_file}.tmp"
+            with open(tmp_file, 'w') as file:
+                json.dump({"version": previous_version + 1, "histograms": histograms}, file)
+            os.replace(tmp_file, self.spending_state_file)
+
+            for path in (self.anomalies_file, self.recurring_file, self.spending_state_file):
+                self._publish_file(path)
+            logger.info(f"Spending analysis: {len(anomalies)} unusual transactions, {len(recurring)} recurring charges")
+        except Exception as e:
+            # The analysis is rebuilt on the next load if it could not be updated
+            logger.error(f"Error updating spending analysis: {e}")
+
+    def _load_spending_results(self, path, columns, date_columns):
+        """Load a spending analysis file, rebuilding the analysis first if it is behind the ledger"""
+        version = self.finance_version()
+        if self._load_spending_state()["version"] != version:
+            ledger = self.load_finance_data()
+            if ledger.empty:
+                return pd.DataFrame(columns=columns)
+            if "Merchant" not in ledger.columns:
+                ledger = ledger.assign(Merchant=merchant_keys(ledger["Description"]))
+            no_changes = ledger.iloc[:0]
+            self._update_spending_analysis(
+                version - 1, ledger.reset_index(drop=True), no_changes, no_changes, no_changes, no_changes, rebuild=True
+            )
+        if not os.path.exists(path):
+            return pd.DataFrame(columns=columns)
+
+        mtime = os.stat(path).st_mtime_ns
+        cached = _SPENDING_CACHE.get(path)
+        if cached and cached[0] == mtime:
+            return cached[1].copy(deep=False)
+        results = pd.read_csv(path, parse_dates=date_columns)
+        _SPENDING_CACHE[path] = (mtime, results)
+        return results.copy(deep=False)
+
+    def load_spending_anomalies(self, start=None, end=None):
+        """Get unusual transactions dated within [start, end] (inclusive), newest first"""
+        try:
+            anomalies = self._load_spending_results(self.anomalies_file, ANOMALY_COLUMNS, ["Date"])
+            if start is not None:
+                anomalies = anomalies[anomalies["Date"] >= pd.Timestamp(start)]
+            if end is not None:
+                anomalies = anomalies[anomalies["Date"] < pd.Timestamp(end) + pd.Timedelta(days=1)]
+            return anomalies.iloc[::-1]
+        except Exception as e:
+            logger.error(f"Error loading spending anomalies: {e}")
+            return pd.DataFrame()
+
+    def load_recurring_charges(self, as_of=None):
+        """Get detected recurring charges, marking those still expected as of a date
+
+        as_of defaults to the latest ledger date; a charge is active when its
+        next occurrence is not overdue by more than its cadence tolerance.
+        """
+        try:
+            recurring = self._load_spending_results(
+                self.recurring_file, RECURRING_COLUMNS, ["FirstDate", "LastDate", "NextDate", "DueBy"]
+            )
+            if as_of is None:
+                date_range = self.finance_date_range()
+                as_of = date_range[1] if date_range else pd.Timestamp.now()
+            return recurring.assign(Active=recurring["DueBy"] >= pd.Timestamp(as_of))
+        except Exception as e:
+            logger.error(f"Error loading recurring charges: {e}")
+            return pd.DataFrame()
+
+    def _index_finance(self, df):
+        """Sort a ledger by date and index it with a DatetimeIndex
+
+        Rows without a valid date sort first so the index stays monotonic for
+        binary search; the number of such rows is returned alongside the frame.
+        """
+        df['Date'] = pd.to_datetime(df['Date'], errors='coerce')
+        df = df.sort_values('Date', kind='stable', na_position='first')
+        df.index = pd.DatetimeIndex(df['Date'].values)
+        return df, int(df['Date'].isna().sum())
+
+    def _load_finance_store(self):
+        """Load the date-indexed ledger, reusing the in-process copy while the file is unchanged"""
+        latest_file = os.path.join(self.finance_dir, 'finance_data_latest.csv')
+        if not os.path.exists(latest_file):
+            return None
+
+        mtime = os.stat(latest_file).st_mtime_ns
+        cached = _FINANCE_STORE_CACHE.get(latest_file)
+        if cached and cached[0] == mtime:
+            return cached[1]
+
+        df, invalid_dates = self._index_finance(pd.read_csv(latest_file))
+        store = (df, invalid_dates)
+        _FINANCE_STORE_CACHE[latest_file] = (mtime, store)
+        return store
+
     def load_finance_data(self):
-        """Load latest finance data"""
+        """Load latest finance data, sorted by date"""
         try:
-            latest_file = os.path.join(self.finance_dir, 'finance_data_latest.csv')
-            if os.path.exists(latest_file):
-                df = pd.read_csv(latest_file)
-                df['Date'] = pd.to_datetime(df['Date'])
-                return df
+            store = self._load_finance_store()
+            if store is not None:
+                # Shallow copy so callers can add columns without touching the shared store
+                return store[0].copy(deep=False)
             else:
                 logger.warning("No finance data found")
                 return pd.DataFrame()
@@ -129,6 +1204,102 @@ class DataManager:
             logger.error(f"Error loading finance data: {e}")
             return pd.DataFrame()
 
+    def _select_columns(self, df, columns):
+        return df[list(columns)] if columns else df.copy(deep=False)
+
+    def _slice_dates(self, df, invalid_dates, start, end):
+        """Binary-search the positions of an inclusive [start, end] date range"""
+        index = df.index
+        left = invalid_dates if start is None else max(
+            invalid_dates, index.searchsorted(pd.Timestamp(start).normalize(), side='left')
+        )
+        right = len(index) if end is None else index.searchsorted(
+            pd.Timestamp(end).normalize() + pd.Timedelta(days=1), side='left'
+        )
+        return df.iloc[left:max(left, right)]
+
+    def _load_finance_partitions(self, start, end):
+        """Load only the month partitions that overlap the requested date range"""
+        months = sorted(
+            f[len('finance_'):-len('.csv')] for f in os.listdir(self.partitions_dir)
+            if f.startswith('finance_') and f.endswith('.csv')
+        )
+        if start is not None:
+            months = [m for m in months if m >= pd.Timestamp(start).strftime('%Y-%m')]
+        if end is not None:
+            months = [m for m in months if m <= pd.Timestamp(end).strftime('%Y-%m')]
+        if not months:
+            return pd.DataFrame()
+
+        frames = [pd.read_csv(os.path.join(self.partitions_dir, f'finance_{m}.csv')) for m in months]
+        df, invalid_dates = self._index_finance(pd.concat(frames, ignore_index=True))
+        return self._slice_dates(df, invalid_dates, start, end)
+
+    def query_finance(self, start=None, end=None, columns=None):
+        """Get ledger rows dated within [start, end] (inclusive), sorted by date
+
+        Uses binary search over the date index instead of scanning every row.
+        When month partitions are enabled and the ledger is not already loaded
+        in this process, only the partitions covering the range are read.
+        Rows without a valid date are never returned.
+        """
+        try:
+            latest_file = os.path.join(self.finance_dir, 'finance_data_latest.csv')
+            if (self.partition_finance and latest_file not in _FINANCE_STORE_CACHE
+                    and os.path.exists(self.partitions_dir)):
+                return self._select_columns(self._load_finance_partitions(start, end), columns)
+
+            store = self._load_finance_store()
+            if store is None:
+                return pd.DataFrame()
+            df, invalid_dates = store
+            return self._select_columns(self._slice_dates(df, invalid_dates, start, end), columns)
+        except Exception as e:
+            logger.error(f"Error querying finance data: {e}")
+            return pd.DataFrame()
+
+    def latest_finance(self, n=5, columns=None):
+        """Get the n most recent transactions, newest first"""
+        try:
+            store = self._load_finance_store()
+            if store is None:
+                return pd.DataFrame()
+            df, invalid_dates = store
+            latest = df.iloc[max(invalid_dates, len(df) - n):].iloc[::-1]
+            return self._select_columns(latest, columns)
+        except Exception as e:
+            logger.error(f"Error loading latest finance data: {e}")
+            return pd.DataFrame()
+
+    def finance_date_range(self):
+        """Get the (min, max) transaction dates of the ledger, or None when empty"""
+        store = self._load_finance_store()
+        if store is None:
+            return None
+        df, invalid_dates = store
+        if invalid_dates == len(df):
+            return None
+        return df.index[invalid_dates], df.index[-1]
+
+    def _write_finance_partitions(self, ledger, months):
+        """Rewrite the month partition files for the given months"""
+        if not os.path.exists(self.partitions_dir):
+            os.makedirs(self.partitions_dir)
+            logger.info(f"Created directory: {self.partitions_dir}")
+
+        dates = pd.DatetimeIndex(ledger['Date'])
+        for month in sorted(months):
+            start = pd.Timestamp(f'{month}-01')
+            left = dates.searchsorted(start, side='left')
+            right = dates.searchsorted(start + pd.offsets.MonthBegin(1), side='left')
+            partition_file = os.path.join(self.partitions_dir, f'finance_{month}.csv')
+            if right > left:
+                ledger.iloc[left:right].to_csv(partition_file, index=False)
+            elif os.path.exists(partition_file):
+                os.remove(partition_file)
+            self._publish_file(partition_file)
+        logger.info(f"Rewrote {len(months)} finance month partitions")
+
     def get_available_data_files(self):
         """Get list of all available data files"""
         data_files = {
@@ -2,30 +2,43 @@ import pandas as pd
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
 from notion_client import Client
+from notion_client.helpers import collect_paginated_api
+from src.services.notion_decoder import FINANCE_SCHEMA, decode_pages
+from src.models.portfolio import HOLDINGS_COLUMNS, parse_holdings
 from src.utils.logger import setup_logger
 
 logger = setup_logger("data_providers")
 
 class NotionData:
     """Class to manage data from Notion"""
-    def __init__(self, token, database_id):
+    def __init__(self, token, database_id, cache=None, extra_properties=None):
         self.notion = Client(auth=token)
         self.database_id = database_id
+        self.cache = cache
+        self.schema = FINANCE_SCHEMA + list(extra_properties or [])
         self.data = None
 
+    def _query_results(self):
+        """Query the Notion database for all of its pages, following pagination"""
+        return collect_paginated_api(self.notion.databases.query, database_id=self.database_id)
+
     def fetch_data(self):
         """Fetch data from Notion"""
         try:
-            results = self.notion.databases.query(database_id=self.database_id).get("results")
-            data = []
-            for page in results:
-                date = page["properties"]["Date"]["date"]["start"] if page["properties"]["Date"]["date"] else None
-                category = page["properties"]["Category"]["select"]["name"] if page["properties"]["Category"]["select"] else None
-                description = page["properties"]["Description"]["title"][0]["text"]["content"] if page["properties"]["Description"]["title"] else None
-                amount = page["properties"]["Amount"]["number"] if page["properties"]["Amount"]["number"] else 0
-                data.append([date, category, description, amount])
-            self.data = pd.DataFrame(data, columns=["Date", "Category", "Description", "Amount"])
-            logger.info(f"Successfully fetched {len(data)} records from Notion")
+            if self.cache:
+                # No revalidation: deleting a page leaves the newest edit time
+                # unchanged, so only a full query within the TTL is trusted
+                results = self.cache.fetch(
+                    "notion",
+                    {"database_id": self.database_id},
+                    self._query_results
+                )
+                if results is None:
+                    return pd.DataFrame(columns=["Date", "Category", "Description", "Amount"])
+            else:
+                results = self._query_results()
+            self.data = decode_pages(results, self.schema)
+            logger.info(f"Successfully fetched {len(self.data)} records from Notion")
             return self.data
         except Exception as e:
             logger.error(f"Error fetching data from Notion: {e}")
@@ -33,7 +46,8 @@ class NotionData:
 
 class GoogleSheetsData:
     """Class to manage data from Google Sheets"""
-    def __init__(self, credentials_path, scope):
+    def __init__(self, credentials_path, scope, cache=None):
+        self.cache = cache
         try:
             self.creds = ServiceAccountCredentials.from_json_keyfile_name(credentials_path, scope)
             self.client = gspread.authorize(self.creds)
@@ -42,30 +56,57 @@ class GoogleSheetsData:
             logger.error(f"Error connecting to Google Sheets: {e}")
             self.client = None
 
-    def fetch_stock_list(self, spreadsheet_id):
-        """Fetch stock list from Google Sheets"""
-        if not self.client:
+    def _last_update_time(self, spreadsheet_id):
+        """Get the spreadsheet modified time from Drive, used to revalidate cached results"""
+        return self.client.get_file_drive_metadata(spreadsheet_id)["modifiedTime"]
+
+    def _cached(self, method, spreadsheet_id, fetch_fn):
+        """Serve a sheet request through the response cache when one is configured"""
+        if not self.cache:
+            return fetch_fn()
+        return self.cache.fetch(
+            "google_sheets",
+            {"spreadsheet_id": spreadsheet_id, "method": method},
+            fetch_fn,
+            lambda: self._last_update_time(spreadsheet_id)
+        )
+
+    def fetch_holdings(self, spreadsheet_id):
+        """Fetch the stock sheet as holdings: tickers plus quantity and cost basis columns"""
+        if not self.client and not (self.cache and self.cache.offline):
             logger.error("Google Sheets client not initialized")
-            return []
+            return pd.DataFrame(columns=HOLDINGS_COLUMNS)
             
         try:
-            sheet = self.client.open_by_key(spreadsheet_id).sheet1
-            tickers = sheet.col_values(1)[1:]  # Skip header row
-            logger.info(f"Successfully fetched {len(tickers)} stock tickers")
-            return tickers
+            rows = self._cached(
+                "stock_holdings",
+                spreadsheet_id,
+                lambda: self.client.open_by_key(spreadsheet_id).sheet1.get_all_values()
+            )
+            holdings = parse_holdings(rows or [])
+            logger.info(f"Successfully fetched {len(holdings)} stock tickers")
+            return holdings
         except Exception as e:
             logger.error(f"Error fetching stock list: {e}")
-            return []
+            return pd.DataFrame(columns=HOLDINGS_COLUMNS)
+
+    def fetch_stock_list(self, spreadsheet_id):
+        """Fetch stock list from Google Sheets"""
+        return self.fetch_holdings(spreadsheet_id)["Ticker"].tolist()
 
     def fetch_finance_data(self, spreadsheet_id):
         """Fetch financial data from Google Sheets"""
-        if not self.client:
+        if not self.client and not (self.cache and self.cache.offline):
             logger.error("Google Sheets client not initialized")
             return pd.DataFrame()
             
         try:
-            sheet = self.client.open_by_key(spreadsheet_id).sheet1
-            data = pd.DataFrame(sheet.get_all_records())
+            records = self._cached(
+                "finance_records",
+                spreadsheet_id,
+                lambda: self.client.open_by_key(spreadsheet_id).sheet1.get_all_records()
+            )
+            data = pd.DataFrame(records or [])
             logger.info(f"Successfully fetched {len(data)} financial records")
             return data
         except Exception as e:
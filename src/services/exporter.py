@@ -0,0 +1,117 @@
+import os
+import gzip
+import json
+import hashlib
+from src.utils.logger import setup_logger
+
+logger = setup_logger("exporter")
+
+# Supported export formats: name -> (file extension, MIME type)
+EXPORT_FORMATS = {
+    "csv": (".csv", "text/csv"),
+    "csv.gz": (".csv.gz", "application/gzip"),
+    "parquet": (".parquet", "application/vnd.apache.parquet"),
+}
+
+
+def parquet_available():
+    """Check whether the optional pyarrow dependency for Parquet exports is installed"""
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ExportService:
+    """Build data exports lazily, write them in chunks and cache the generated files
+
+    Exports are only built when requested. Each generated file is keyed by the
+    export name, its filter parameters, the data version and the format, so
+    repeated requests for the same data are served from disk.
+    """
+    def __init__(self, export_dir, chunk_rows=50000, max_files=50):
+        self.export_dir = export_dir
+        self.chunk_rows = chunk_rows
+        self.max_files = max_files
+
+        if not os.path.exists(self.export_dir):
+            os.makedirs(self.export_dir)
+            logger.info(f"Created directory: {self.export_dir}")
+
+    @classmethod
+    def from_config(cls, config):
+        """Create an export service from the application configuration"""
+        return cls(os.path.join(config.output_dir, 'exports'))
+
+    def available_formats(self):
+        """Get the export formats supported in this environment"""
+        return [fmt for fmt in EXPORT_FORMATS if fmt != "parquet" or parquet_available()]
+
+    def export_path(self, name, params, data_version, fmt):
+        """Get the cache path of an export"""
+        payload = json.dumps({"name": name, "params": params, "version": data_version}, sort_keys=True, default=str)
+        key = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        return os.path.join(self.export_dir, f"{name}_{key}{EXPORT_FORMATS[fmt][0]}")
+
+    def _write_csv(self, frame, path, compress):
+        """Write a frame to CSV one chunk of rows at a time"""
+        opener = gzip.open if compress else open
+        with opener(path, 'wt', newline='') as file:
+            for start in range(0, max(len(frame), 1), self.chunk_rows):
+                frame.iloc[start:start + self.chunk_rows].to_csv(file, header=(start == 0), index=False)
+
+    def _write_parquet(self, frame, path):
+        """Write a frame to Parquet one row group at a time"""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        # Infer the types from the first chunk; columns it has no values for are written as strings
+        schema = pa.Schema.from_pandas(frame.iloc[:self.chunk_rows], preserve_index=False)
+        for position, field in enumerate(schema):
+            if pa.types.is_null(field.type):
+                schema = schema.set(position, field.with_type(pa.string()))
+        with pq.ParquetWriter(path, schema) as writer:
+            for start in range(0, len(frame), self.chunk_rows):
+                chunk = frame.iloc[start:start + self.chunk_rows]
+                writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+
+    def get_or_build(self, name, params, data_version, fmt, frame_fn):
+        """Return the path of an export, building it with frame_fn only if it is not cached"""
+        if fmt not in self.available_formats():
+            raise ValueError(f"Unsupported export format: {fmt}")
+
+        path = self.export_path(name, params, data_version, fmt)
+        if os.path.exists(path):
+            logger.info(f"Serving cached export {path}")
+            return path
+
+        frame = frame_fn()
+        tmp_path = f"{path}.tmp"
+        try:
+            if fmt == "parquet":
+                self._write_parquet(frame, tmp_path)
+            else:
+                self._write_csv(frame, tmp_path, compress=(fmt == "csv.gz"))
+            os.replace(tmp_path, path)
+        finally:
+            # A failed build must not leave a partial file behind
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        logger.info(f"Built export {path} with {len(frame)} rows")
+
+        self._prune()
+        return path
+
+    def _prune(self):
+        """Remove the oldest exports beyond max_files"""
+        files = [
+            os.path.join(self.export_dir, f) for f in os.listdir(self.export_dir)
+            if not f.endswith('.tmp')
+        ]
+        files.sort(key=os.path.getmtime, reverse=True)
+        for path in files[self.max_files:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
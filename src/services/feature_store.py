@@ -0,0 +1,146 @@
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+from src.models.features import (
+    FEATURE_DEFINITIONS, FEATURE_LOOKBACK, bar_dates, build_features, feature_definition_hash
+)
+from src.utils.logger import setup_logger
+
+logger = setup_logger("feature_store")
+
+# Loaded feature frames shared by all sessions in this process: path -> (mtime_ns, frame)
+_FEATURE_CACHE = {}
+_FEATURE_LOCK = threading.Lock()
+
+
+class FeatureStore:
+    """Per-ticker store of computed prediction features
+
+    Features are saved per ticker under the hash of the feature definitions,
+    so changing a definition starts a new store instead of mixing versions.
+    When new bars arrive only their rows are computed (from a short lookback
+    window) and appended; the history is rebuilt only when the definitions
+    change or the stored bars no longer match the prices (e.g. after a split
+    adjustment).
+    """
+    def __init__(self, features_dir, definitions=FEATURE_DEFINITIONS):
+        self.features_dir = features_dir
+        self.definitions = definitions
+        self.definition_hash = feature_definition_hash(definitions)
+
+        if not os.path.exists(self.features_dir):
+            os.makedirs(self.features_dir)
+            logger.info(f"Created directory: {self.features_dir}")
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a feature store from the application configuration"""
+        return cls(os.path.join(config.processed_data_dir, 'features'))
+
+    def _paths(self, ticker):
+        ticker_dir = os.path.join(self.features_dir, ticker)
+        stem = os.path.join(ticker_dir, f'features_{self.definition_hash}')
+        return ticker_dir, f'{stem}.csv', f'{stem}.json'
+
+    def _load_meta(self, meta_file):
+        if not os.path.exists(meta_file):
+            return None
+        try:
+            with open(meta_file, 'r') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_file, rows, last_bar, last_close):
+        tmp_file = f"{meta_file}.tmp"
+        with open(tmp_file, 'w') as file:
+            json.dump({
+                "definition_hash": self.definition_hash,
+                "rows": int(rows),
+                "last_bar": str(last_bar.date()),
+                "last_close": float(last_close),
+            }, file)
+        os.replace(tmp_file, meta_file)
+
+    def _rebuild(self, ticker, prices):
+        """Compute all features for a ticker and replace its stored features"""
+        ticker_dir, features_file, meta_file = self._paths(ticker)
+        os.makedirs(ticker_dir, exist_ok=True)
+
+        features = build_features(prices, self.definitions)
+        features.to_csv(features_file)
+        self._write_meta(meta_file, len(features), features.index[-1], features['Close'].iloc[-1])
+
+        # Features computed under older definitions are no longer used
+        for name in os.listdir(ticker_dir):
+            if name.startswith('features_') and self.definition_hash not in name:
+                os.remove(os.path.join(ticker_dir, name))
+        logger.info(f"Built {len(features)} feature rows for {ticker}")
+        return len(features)
+
+    def update(self, ticker, prices):
+        """Bring a ticker's stored features up to date with its price history
+
+        Returns the number of feature rows computed (0 when already current).
+        """
+        if prices.empty:
+            return 0
+        _, features_file, meta_file = self._paths(ticker)
+        meta = self._load_meta(meta_file)
+        if meta is None or not os.path.exists(features_file):
+            return self._rebuild(ticker, prices)
+
+        dates = bar_dates(prices)
+        last_bar = pd.Timestamp(meta["last_bar"])
+        position = dates.searchsorted(last_bar)
+        if position >= len(dates) or dates[position] != last_bar:
+            return self._rebuild(ticker, prices)
+        if not np.isclose(float(prices['Close'].iloc[position]), meta["last_close"]):
+            # Stored history was adjusted since the features were computed
+            return self._rebuild(ticker, prices)
+
+        new_rows = len(dates) - position - 1
+        if new_rows <= 0:
+            return 0
+
+        # Compute only the new bars, from just enough history for the longest window
+        window = prices.iloc[max(0, position + 1 - FEATURE_LOOKBACK):]
+        features = build_features(window, self.definitions).iloc[-new_rows:]
+        features.to_csv(features_file, mode='a', header=False)
+        self._write_meta(meta_file, meta["rows"] + new_rows, features.index[-1], features['Close'].iloc[-1])
+        logger.info(f"Appended {new_rows} feature rows for {ticker}")
+        return new_rows
+
+    def load(self, ticker):
+        """Load a ticker's stored features indexed by bar date"""
+        _, features_file, _ = self._paths(ticker)
+        if not os.path.exists(features_file):
+            return pd.DataFrame()
+
+        mtime = os.stat(features_file).st_mtime_ns
+        with _FEATURE_LOCK:
+            cached = _FEATURE_CACHE.get(features_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        try:
+            features = pd.read_csv(features_file, index_col='Date', parse_dates=['Date'])
+        except Exception as e:
+            logger.error(f"Error loading features for {ticker}: {e}")
+            return pd.DataFrame()
+        with _FEATURE_LOCK:
+            _FEATURE_CACHE[features_file] = (mtime, features)
+        return features
+
+    def get_features(self, ticker, prices):
+        """Update and load a ticker's features"""
+        self.update(ticker, prices)
+        return self.load(ticker)
+
+    def version(self, ticker):
+        """Get a version token for a ticker's stored features"""
+        _, features_file, _ = self._paths(ticker)
+        mtime = os.stat(features_file).st_mtime_ns if os.path.exists(features_file) else 0
+        return f"{self.definition_hash}:{mtime}"
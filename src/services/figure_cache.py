@@ -0,0 +1,115 @@
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import plotly.io as pio
+from src.utils.logger import setup_logger
+
+logger = setup_logger("figure_cache")
+
+# Serialized figures shared by all sessions in this process
+_MEMORY_CACHE = OrderedDict()
+_MEMORY_CACHE_SIZE = 256
+_MEMORY_LOCK = threading.Lock()
+
+# Figure files kept on disk; the least recently used are removed beyond this
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    """Cache of serialized Plotly figure JSON keyed by chart type, parameters and data version
+
+    Figures are kept in process memory (shared across sessions) and on disk
+    (shared across processes and restarts). Entries for an older data version
+    are never served, and invalidate() clears the cache after a data refresh.
+    Every date range a user picks adds a file, so the files on disk are
+    evicted least recently used first (by modification time, which disk
+    hits refresh) once they exceed max_bytes.
+    """
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+            logger.info(f"Created directory: {self.cache_dir}")
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a figure cache from the application configuration"""
+        return cls(os.path.join(config.cache_dir, 'figures'))
+
+    def make_key(self, chart, params, data_version):
+        """Build the cache key of a figure"""
+        payload = json.dumps({"params": params, "version": data_version}, sort_keys=True, default=str)
+        return f"{chart}_{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+    def _remember(self, key, spec):
+        with _MEMORY_LOCK:
+            _MEMORY_CACHE[key] = spec
+            _MEMORY_CACHE.move_to_end(key)
+            while len(_MEMORY_CACHE) > _MEMORY_CACHE_SIZE:
+                _MEMORY_CACHE.popitem(last=False)
+
+    def get_spec(self, chart, params, data_version, build_fn):
+        """Return the serialized JSON of a figure, building it with build_fn on a miss"""
+        key = self.make_key(chart, params, data_version)
+
+        with _MEMORY_LOCK:
+            spec = _MEMORY_CACHE.get(key)
+            if spec is not None:
+                _MEMORY_CACHE.move_to_end(key)
+                return spec
+
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        try:
+            with open(path, 'r') as file:
+                spec = file.read()
+            os.utime(path)
+        except FileNotFoundError:
+            spec = pio.to_json(build_fn(), validate=False)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'w') as file:
+                file.write(spec)
+            os.replace(tmp_path, path)
+            self._evict()
+
+        self._remember(key, spec)
+        return spec
+
+    def _evict(self):
+        """Remove the least recently used figure files until the cache fits in max_bytes"""
+        files = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.json'):
+                try:
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, name))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, name in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+                total -= size
+            except OSError:
+                pass
+
+    def get(self, chart, params, data_version, build_fn):
+        """Return a figure as a plain dict, ready to pass to st.plotly_chart"""
+        return json.loads(self.get_spec(chart, params, data_version, build_fn))
+
+    def invalidate(self):
+        """Drop all cached figures, e.g. after the underlying data was refreshed"""
+        with _MEMORY_LOCK:
+            _MEMORY_CACHE.clear()
+        for name in os.listdir(self.cache_dir):
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+        logger.info("Invalidated cached figures")
@@ -0,0 +1,106 @@
+import os
+import io
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+import pandas as pd
+from src.utils.logger import setup_logger
+
+logger = setup_logger("forecast_cache")
+
+# Forecast frames shared by all sessions in this process
+_MEMORY_CACHE = OrderedDict()
+_MEMORY_CACHE_SIZE = 512
+_MEMORY_LOCK = threading.Lock()
+
+# Forecast files kept on disk per ticker; older ones are for outdated data
+FILES_PER_TICKER = 8
+
+
+class ForecastCache:
+    """Cache of price forecasts keyed by ticker, model version and data version
+
+    A new price history or a new model/feature version changes the key, so
+    stale forecasts are never served. Entries live in process memory and as
+    small JSON files, so forecasts precomputed by the batch job are reused
+    by the pages.
+    """
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+            logger.info(f"Created directory: {self.cache_dir}")
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a forecast cache from the application configuration"""
+        return cls(os.path.join(config.cache_dir, 'forecasts'))
+
+    def make_key(self, ticker, model_version, data_version, params):
+        """Build the cache key of a forecast"""
+        payload = json.dumps({"model": model_version, "data": data_version, "params": params}, sort_keys=True, default=str)
+        return f"{ticker}_{hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]}"
+
+    def _remember(self, key, forecast):
+        with _MEMORY_LOCK:
+            _MEMORY_CACHE[key] = forecast
+            _MEMORY_CACHE.move_to_end(key)
+            while len(_MEMORY_CACHE) > _MEMORY_CACHE_SIZE:
+                _MEMORY_CACHE.popitem(last=False)
+
+    def get(self, ticker, model_version, data_version, params):
+        """Return a cached forecast frame, or None on a miss"""
+        key = self.make_key(ticker, model_version, data_version, params)
+        with _MEMORY_LOCK:
+            forecast = _MEMORY_CACHE.get(key)
+            if forecast is not None:
+                _MEMORY_CACHE.move_to_end(key)
+                return forecast
+
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'r') as file:
+                forecast = pd.read_json(io.StringIO(file.read()), orient='split')
+            forecast.index.name = 'Date'
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable cached forecast {key}: {e}")
+            return None
+        self._remember(key, forecast)
+        return forecast
+
+    def put(self, ticker, model_version, data_version, params, forecast):
+        """Store a forecast frame"""
+        key = self.make_key(ticker, model_version, data_version, params)
+        path = os.path.join(self.cache_dir, f"{key}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as file:
+            file.write(forecast.to_json(orient='split', date_format='iso'))
+        os.replace(tmp_path, path)
+        self._remember(key, forecast)
+        self._prune(ticker)
+
+    def _prune(self, ticker):
+        """Delete a ticker's oldest forecast files beyond FILES_PER_TICKER"""
+        paths = [
+            os.path.join(self.cache_dir, name) for name in os.listdir(self.cache_dir)
+            if name.startswith(f"{ticker}_") and name.endswith('.json')
+        ]
+        paths.sort(key=os.path.getmtime, reverse=True)
+        for path in paths[FILES_PER_TICKER:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get_or_compute(self, ticker, model_version, data_version, params, compute_fn):
+        """Return a cached forecast, computing and storing it with compute_fn on a miss"""
+        forecast = self.get(ticker, model_version, data_version, params)
+        if forecast is None:
+            forecast = compute_fn()
+            if forecast is not None and not forecast.empty:
+                self.put(ticker, model_version, data_version, params, forecast)
+        return forecast
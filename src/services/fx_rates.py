@@ -0,0 +1,181 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+import yfinance as yf
+from src.utils.logger import setup_logger
+
+logger = setup_logger("fx_rates")
+
+# Rates are fetched this many days before the earliest date needed, so dates on
+# weekends and holidays have a preceding rate
+RATE_LOOKBACK_DAYS = 7
+
+# Rate tables loaded in this process: path -> (mtime_ns, day numbers, rates)
+_RATE_CACHE = {}
+_RATE_LOCK = threading.Lock()
+
+
+def normalize_currencies(currencies, base_currency):
+    """Upper-case currency codes, with missing or blank codes in the base currency"""
+    currencies = pd.Series(currencies, dtype=object)
+    codes = currencies.where(currencies.notna(), "").astype(str).str.strip().str.upper()
+    return codes.where(codes != "", base_currency).to_numpy(dtype=object)
+
+
+def required_rates(frames, base_currency):
+    """Map each foreign currency in the finance frames to its earliest transaction date"""
+    needed = {}
+    for df in frames:
+        if df.empty or "Currency" not in df.columns:
+            continue
+        codes = pd.Series(normalize_currencies(df["Currency"], base_currency), index=df.index)
+        dates = pd.to_datetime(df["Date"], errors='coerce')
+        earliest = dates[codes != base_currency].groupby(codes[codes != base_currency]).min()
+        for currency, start in earliest.items():
+            start = start if pd.notna(start) else pd.Timestamp.now().normalize()
+            needed[currency] = min(start, needed.get(currency, start))
+    return needed
+
+
+def _day_numbers(dates):
+    """Days since the epoch for each date; NaT becomes the minimum int64"""
+    dates = pd.to_datetime(pd.Series(dates), errors='coerce')
+    return dates.values.astype('datetime64[D]').astype(np.int64), dates.isna().to_numpy()
+
+
+class FxRateData:
+    """Daily exchange rates from yfinance"""
+    def __init__(self, cache=None):
+        self.cache = cache
+
+    def fetch_rates(self, currency, base_currency, start):
+        """Fetch daily closing rates (base currency per unit of currency) from start
+
+        Returns a Series indexed by tz-naive dates; empty when unavailable.
+        """
+        symbol = f"{currency}{base_currency}=X"
+        fetch_fn = lambda: yf.Ticker(symbol).history(start=str(pd.Timestamp(start).date()))
+        try:
+            if self.cache:
+                history = self.cache.fetch("yfinance", {"fx": symbol, "start": str(pd.Timestamp(start).date())}, fetch_fn)
+            else:
+                history = fetch_fn()
+        except Exception as e:
+            logger.error(f"Error fetching {symbol} rates: {e}")
+            return pd.Series(dtype=float)
+        if history is None or history.empty:
+            logger.warning(f"No {symbol} rates available from {start}")
+            return pd.Series(dtype=float)
+
+        dates = pd.DatetimeIndex(pd.to_datetime(history.index, utc=True)).tz_localize(None).normalize()
+        return pd.Series(history["Close"].to_numpy(dtype=float), index=dates)
+
+
+class FxRateTable:
+    """Local daily exchange rate tables, one file per currency
+
+    Tables are extended incrementally: a refresh fetches only the days after
+    the last stored rate (and earlier days when older transactions need
+    them). Conversion looks up the latest rate on or before each
+    transaction date with one binary search per currency, so converting the
+    whole ledger needs no per-row lookups.
+    """
+    def __init__(self, fx_dir, base_currency="USD"):
+        self.fx_dir = fx_dir
+        self.base_currency = base_currency
+
+        if not os.path.exists(self.fx_dir):
+            os.makedirs(self.fx_dir)
+            logger.info(f"Created directory: {self.fx_dir}")
+
+    def rate_file(self, currency):
+        return os.path.join(self.fx_dir, f'{currency}_{self.base_currency}.csv')
+
+    def rates(self, currency):
+        """Get a currency's stored rates as sorted day numbers and rates"""
+        rate_file = self.rate_file(currency)
+        if not os.path.exists(rate_file):
+            return np.array([], dtype=np.int64), np.array([], dtype=float)
+
+        mtime = os.stat(rate_file).st_mtime_ns
+        with _RATE_LOCK:
+            cached = _RATE_CACHE.get(rate_file)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        table = pd.read_csv(rate_file, parse_dates=['Date'])
+        days, _ = _day_numbers(table['Date'])
+        rates = table['Rate'].to_numpy(dtype=float)
+        with _RATE_LOCK:
+            _RATE_CACHE[rate_file] = (mtime, days, rates)
+        return days, rates
+
+    def coverage(self, currency):
+        """Get the (first, last) stored rate dates of a currency, or None"""
+        days, _ = self.rates(currency)
+        if not len(days):
+            return None
+        first, last = days[[0, -1]].astype('datetime64[D]')
+        return pd.Timestamp(first), pd.Timestamp(last)
+
+    def update(self, currency, fetch_fn, start):
+        """Extend a currency's table with rates from fetch_fn(start) as needed to cover start..today
+
+        Returns the rate file when it changed, otherwise None.
+        """
+        if currency == self.base_currency:
+            return None
+        start = pd.Timestamp(start).normalize()
+        coverage = self.coverage(currency)
+
+        if coverage is None or start < coverage[0]:
+            fetched = fetch_fn(start - pd.Timedelta(days=RATE_LOOKBACK_DAYS))
+        else:
+            # The last stored day may have been a partial day; fetch it again
+            fetched = fetch_fn(coverage[1])
+        if fetched.empty:
+            return None
+
+        rate_file = self.rate_file(currency)
+        table = pd.Series(dtype=float)
+        merged = fetched
+        if coverage is not None:
+            stored = pd.read_csv(rate_file, parse_dates=['Date'])
+            table = pd.Series(stored['Rate'].to_numpy(dtype=float), index=pd.DatetimeIndex(stored['Date']))
+            merged = pd.concat([table, fetched])
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index().dropna()
+        if len(merged) == len(table) and np.allclose(merged.to_numpy(), table.reindex(merged.index).to_numpy()):
+            return None
+
+        tmp_file = f"{rate_file}.tmp"
+        merged.rename_axis('Date').rename('Rate').to_csv(tmp_file, date_format='%Y-%m-%d')
+        os.replace(tmp_file, rate_file)
+        logger.info(f"Stored {len(merged) - len(table)} new {currency}/{self.base_currency} rates")
+        return rate_file
+
+    def convert(self, amounts, currencies, dates):
+        """Convert amounts to the base currency at the rate in effect on each date
+
+        currencies must already be normalized. Dates before the first stored
+        rate use the first rate and undated rows use the latest one. Amounts
+        in currencies without any stored rates become NaN.
+        """
+        amounts = pd.to_numeric(pd.Series(amounts), errors='coerce').to_numpy(dtype=float)
+        converted = np.full(len(amounts), np.nan)
+        codes, uniques = pd.factorize(pd.Series(currencies, dtype=object))
+        days, undated = _day_numbers(dates)
+
+        for code, currency in enumerate(uniques):
+            rows = codes == code
+            if currency == self.base_currency:
+                converted[rows] = amounts[rows]
+                continue
+            rate_days, rates = self.rates(currency)
+            if not len(rates):
+                logger.warning(f"No {currency}/{self.base_currency} rates; {int(rows.sum())} amounts left unconverted")
+                continue
+            positions = np.clip(np.searchsorted(rate_days, days[rows], side='right') - 1, 0, None)
+            positions[undated[rows]] = len(rates) - 1
+            converted[rows] = amounts[rows] * rates[positions]
+        return converted
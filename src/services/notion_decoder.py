@@ -0,0 +1,152 @@
+from collections import namedtuple
+from operator import itemgetter
+import numpy as np
+import pandas as pd
+
+# One column of the decoded frame: output column name, Notion property name and property type
+PropertySpec = namedtuple("PropertySpec", ["column", "property", "type"])
+
+# Properties of the finance database
+FINANCE_SCHEMA = [
+    PropertySpec("Date", "Date", "date"),
+    PropertySpec("Category", "Category", "select"),
+    PropertySpec("Description", "Description", "title"),
+    PropertySpec("Amount", "Amount", "number"),
+]
+
+_EMPTY = {}
+_NO_TEXT = (_EMPTY,)
+
+# Property type -> function pulling the value out of one property object.
+# Empty values fall through to shared empty defaults, so a property that is
+# missing, null or blank all decode to None.
+EXTRACTORS = {
+    "date": lambda prop: (prop.get("date") or _EMPTY).get("start"),
+    "select": lambda prop: (prop.get("select") or _EMPTY).get("name"),
+    "status": lambda prop: (prop.get("status") or _EMPTY).get("name"),
+    "multi_select": lambda prop: ", ".join(option.get("name", "") for option in prop.get("multi_select") or ()) or None,
+    "title": lambda prop: (prop.get("title") or _NO_TEXT)[0].get("plain_text"),
+    "rich_text": lambda prop: (prop.get("rich_text") or _NO_TEXT)[0].get("plain_text"),
+    "number": lambda prop: prop.get("number"),
+    "checkbox": lambda prop: prop.get("checkbox"),
+    "url": lambda prop: prop.get("url"),
+    "email": lambda prop: prop.get("email"),
+    "phone_number": lambda prop: prop.get("phone_number"),
+}
+
+# Property types decoded into float columns (missing values become NaN)
+NUMERIC_TYPES = {"number"}
+
+# Pages decoded per block; a block's property objects stay in cache while
+# each column is pulled out of it
+DECODE_BLOCK = 512
+
+
+def _nested(key, field):
+    return lambda props: [value[field] if value else None for value in map(itemgetter(key), props)]
+
+
+def _first_text(key):
+    return lambda props: [value[0]["plain_text"] if value else None for value in map(itemgetter(key), props)]
+
+
+def _value(key):
+    return lambda props: list(map(itemgetter(key), props))
+
+
+def _pluck(items, key):
+    """Get key from every item, None where an item lacks it"""
+    try:
+        return list(map(itemgetter(key), items))
+    except (KeyError, TypeError):
+        return [(item or _EMPTY).get(key) for item in items]
+
+
+# Property type -> function pulling one column out of a block of property
+# objects. These assume well-formed properties and raise on anything else;
+# decode_pages then falls back to EXTRACTORS for that block.
+COLUMN_EXTRACTORS = {
+    "date": _nested("date", "start"),
+    "select": _nested("select", "name"),
+    "status": _nested("status", "name"),
+    "multi_select": lambda props: [
+        (", ".join(map(itemgetter("name"), value)) or None) if value else None
+        for value in map(itemgetter("multi_select"), props)
+    ],
+    "title": _first_text("title"),
+    "rich_text": _first_text("rich_text"),
+    "number": _value("number"),
+    "checkbox": _value("checkbox"),
+    "url": _value("url"),
+    "email": _value("email"),
+    "phone_number": _value("phone_number"),
+}
+
+
+def parse_schema(spec_string):
+    """Parse extra property specs of the form "Name:type,Other Name:type" """
+    schema = []
+    for item in filter(None, (part.strip() for part in spec_string.split(","))):
+        name, _, prop_type = item.partition(":")
+        prop_type = prop_type.strip() or "rich_text"
+        if prop_type not in EXTRACTORS:
+            raise ValueError(f"Unsupported Notion property type: {prop_type}")
+        schema.append(PropertySpec(name.strip(), name.strip(), prop_type))
+    return schema
+
+
+def decode_pages(pages, schema=FINANCE_SCHEMA):
+    """Decode Notion pages into a DataFrame with one column per schema property
+
+    Columns are extracted block by block and copied into pre-sized arrays.
+    Missing values are None (NaN for numeric columns) rather than 0, so
+    callers can tell a zero amount from a missing one. The page id is
+    returned in a PageId column.
+    """
+    count = len(pages)
+    columns = {
+        spec.column: np.empty(count, dtype=float if spec.type in NUMERIC_TYPES else object)
+        for spec in schema
+    }
+    columns["PageId"] = np.empty(count, dtype=object)
+
+    for start in range(0, count, DECODE_BLOCK):
+        block = pages[start:start + DECODE_BLOCK]
+        end = start + len(block)
+        properties = _pluck(block, "properties")
+        for spec in schema:
+            try:
+                values = COLUMN_EXTRACTORS[spec.type](map(itemgetter(spec.property), properties))
+            except (KeyError, IndexError, TypeError, AttributeError):
+                extract = EXTRACTORS[spec.type]
+                values = [extract((props or _EMPTY).get(spec.property) or _EMPTY) for props in properties]
+            columns[spec.column][start:end] = values
+        columns["PageId"][start:end] = _pluck(block, "id")
+
+    return pd.DataFrame(columns, columns=[spec.column for spec in schema] + ["PageId"], copy=False)
+
+
+def make_synthetic_pages(count, seed=0):
+    """Build synthetic Notion finance pages, with some empty properties, for benchmarking"""
+    rng = np.random.default_rng(seed)
+    categories = ["Food", "Rent", "Transport", "Utilities", "Fun", "Health"]
+    days = rng.integers(0, 3650, count)
+    amounts = np.round(rng.gamma(2.0, 40.0, count), 2)
+    missing = rng.random(count) < 0.05
+
+    pages = []
+    for i in range(count):
+        date = None if missing[i] else {"start": str(np.datetime64("2015-01-01") + days[i]), "end": None}
+        pages.append({
+            "object": "page",
+            "id": f"page-{i:08d}",
+            "properties": {
+                "Date": {"id": "d", "type": "date", "date": date},
+                "Category": {"id": "c", "type": "select", "select": {"name": categories[i % len(categories)]}},
+                "Description": {"id": "title", "type": "title", "title": [
+                    {"type": "text", "text": {"content": f"Transaction {i}"}, "plain_text": f"Transaction {i}"}
+                ]},
+                "Amount": {"id": "a", "type": "number", "number": None if missing[i] else float(amounts[i])},
+            },
+        })
+    return pages
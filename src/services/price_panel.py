@@ -0,0 +1,186 @@
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+from src.models.features import bar_dates
+from src.utils.file_lock import file_lock
+from src.utils.logger import setup_logger
+
+logger = setup_logger("price_panel")
+
+PANEL_FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Ticker slots reserved when the panel file is created; it is rebuilt with
+# twice as many when they run out
+MIN_TICKER_CAPACITY = 16
+
+# The day axis is allocated in chunks, so daily refreshes append rarely
+DAY_CHUNK = 64
+
+# Serializes panel writers in this process; the file lock covers other processes
+_PANEL_LOCK = threading.Lock()
+
+
+def _day_numbers(dates):
+    return pd.DatetimeIndex(dates).values.astype('datetime64[D]').astype(np.int64)
+
+
+def _round_up(days):
+    return -(-days // DAY_CHUNK) * DAY_CHUNK
+
+
+class PanelView:
+    """Read-only, zero-copy view of the price panel
+
+    values is indexed [date, ticker, field]; dates are calendar days, so
+    days without a bar for a ticker hold NaN.
+    """
+    def __init__(self, values, dates, tickers, fields, version):
+        self.values = values
+        self.dates = dates
+        self.tickers = tickers
+        self.fields = fields
+        self.version = version
+        self._positions = {ticker: position for position, ticker in enumerate(tickers)}
+
+    def field(self, name, tickers=None):
+        """Get one field as a (dates x tickers) array; a view when tickers is None"""
+        values = self.values[:, :, self.fields.index(name)]
+        if tickers is None:
+            return values
+        return values[:, [self._positions[ticker] for ticker in tickers]]
+
+    def ticker(self, ticker):
+        """Get one ticker's bars as a frame indexed by date"""
+        frame = pd.DataFrame(self.values[:, self._positions[ticker], :], index=self.dates, columns=self.fields)
+        return frame.dropna(how='all')
+
+
+class PricePanel:
+    """Dense (dates x tickers x OHLCV) price panel in a memory-mapped file
+
+    The float64 array lives in a raw file next to a JSON index sidecar with
+    the data file name, the first date, the allocated shape, the tickers in
+    slot order and the version of each ticker's history. A ticker's save
+    rewrites only its own slot; the array is copied to a new file only when
+    it needs an earlier start date or more ticker slots, so a reader never
+    sees a file laid out differently from the index it loaded. Processes
+    that attach map the same file read-only, so they share one physical
+    copy through the page cache. Writers (the app and the CLI may both save
+    tickers) hold a file lock from reading the index until it is rewritten.
+    """
+    def __init__(self, panel_dir):
+        self.panel_dir = panel_dir
+        self.index_file = os.path.join(panel_dir, 'prices_index.json')
+        self.lock_file = os.path.join(panel_dir, 'prices.lock')
+
+        if not os.path.exists(self.panel_dir):
+            os.makedirs(self.panel_dir)
+            logger.info(f"Created directory: {self.panel_dir}")
+
+    def load_index(self):
+        """Load the sidecar index, or None before the panel is first written"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as file:
+                    index = json.load(file)
+                if os.path.exists(self._data_file(index)):
+                    return index
+        except Exception as e:
+            logger.error(f"Error loading price panel index: {e}")
+        return None
+
+    def _write_index(self, index):
+        index["version"] = index.get("version", 0) + 1
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'w') as file:
+            json.dump(index, file)
+        os.replace(tmp_file, self.index_file)
+
+    def _data_file(self, index):
+        return os.path.join(self.panel_dir, index["file"])
+
+    def _map(self, index, mode='r'):
+        shape = (index["days"], index["capacity"], len(index["fields"]))
+        return np.memmap(self._data_file(index), dtype=np.float64, mode=mode, shape=shape)
+
+    def _create(self, start, days, capacity, index=None):
+        """Write a new panel file, copying the current panel into it; returns the new index"""
+        created = dict(index or {"tickers": [], "versions": {}, "last_day": start, "fields": PANEL_FIELDS})
+        created.update(file=f"prices_{created.get('version', 0) + 1}.f64", start=start, days=days, capacity=capacity)
+
+        values = np.memmap(self._data_file(created), dtype=np.float64, mode='w+', shape=(days, capacity, len(PANEL_FIELDS)))
+        values[:] = np.nan
+        if index is not None:
+            offset = index["start"] - start
+            values[offset:offset + index["days"], :index["capacity"]] = self._map(index)
+        values.flush()
+        del values
+        logger.info(f"Created price panel with {days} days and {capacity} ticker slots")
+        return created
+
+    def _extend(self, index, days):
+        """Append empty days to the end of the panel file in place"""
+        row = np.full((index["capacity"], len(index["fields"])), np.nan).tobytes()
+        with open(self._data_file(index), 'ab') as file:
+            file.write(row * (days - index["days"]))
+        index["days"] = days
+        return index
+
+    def update_ticker(self, ticker, prices, version=None):
+        """Replace one ticker's bars with its stored history, growing the panel as needed"""
+        if prices.empty:
+            return
+        days = _day_numbers(bar_dates(prices))
+        values = prices.reindex(columns=PANEL_FIELDS).to_numpy(dtype=float)
+        first, last = int(days.min()), int(days.max())
+
+        with _PANEL_LOCK, file_lock(self.lock_file):
+            index = previous = self.load_index()
+            if index is None:
+                index = self._create(first, _round_up(last - first + 1), MIN_TICKER_CAPACITY)
+            is_new = ticker not in index["tickers"]
+            capacity = index["capacity"] * 2 if is_new and len(index["tickers"]) == index["capacity"] else index["capacity"]
+            start = min(index["start"], first)
+            end = max(index["start"] + index["days"], last + 1)
+            if start < index["start"] or capacity > index["capacity"]:
+                index = self._create(start, _round_up(end - start), capacity, index)
+            elif end > index["start"] + index["days"]:
+                index = self._extend(index, index["days"] + _round_up(end - index["start"] - index["days"]))
+
+            if is_new:
+                index["tickers"].append(ticker)
+            slot = index["tickers"].index(ticker)
+            panel = self._map(index, mode='r+')
+            panel[:, slot, :] = np.nan
+            panel[days - index["start"], slot, :] = values
+            panel.flush()
+            del panel
+
+            index["versions"][ticker] = version
+            index["last_day"] = max(index["last_day"], last)
+            self._write_index(index)
+
+            # Processes still mapping a replaced file keep it until they detach
+            if previous is not None and previous["file"] != index["file"]:
+                os.remove(self._data_file(previous))
+
+    def attach(self):
+        """Map the panel read-only, or None before it is first written
+
+        Days after the last bar and unused ticker slots are trimmed from the
+        view without copying.
+        """
+        index = self.load_index()
+        if index is None:
+            return None
+        days = index["last_day"] - index["start"] + 1
+        values = self._map(index)[:days, :len(index["tickers"])]
+        dates = pd.DatetimeIndex(np.arange(index["start"], index["start"] + days).astype('datetime64[D]'), name='Date')
+        return PanelView(values, dates, list(index["tickers"]), list(index["fields"]), index["version"])
+
+
+def attach_price_panel(panel_dir):
+    """Attach to a stored price panel; for worker processes, which only need the path"""
+    return PricePanel(panel_dir).attach()
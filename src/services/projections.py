@@ -0,0 +1,140 @@
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import pandas as pd
+from src.models.projection import BATCH_PATHS, bands_frame, combine_batches, monthly_returns, simulate_batch
+from src.services.forecast_cache import ForecastCache
+from src.utils.logger import setup_logger
+
+logger = setup_logger("projections")
+
+# Bump when the simulation changes, so cached projections are recomputed
+PROJECTION_MODEL_VERSION = "bootstrap-v2"
+
+# Worker processes shared by all sessions; started on first use
+_EXECUTOR = None
+_EXECUTOR_WORKERS = None
+_EXECUTOR_LOCK = threading.RLock()
+
+
+def _executor(workers):
+    """Get the shared process pool, replacing it if a worker died or the worker count changed"""
+    global _EXECUTOR, _EXECUTOR_WORKERS
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is not None and _EXECUTOR_WORKERS != workers:
+            # Projections already submitted finish on the old pool
+            _EXECUTOR.shutdown(wait=False)
+            _EXECUTOR = None
+        if _EXECUTOR is None or getattr(_EXECUTOR, "_broken", False):
+            # Spawned workers import only the simulation module, not the app
+            _EXECUTOR = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+            _EXECUTOR_WORKERS = workers
+        return _EXECUTOR
+
+
+class PortfolioProjector:
+    """Monte Carlo projections of portfolio value and cash balance
+
+    Portfolio returns are bootstrapped from the held positions' price
+    history (read from the shared price panel) and monthly spending from
+    the ledger's monthly totals. Paths are simulated in seeded batches on a
+    process pool, so results depend only on the parameters and data, not
+    on the number of workers. Finished projections are stored in the
+    forecast cache, keyed by parameters and data versions.
+    """
+    def __init__(self, cache, workers=1):
+        self.cache = cache
+        self.workers = workers
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a projector from the application configuration"""
+        return cls(ForecastCache.from_config(config), config.projection_workers)
+
+    def inputs(self, data_manager):
+        """Collect the bootstrap samples, current portfolio value and data version"""
+        holdings = data_manager.load_holdings()
+        quantities = holdings[holdings["Quantity"].fillna(0) != 0].groupby("Ticker")["Quantity"].sum()
+        panel = data_manager.load_price_panel()
+        tickers = [ticker for ticker in quantities.index if panel is not None and ticker in panel.tickers]
+
+        return_pool, current_value = np.zeros(1), 0.0
+        if tickers:
+            # The panel has a row per calendar day; keep the trading days of any held
+            # ticker, then value the holdings over the days every one has a price
+            closes = panel.field("Close", tickers)
+            closes = pd.DataFrame(closes[~np.isnan(closes).all(axis=1)]).ffill().to_numpy()
+            closes = closes[~np.isnan(closes).any(axis=1)]
+            values = closes @ quantities.loc[tickers].to_numpy(dtype=float)
+            if len(values):
+                return_pool, current_value = monthly_returns(values), float(values[-1])
+
+        # Monthly ledger totals are net spending; the current month is still incomplete
+        by_month = data_manager.load_finance_aggregates()["by_month"]
+        months = sorted(month for month in by_month if month != "None")
+        spending_pool = np.array([by_month[month]["sum"] for month in months[:-1] or months], dtype=float)
+        if not len(spending_pool):
+            spending_pool = np.zeros(1)
+
+        return {
+            "return_pool": return_pool,
+            "spending_pool": spending_pool,
+            "current_value": current_value,
+            "data_version": {
+                "finance": data_manager.finance_version(),
+                "panel": panel.version if panel is not None else 0,
+                "holdings": {ticker: float(quantity) for ticker, quantity in quantities.loc[tickers].items()},
+            },
+        }
+
+    def cached(self, inputs, params):
+        """Return a stored projection for these parameters, or None"""
+        return self.cache.get("projection", PROJECTION_MODEL_VERSION, inputs["data_version"], params)
+
+    def run(self, inputs, params, on_batch=None):
+        """Simulate params["paths"] paths over params["years"] and return the monthly bands
+
+        Bands are indexed by month offset, so cached results stay valid as
+        the calendar moves; dated_bands adds dates for display.
+
+        on_batch(bands, paths_done, paths_total) is called in the calling
+        thread as batches finish, with bands combined over the finished
+        batches so far.
+        """
+        cached = self.cached(inputs, params)
+        if cached is not None:
+            return cached
+
+        months = int(params["years"]) * 12
+        sizes = [min(BATCH_PATHS, params["paths"] - start) for start in range(0, params["paths"], BATCH_PATHS)]
+        seeds = np.random.SeedSequence(int(params["seed"])).spawn(len(sizes))
+        arguments = (
+            inputs["return_pool"], inputs["spending_pool"], params["start_portfolio"], params["start_cash"],
+            params["monthly_income"], params["monthly_investment"]
+        )
+
+        results = [None] * len(sizes)
+        try:
+            # Submitted under the pool lock, so a worker count change cannot shut the pool down in between
+            with _EXECUTOR_LOCK:
+                executor = _executor(self.workers)
+                futures = {
+                    executor.submit(simulate_batch, seed, size, months, *arguments): batch
+                    for batch, (seed, size) in enumerate(zip(seeds, sizes))
+                }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+                if on_batch is not None:
+                    finished = [result for result in results if result is not None]
+                    on_batch(bands_frame(combine_batches(finished)), sum(r["paths"] for r in finished), params["paths"])
+        except BrokenProcessPool as e:
+            logger.error(f"Projection workers failed: {e}")
+            return pd.DataFrame()
+
+        # Combine in batch order so the result does not depend on completion order
+        bands = bands_frame(combine_batches(results))
+        self.cache.put("projection", PROJECTION_MODEL_VERSION, inputs["data_version"], params, bands)
+        logger.info(f"Simulated {params['paths']} paths over {months} months in {len(sizes)} batches")
+        return bands
@@ -0,0 +1,132 @@
+from src.services.data_providers import NotionData, GoogleSheetsData
+from src.services.response_cache import ResponseCache
+from src.services.notion_decoder import parse_schema
+from src.services.shared_store import RefreshCoordinator
+from src.services.figure_cache import FigureCache
+from src.services.fx_rates import FxRateData, required_rates
+from src.services.validation import validate_finance, validate_prices
+from src.models.stock_analyzer import StockData
+from src.utils.logger import setup_logger
+
+logger = setup_logger("refresh")
+
+
+def validate_source(data_manager, validate_fn, dataset, source, df):
+    """Validate one fetched frame, quarantine failing rows and record the quality metrics
+
+    Returns the valid rows and the number of quarantined rows.
+    """
+    valid, quarantined, report = validate_fn(df, source)
+    if report["rows"]:
+        data_manager.quarantine_rows(dataset, source, quarantined)
+        data_manager.record_quality_metrics(report)
+    return valid, report["quarantined"]
+
+
+def refresh_finance_data(config, data_manager, cache=None):
+    """Fetch financial data from Notion and Google Sheets and merge it into the ledger
+
+    Returns a summary dict with the number of ledger records and applied
+    changes, or an 'error'/'warning' message when nothing was saved.
+    """
+    if cache is None:
+        cache = config.derived("response_cache", ResponseCache.from_config)
+
+    # Initialize data providers with a shared response cache
+    notion = NotionData(
+        config.notion_token,
+        config.notion_database_id,
+        cache=cache,
+        extra_properties=parse_schema(config.notion_extra_properties)
+    )
+    google_sheets = GoogleSheetsData(config.credentials_file, config.scope, cache=cache)
+
+    # Fetch data
+    notion_data = notion.fetch_data()
+    finance_data = google_sheets.fetch_finance_data(config.finance_spreadsheet_id)
+
+    # Check if data was fetched successfully
+    if notion_data.empty and finance_data.empty:
+        return {"records": 0, "error": "No data fetched from any source. Please check your configuration."}
+
+    # Validate each source and set failing rows aside
+    notion_data, notion_quarantine = validate_source(data_manager, validate_finance, "finance", "notion", notion_data)
+    finance_data, sheets_quarantine = validate_source(data_manager, validate_finance, "finance", "sheets", finance_data)
+    quarantined = notion_quarantine + sheets_quarantine
+    if notion_data.empty and finance_data.empty:
+        return {"records": 0, "quarantined": quarantined, "error": "All fetched rows failed validation; see the quarantine files."}
+
+    # Extend the exchange rates needed to convert foreign-currency rows
+    currencies = required_rates([notion_data, finance_data], config.base_currency)
+    if currencies:
+        data_manager.update_fx_rates(FxRateData(cache=cache), currencies)
+
+    # Combine and save data
+    combined_finance = data_manager.combine_finance_data(notion_data, finance_data)
+    if combined_finance.empty:
+        return {"records": 0, "warning": "No data was combined or saved."}
+
+    summary = {"records": len(combined_finance), "quarantined": quarantined}
+    summary.update({change: len(rows) for change, rows in data_manager.last_changes.items()})
+
+    # Cached figures describe the old ledger
+    if summary.get("inserted") or summary.get("updated") or summary.get("deleted"):
+        FigureCache.from_config(config).invalidate()
+    data_manager.update_dashboard_summary(sections=("finance",))
+    return summary
+
+
+def refresh_stock_data(config, data_manager, cache=None):
+    """Fetch the stock watchlist and price histories and save them
+
+    Returns a summary dict with the number of tickers saved, or an 'error'
+    message when nothing was saved.
+    """
+    if cache is None:
+        cache = config.derived("response_cache", ResponseCache.from_config)
+
+    # Fetch stock tickers with the quantities held
+    google_sheets = GoogleSheetsData(config.credentials_file, config.scope, cache=cache)
+    holdings = google_sheets.fetch_holdings(config.stock_spreadsheet_id)
+    tickers = holdings["Ticker"].tolist()
+    if not tickers:
+        return {"tickers": 0, "error": "No stock tickers found. Please check your Google Sheets configuration."}
+    data_manager.save_holdings(holdings)
+
+    # Fetch each ticker and save it right away, so only one history is held in memory
+    saved = quarantined = 0
+    for ticker, history in StockData(cache=cache).iter_stock_data(tickers):
+        try:
+            history, rejected = validate_source(data_manager, validate_prices, "stocks", ticker, history)
+            quarantined += rejected
+            if history.empty:
+                continue
+            data_manager.save_ticker_data(ticker, history)
+            saved += 1
+        except Exception as e:
+            logger.error(f"Error saving stock data for {ticker}: {e}")
+    data_manager.flush_ticker_catalog()
+    data_manager.update_dashboard_summary(sections=("stocks",))
+
+    if not saved:
+        return {"tickers": 0, "quarantined": quarantined, "error": "Failed to fetch any stock data."}
+    return {"tickers": saved, "quarantined": quarantined, "holdings": int((holdings["Quantity"].fillna(0) != 0).sum())}
+
+
+def run_refresh(job_name, refresh_fn, data_manager):
+    """Run a refresh job, coordinating with other replicas in shared deployments
+
+    In shared mode only the replica holding the job lease calls refresh_fn;
+    the others wait for its summary and pull the published data files.
+    """
+    if data_manager.store is None:
+        return refresh_fn()
+
+    coordinator = RefreshCoordinator(data_manager.store)
+    summary, is_leader = coordinator.run(job_name, refresh_fn)
+    if not is_leader:
+        data_manager.sync_from_store()
+        if summary is None:
+            return {"error": f"Another replica's {job_name} refresh failed or timed out; showing the data already stored."}
+        logger.info(f"Using {job_name} refresh results published by another replica")
+    return summary
@@ -0,0 +1,239 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import threading
+from src.utils.file_lock import file_lock
+from src.utils.logger import setup_logger
+
+logger = setup_logger("response_cache")
+
+# Default time-to-live (seconds) for each provider
+DEFAULT_TTLS = {
+    "notion": 300,
+    "google_sheets": 300,
+    "yfinance": 3600,
+}
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class ResponseCache:
+    """On-disk cache for external data provider responses
+
+    Entries are keyed by provider name and request parameters. Each provider
+    has its own TTL; stale entries are revalidated with a cheap validator
+    (e.g. a last-modified timestamp) where the upstream supports it, and the
+    least recently used entries are evicted once the cache exceeds max_bytes.
+    In offline mode only cached responses are served.
+
+    Several processes (the app and the CLI) can share one cache directory:
+    the index is reloaded when another process has written it, and every
+    write merges into the latest index on disk under a file lock. Access
+    times from cache hits are kept in memory and saved with the next write.
+    """
+    def __init__(self, cache_dir, ttls=None, max_bytes=DEFAULT_MAX_BYTES, offline=False):
+        self.cache_dir = cache_dir
+        self.ttls = dict(DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.index_file = os.path.join(self.cache_dir, 'index.json')
+        self.lock_file = os.path.join(self.cache_dir, 'index.lock')
+        self._lock = threading.Lock()
+        self._accessed = {}
+
+        if not os.path.exists(self.cache_dir):
+            os.makedirs(self.cache_dir)
+            logger.info(f"Created directory: {self.cache_dir}")
+
+        self._reload_index()
+
+    @classmethod
+    def from_config(cls, config):
+        """Create a response cache from the application configuration"""
+        return cls(
+            config.cache_dir,
+            ttls=config.cache_ttls,
+            max_bytes=config.cache_max_bytes,
+            offline=config.offline_mode,
+        )
+
+    def _load_index(self):
+        """Load the cache index from disk"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as file:
+                    return json.load(file)
+        except Exception as e:
+            logger.error(f"Error loading cache index, starting empty: {e}")
+        return {}
+
+    def _index_mtime(self):
+        try:
+            return os.path.getmtime(self.index_file)
+        except OSError:
+            return None
+
+    def _reload_index(self):
+        """Load the index from disk, keeping access times from this process's hits"""
+        self._index_loaded_at = self._index_mtime()
+        self._index = self._load_index()
+        for key, accessed_at in self._accessed.items():
+            if key in self._index:
+                self._index[key]["accessed_at"] = max(self._index[key]["accessed_at"], accessed_at)
+
+    def _save_index(self):
+        """Atomically write the cache index to disk"""
+        tmp_file = f"{self.index_file}.tmp"
+        with open(tmp_file, 'w') as file:
+            json.dump(self._index, file)
+        os.replace(tmp_file, self.index_file)
+        self._index_loaded_at = self._index_mtime()
+        self._accessed = {}
+
+    def _update_index(self, change):
+        """Apply change(index) to the latest index on disk, evict and save, under the file lock"""
+        with file_lock(self.lock_file):
+            self._reload_index()
+            change(self._index)
+            self._evict()
+            self._save_index()
+
+    def make_key(self, provider, params):
+        """Build a stable cache key from the provider name and request parameters"""
+        payload = json.dumps({"provider": provider, "params": params}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _read_value(self, key):
+        with open(self._entry_path(key), 'rb') as file:
+            return pickle.load(file)
+
+    def _write_value(self, provider, key, value, validator):
+        """Persist a response and record it in the index"""
+        path = self._entry_path(key)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(value, file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        entry = {
+            "provider": provider,
+            "size": os.path.getsize(path),
+            "stored_at": now,
+            "accessed_at": now,
+            "validator": validator,
+        }
+        self._update_index(lambda index: index.__setitem__(key, entry))
+
+    def _evict(self):
+        """Evict least recently used entries until the cache fits in max_bytes"""
+        total = sum(entry["size"] for entry in self._index.values())
+        if total <= self.max_bytes:
+            return
+
+        for key in sorted(self._index, key=lambda k: self._index[k]["accessed_at"]):
+            if total <= self.max_bytes:
+                break
+            total -= self._index.pop(key)["size"]
+            try:
+                os.remove(self._entry_path(key))
+            except OSError:
+                pass
+            logger.info(f"Evicted cache entry {key[:12]}")
+
+    def _hit(self, key, entry, refresh=False):
+        """Load a cached value and note the access; only a revalidation writes the index"""
+        value = self._read_value(key)
+        now = time.time()
+        entry["accessed_at"] = self._accessed[key] = now
+        if refresh:
+            def restamp(index):
+                if key in index:
+                    index[key]["stored_at"] = now
+            self._update_index(restamp)
+        return value
+
+    def fetch(self, provider, params, fetch_fn, validator_fn=None):
+        """Return the cached response for a request, calling fetch_fn when needed
+
+        validator_fn, if given, returns a cheap token (such as a last-modified
+        time) used to revalidate a stale entry without re-downloading it.
+        Returns None in offline mode when nothing is cached. The cache lock is
+        not held while talking to the upstream, so fetches can run in parallel.
+        """
+        key = self.make_key(provider, params)
+        with self._lock:
+            if self._index_mtime() != self._index_loaded_at:
+                self._reload_index()
+            entry = self._index.get(key)
+            if entry is not None and not os.path.exists(self._entry_path(key)):
+                del self._index[key]
+                entry = None
+
+            # Offline mode serves whatever is cached, regardless of age
+            if self.offline:
+                if entry is None:
+                    logger.warning(f"Offline mode: no cached {provider} response for {params}")
+                    return None
+                return self._hit(key, entry)
+
+            ttl = self.ttls.get(provider, 0)
+            if entry is not None and time.time() - entry["stored_at"] < ttl:
+                logger.info(f"Cache hit for {provider} {params}")
+                return self._hit(key, entry)
+
+        # Conditional revalidation of a stale entry
+        validator = None
+        if validator_fn is not None:
+            try:
+                validator = validator_fn()
+            except Exception as e:
+                logger.warning(f"Could not revalidate {provider} response: {e}")
+            if entry is not None and validator is not None and validator == entry.get("validator"):
+                logger.info(f"Revalidated cached {provider} response for {params}")
+                with self._lock:
+                    return self._hit(key, entry, refresh=True)
+
+        try:
+            value = fetch_fn()
+        except Exception as e:
+            # Serve a stale response rather than failing when upstream is down
+            if entry is not None:
+                logger.warning(f"Serving stale {provider} response after fetch error: {e}")
+                with self._lock:
+                    return self._hit(key, entry)
+            raise
+
+        with self._lock:
+            self._write_value(provider, key, value, validator)
+        return value
+
+    def invalidate(self, provider=None):
+        """Remove cached entries, optionally only those of one provider"""
+        def remove(index):
+            for key in [k for k, e in index.items() if provider is None or e["provider"] == provider]:
+                del index[key]
+                try:
+                    os.remove(self._entry_path(key))
+                except OSError:
+                    pass
+
+        with self._lock:
+            self._update_index(remove)
+
+    def stats(self):
+        """Return the number of entries and total size of the cache"""
+        with self._lock:
+            return {
+                "entries": len(self._index),
+                "bytes": sum(entry["size"] for entry in self._index.values()),
+                "max_bytes": self.max_bytes,
+                "offline": self.offline,
+            }
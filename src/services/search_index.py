@@ -0,0 +1,229 @@
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from src.utils.file_lock import file_lock
+from src.utils.logger import setup_logger
+
+logger = setup_logger("search_index")
+
+# Rows written per executemany batch when (re)building the index
+INSERT_BATCH_ROWS = 50000
+
+# Triggers that keep the FTS table in step with row-level changes
+SYNC_TRIGGERS = """
+    CREATE TRIGGER IF NOT EXISTS transactions_ai AFTER INSERT ON transactions BEGIN
+        INSERT INTO transactions_fts(rowid, description, category)
+        VALUES (new.rowid, new.description, new.category);
+    END;
+    CREATE TRIGGER IF NOT EXISTS transactions_ad AFTER DELETE ON transactions BEGIN
+        INSERT INTO transactions_fts(transactions_fts, rowid, description, category)
+        VALUES ('delete', old.rowid, old.description, old.category);
+    END;
+"""
+
+
+# Row ids encode the transaction day in the high bits: (day << ROWID_DAY_SHIFT) | sequence.
+# FTS5 walks matches in rowid order, so newest-first date-range queries can
+# stop after `limit` matches instead of sorting all of them. Day 0 holds rows
+# without a valid date.
+ROWID_DAY_SHIFT = 24
+DAY_OFFSET = 1 << 20
+
+
+def _day_numbers(dates):
+    """Map dates to positive day numbers, with 0 for missing dates"""
+    dates = pd.to_datetime(pd.Series(dates), errors='coerce')
+    days = dates.values.astype('datetime64[D]').astype(np.int64) + DAY_OFFSET
+    return np.where(dates.isna().to_numpy(), 0, days)
+
+
+class TransactionSearchIndex:
+    """SQLite FTS5 index over transaction descriptions and categories
+
+    The transactions table holds the searchable columns keyed by
+    TransactionId, and triggers keep the FTS table in step with it, so ledger
+    changes are applied as row-level inserts and deletes. Row ids are ordered
+    by transaction date (see ROWID_DAY_SHIFT). The index records the ledger
+    version it reflects; callers rebuild it when that falls behind.
+
+    Writes are serialized across threads and processes, so concurrent
+    sessions never rebuild the same index twice; searches read the last
+    committed state while a write runs.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock_file = f"{db_path}.lock"
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS transactions (
+                    rowid INTEGER PRIMARY KEY,
+                    transaction_id TEXT UNIQUE NOT NULL,
+                    date TEXT,
+                    category TEXT,
+                    description TEXT,
+                    amount REAL
+                );
+                CREATE VIRTUAL TABLE IF NOT EXISTS transactions_fts USING fts5(
+                    description, category, content='transactions', content_rowid='rowid', prefix='2 3'
+                );
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """ + SYNC_TRIGGERS)
+
+    def _connect(self):
+        """Get this thread's connection to the index database"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            # Rows replaced by INSERT OR REPLACE must also leave the FTS table
+            conn.execute("PRAGMA recursive_triggers = ON")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def exclusive(self):
+        """Hold the index's write lock across threads and processes"""
+        with self._write_lock, file_lock(self.lock_file):
+            yield
+
+    def ensure_version(self, version, ledger_fn):
+        """Rebuild from ledger_fn() unless the index already reflects version
+
+        A caller that waited for another rebuild finds the version current and
+        returns without repeating it. Returns True if this call rebuilt.
+        """
+        with self.exclusive():
+            if self.version() == version:
+                return False
+            self.rebuild(ledger_fn(), version)
+            return True
+
+    def rebuild_in_background(self, version, ledger_fn):
+        """Run ensure_version in a daemon thread, unless a write is already running in this process"""
+        if self._write_lock.locked():
+            return
+
+        def run():
+            try:
+                self.ensure_version(version, ledger_fn)
+            except Exception as e:
+                logger.error(f"Error rebuilding search index: {e}")
+
+        threading.Thread(target=run, name="search-index-rebuild", daemon=True).start()
+
+    def version(self):
+        """Get the ledger version the index reflects, or -1 if it was never built"""
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'ledger_version'").fetchone()
+        return int(row[0]) if row else -1
+
+    def _rows(self, frame, rowids):
+        """Convert ledger rows to index tuples"""
+        dates = pd.to_datetime(frame["Date"], errors='coerce').dt.strftime('%Y-%m-%d')
+        columns = [
+            rowids.tolist(),
+            frame["TransactionId"].astype(str).tolist(),
+            dates.where(dates.notna(), None).tolist(),
+            frame["Category"].astype(str).where(frame["Category"].notna(), None).tolist(),
+            frame["Description"].astype(str).where(frame["Description"].notna(), None).tolist(),
+            pd.to_numeric(frame["Amount"], errors='coerce').tolist(),
+        ]
+        return zip(*columns)
+
+    def _insert(self, conn, frame, fresh=False):
+        """Insert ledger rows, numbering them after the existing rows of the same day"""
+        days = _day_numbers(frame["Date"])
+        sequence = pd.Series(days).groupby(days).cumcount().to_numpy()
+        if not fresh:
+            # Continue each day's sequence after its current highest row id
+            for day in np.unique(days):
+                low = int(day) << ROWID_DAY_SHIFT
+                row = conn.execute(
+                    "SELECT MAX(rowid) FROM transactions WHERE rowid BETWEEN ? AND ?",
+                    (low, low + (1 << ROWID_DAY_SHIFT) - 1)
+                ).fetchone()
+                if row[0] is not None:
+                    sequence[days == day] += row[0] - low + 1
+        rowids = (days << ROWID_DAY_SHIFT) | sequence
+
+        for start in range(0, len(frame), INSERT_BATCH_ROWS):
+            stop = start + INSERT_BATCH_ROWS
+            conn.executemany(
+                "INSERT OR REPLACE INTO transactions (rowid, transaction_id, date, category, description, amount) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                self._rows(frame.iloc[start:stop], rowids[start:stop])
+            )
+
+    def _set_version(self, conn, version):
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('ledger_version', ?)", (str(version),))
+
+    def rebuild(self, ledger, version):
+        """Replace the index contents with the whole ledger
+
+        Rows are bulk loaded with the sync triggers dropped and the FTS table
+        is then rebuilt in one pass, which is much faster than per-row updates.
+        """
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN")
+            conn.execute("DROP TRIGGER IF EXISTS transactions_ai")
+            conn.execute("DROP TRIGGER IF EXISTS transactions_ad")
+            conn.execute("DELETE FROM transactions")
+            if not ledger.empty:
+                self._insert(conn, ledger, fresh=True)
+            conn.execute("INSERT INTO transactions_fts(transactions_fts) VALUES ('rebuild')")
+            for statement in filter(str.strip, SYNC_TRIGGERS.split("END;")):
+                conn.execute(statement + "END;")
+            self._set_version(conn, version)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        logger.info(f"Rebuilt search index with {len(ledger)} transactions")
+
+    def apply_changes(self, inserts, updates, deletes, version):
+        """Apply a ledger change set: remove deleted and updated rows, then add the new versions"""
+        with self._connect() as conn:
+            removed = [(str(tid),) for frame in (updates, deletes) for tid in frame["TransactionId"].tolist()]
+            conn.executemany("DELETE FROM transactions WHERE transaction_id = ?", removed)
+            for frame in (inserts, updates):
+                if not frame.empty:
+                    self._insert(conn, frame)
+            self._set_version(conn, version)
+        logger.info(f"Updated search index: {len(inserts)} inserts, {len(updates)} updates, {len(deletes)} deletes")
+
+    @staticmethod
+    def build_match(query):
+        """Build an FTS5 query matching every token of the user's query as a prefix"""
+        tokens = re.findall(r"\w+", query.lower())
+        return " AND ".join(f'"{token}"*' for token in tokens)
+
+    def search(self, query, start=None, end=None, limit=500):
+        """Find transactions whose description or category match all query tokens
+
+        start and end are inclusive dates. Returns matches newest first, at
+        most limit rows.
+        """
+        match = self.build_match(query)
+        if not match:
+            return pd.DataFrame(columns=["Date", "Category", "Description", "Amount"])
+
+        # Date bounds become a row id range, and FTS5 returns matches newest first
+        low = int(_day_numbers([start])[0]) << ROWID_DAY_SHIFT if start is not None else 0
+        high = ((int(_day_numbers([end])[0]) + 1) << ROWID_DAY_SHIFT) - 1 if end is not None else (1 << 62)
+        sql = (
+            "SELECT t.date, t.category, t.description, t.amount FROM transactions t "
+            "WHERE t.rowid IN (SELECT rowid FROM transactions_fts WHERE transactions_fts MATCH ? "
+            "AND rowid BETWEEN ? AND ? ORDER BY rowid DESC LIMIT ?) ORDER BY t.rowid DESC"
+        )
+        params = [match, low, high, int(limit)]
+
+        rows = self._connect().execute(sql, params).fetchall()
+        result = pd.DataFrame(rows, columns=["Date", "Category", "Description", "Amount"])
+        result["Date"] = pd.to_datetime(result["Date"])
+        return result
@@ -0,0 +1,201 @@
+import os
+import time
+import socket
+import pickle
+import sqlite3
+import threading
+from src.utils.logger import setup_logger
+
+logger = setup_logger("shared_store")
+
+
+class SharedStore:
+    """Key-value store and lease table in a SQLite file shared by all app replicas
+
+    Every value carries a version number that is bumped on each write, so
+    replicas can cheaply tell whether their local copy is out of date.
+
+    The database runs in WAL mode, which relies on shared memory between
+    the processes using it. Replicas must therefore run on one host (e.g.
+    processes or containers sharing a local volume); a SQLite file on a
+    network filesystem is not safe to share across hosts.
+    """
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+
+        db_dir = os.path.dirname(self.db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+            logger.info(f"Created directory: {db_dir}")
+
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kv ("
+                "key TEXT PRIMARY KEY, value BLOB, version INTEGER NOT NULL, updated_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS leases ("
+                "name TEXT PRIMARY KEY, owner TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the shared store for shared deployments, or None for single-process mode"""
+        if config.deployment_mode != "shared":
+            return None
+        return cls(config.shared_db_path)
+
+    def _connect(self):
+        """Get this thread's connection to the shared database"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        """Get (value, version) for a key, or None if it is not set"""
+        row = self._connect().execute("SELECT value, version FROM kv WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        return pickle.loads(row[0]), row[1]
+
+    def get_bytes(self, key):
+        """Get the raw stored bytes for a key, or None if it is not set"""
+        row = self._connect().execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def put(self, key, value):
+        """Store a picklable value and return its new version"""
+        return self.put_bytes(key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def put_bytes(self, key, data):
+        """Store raw bytes and return the new version"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT INTO kv (key, value, version, updated_at) VALUES (?, ?, 1, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, "
+                "version = kv.version + 1, updated_at = excluded.updated_at",
+                (key, sqlite3.Binary(data), time.time())
+            )
+            version = conn.execute("SELECT version FROM kv WHERE key = ?", (key,)).fetchone()[0]
+            conn.execute("COMMIT")
+            return version
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def version(self, key):
+        """Get the current version of a key (0 if it is not set)"""
+        row = self._connect().execute("SELECT version FROM kv WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def versions(self, prefix=""):
+        """Get {key: version} for all keys starting with prefix"""
+        rows = self._connect().execute(
+            "SELECT key, version FROM kv WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        ).fetchall()
+        return dict(rows)
+
+    def acquire_lease(self, name, owner, ttl):
+        """Try to take (or renew) a named lease for ttl seconds; return True on success"""
+        conn = self._connect()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute("SELECT owner, expires_at FROM leases WHERE name = ?", (name,)).fetchone()
+            if row is not None and row[0] != owner and row[1] > now:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "INSERT OR REPLACE INTO leases (name, owner, expires_at) VALUES (?, ?, ?)",
+                (name, owner, now + ttl)
+            )
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def release_lease(self, name, owner):
+        """Release a lease held by owner"""
+        self._connect().execute("DELETE FROM leases WHERE name = ? AND owner = ?", (name, owner))
+
+    def lease_holder(self, name):
+        """Get the owner of an unexpired lease, or None"""
+        row = self._connect().execute(
+            "SELECT owner FROM leases WHERE name = ? AND expires_at > ?", (name, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+
+class RefreshCoordinator:
+    """Coordinate refresh jobs so only one replica fetches from the providers
+
+    The replica that takes the job lease runs the refresh and publishes its
+    result; the other replicas wait for that result instead of fetching.
+    The leader renews its lease from a heartbeat thread while the refresh
+    runs, so a slow refresh never lets a second replica take over.
+    """
+    def __init__(self, store, owner=None, lease_ttl=600, poll_interval=1.0):
+        self.store = store
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+        self.lease_ttl = lease_ttl
+        self.poll_interval = poll_interval
+
+    def _heartbeat(self, lease_name, stopped):
+        """Renew the lease every third of its TTL until stopped is set"""
+        while not stopped.wait(self.lease_ttl / 3):
+            try:
+                if not self.store.acquire_lease(lease_name, self.owner, self.lease_ttl):
+                    logger.warning(f"{self.owner} lost the {lease_name} lease")
+                    return
+            except Exception as e:
+                logger.error(f"Error renewing {lease_name} lease: {e}")
+
+    def run(self, job_name, refresh_fn, wait_timeout=600):
+        """Run refresh_fn as leader, or wait for the leader's result
+
+        Returns (result, is_leader). Followers get the result published by the
+        leader during their wait, or None if the leader failed without
+        publishing or did not finish within wait_timeout seconds; an earlier
+        run's result is never returned as if it were fresh.
+        """
+        lease_name = f"refresh:{job_name}"
+        result_key = f"job:{job_name}"
+        seen_version = self.store.version(result_key)
+
+        if self.store.acquire_lease(lease_name, self.owner, self.lease_ttl):
+            logger.info(f"{self.owner} is leader for {job_name}")
+            stopped = threading.Event()
+            heartbeat = threading.Thread(target=self._heartbeat, args=(lease_name, stopped), daemon=True)
+            heartbeat.start()
+            try:
+                result = refresh_fn()
+                self.store.put(result_key, result)
+                return result, True
+            finally:
+                stopped.set()
+                heartbeat.join()
+                self.store.release_lease(lease_name, self.owner)
+
+        leader = self.store.lease_holder(lease_name)
+        logger.info(f"Waiting for {leader} to finish {job_name}")
+        deadline = time.time() + wait_timeout
+        while time.time() < deadline:
+            if self.store.version(result_key) != seen_version:
+                return self.store.get(result_key)[0], False
+            if self.store.lease_holder(lease_name) is None:
+                # The leader may have published just before releasing its lease
+                if self.store.version(result_key) != seen_version:
+                    return self.store.get(result_key)[0], False
+                logger.warning(f"{leader} released the {job_name} lease without publishing a result")
+                return None, False
+            time.sleep(self.poll_interval)
+
+        logger.warning(f"Timed out waiting for {leader} to finish {job_name}")
+        return None, False
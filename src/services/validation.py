@@ -0,0 +1,181 @@
+import time
+import numpy as np
+import pandas as pd
+from src.utils.logger import setup_logger
+
+logger = setup_logger("validation")
+
+FINANCE_REQUIRED_COLUMNS = ["Date", "Category", "Description", "Amount"]
+PRICE_REQUIRED_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+# Plausible ranges; rows outside them are quarantined
+MIN_DATE = pd.Timestamp("1970-01-01")
+MAX_FUTURE_DAYS = 366
+MAX_ABS_AMOUNT = 1e9
+
+# Missing business days between consecutive bars reported as a gap (allows for holidays)
+PRICE_GAP_BUSINESS_DAYS = 3
+
+
+def _blank(values):
+    """Mask of missing or whitespace-only values, stringifying only the candidates"""
+    blank = values.isna().to_numpy()
+    if values.dtype == object:
+        candidates = ~blank
+        blank[candidates] = values[candidates].astype(str).str.strip().to_numpy() == ""
+    return blank
+
+
+def parse_dates(values):
+    """Parse date values, trying ISO 8601 first, then one inferred format, then per-value parsing
+
+    Most sources send one format, so the slower parsers only see the few
+    values the vectorized ISO pass could not read. Unreadable values are NaT.
+    Returns the dates and a mask of the values that were not ISO dates.
+    """
+    values = pd.Series(values)
+    dates = pd.to_datetime(values, format='ISO8601', errors='coerce')
+    not_iso = dates.isna().to_numpy()
+    not_iso[not_iso] = ~_blank(values[not_iso])
+    for date_format in (None, 'mixed'):
+        retry = dates.isna().to_numpy() & not_iso
+        if not retry.any():
+            break
+        dates[retry] = pd.to_datetime(values[retry], format=date_format, errors='coerce')
+    return dates, not_iso
+
+
+def _report(dataset, source, total, valid, checks, warnings, started):
+    return {
+        "dataset": dataset,
+        "source": source,
+        "rows": int(total),
+        "valid": int(valid),
+        "quarantined": int(total - valid),
+        "checks": {name: int(count) for name, count in checks.items()},
+        "warnings": warnings,
+        "seconds": round(time.perf_counter() - started, 4),
+    }
+
+
+def _split(df, failures):
+    """Split a frame into valid rows and quarantined rows labelled with their failed checks
+
+    Also returns the boolean mask of failed rows.
+    """
+    failed = np.zeros(len(df), dtype=bool)
+    reasons = np.full(len(df), "", dtype=object)
+    for name, mask in failures.items():
+        mask = np.asarray(mask, dtype=bool)
+        failed |= mask
+        reasons[mask] = reasons[mask] + np.where(reasons[mask] == "", "", ";") + name
+    quarantined = df[failed].assign(Reason=reasons[failed])
+    return df[~failed], quarantined, failed
+
+
+def validate_finance(df, source):
+    """Run schema, date, amount and duplicate checks over one source's finance rows
+
+    Returns (valid rows, quarantined rows with a Reason column, report). Valid
+    rows are passed through unchanged, except that dates only readable by the
+    fallback parsers are rewritten as ISO dates so the ledger can read them.
+    Zero amounts are valid; missing amounts are quarantined, not zero-filled.
+    """
+    started = time.perf_counter()
+    if df.empty:
+        return df, df.assign(Reason=pd.Series(dtype=object)), _report("finance", source, 0, 0, {}, {}, started)
+
+    missing_columns = [col for col in FINANCE_REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        df = df.assign(**{col: None for col in missing_columns})
+
+    dates, not_iso = parse_dates(df["Date"])
+    rescued = dates.notna().to_numpy() & not_iso
+    if rescued.any():
+        df = df.copy()
+        df.loc[rescued, "Date"] = dates[rescued].dt.strftime('%Y-%m-%d').to_numpy()
+
+    amounts = pd.to_numeric(df["Amount"], errors='coerce')
+    blank_amounts = _blank(df["Amount"])
+    latest_date = pd.Timestamp.now().normalize() + pd.Timedelta(days=MAX_FUTURE_DAYS)
+
+    failures = {
+        "missing_column": np.full(len(df), bool({"Date", "Amount"} & set(missing_columns))),
+        "invalid_date": dates.isna().to_numpy(),
+        "date_out_of_range": ((dates < MIN_DATE) | (dates > latest_date)).to_numpy(),
+        "missing_amount": blank_amounts,
+        "invalid_amount": amounts.isna().to_numpy() & ~blank_amounts,
+        "amount_out_of_range": (amounts.abs() > MAX_ABS_AMOUNT).to_numpy(),
+    }
+
+    # Records must be unique by their source identity
+    id_column = "PageId" if "PageId" in df.columns else ("ID" if "ID" in df.columns else None)
+    if "Currency" in df.columns:
+        # Currencies are optional, but given codes must be ISO 4217 style
+        codes = df["Currency"].where(~_blank(df["Currency"]), "").astype(str).str.strip()
+        failures["invalid_currency"] = ((codes != "") & ~codes.str.fullmatch(r"[A-Za-z]{3}")).to_numpy()
+
+    if id_column:
+        failures["duplicate_id"] = (df[id_column].duplicated(keep="last") & df[id_column].notna()).to_numpy()
+
+    valid, quarantined, failed = _split(df, failures)
+    checks = {name: mask.sum() for name, mask in failures.items()}
+    warnings = {
+        "missing_category": int(valid["Category"].isna().sum()),
+        "zero_amount": int((amounts[~failed] == 0).sum()),
+        "rescued_dates": int(rescued.sum()),
+    }
+    if not id_column:
+        # Without ids, identical rows are told apart only by their order
+        warnings["duplicate_rows"] = int(valid.duplicated(subset=FINANCE_REQUIRED_COLUMNS).sum())
+    report = _report("finance", source, len(df), len(valid), checks, warnings, started)
+    if report["quarantined"]:
+        logger.warning(f"Quarantined {report['quarantined']} of {len(df)} {source} finance rows: {report['checks']}")
+    return valid, quarantined, report
+
+
+def validate_prices(df, ticker):
+    """Run schema, range, duplicate and gap checks over a ticker's price history
+
+    Returns (valid bars, quarantined bars with a Reason column, report). Gaps
+    of more than PRICE_GAP_BUSINESS_DAYS missing business days are reported
+    as warnings, since the bars around them are still valid.
+    """
+    started = time.perf_counter()
+    if df.empty:
+        return df, df.assign(Reason=pd.Series(dtype=object)), _report("stocks", ticker, 0, 0, {}, {}, started)
+
+    missing_columns = [col for col in PRICE_REQUIRED_COLUMNS if col not in df.columns]
+    if missing_columns:
+        valid, quarantined, _ = _split(df, {"missing_column": np.ones(len(df), dtype=bool)})
+        return valid, quarantined, _report("stocks", ticker, len(df), 0, {"missing_column": len(df)}, {}, started)
+
+    prices = df[PRICE_REQUIRED_COLUMNS].apply(pd.to_numeric, errors='coerce')
+    dates = pd.DatetimeIndex(pd.to_datetime(df.index, utc=True, errors='coerce')).tz_localize(None).normalize()
+
+    failures = {
+        "invalid_date": dates.isna(),
+        "duplicate_date": dates.duplicated(keep="last") & ~dates.isna(),
+        "missing_price": prices[["Open", "High", "Low", "Close"]].isna().any(axis=1).to_numpy(),
+        "non_positive_price": (prices[["Open", "High", "Low", "Close"]] <= 0).any(axis=1).to_numpy(),
+        "high_below_low": (prices["High"] < prices["Low"]).to_numpy(),
+        "negative_volume": (prices["Volume"] < 0).to_numpy(),
+    }
+    valid, quarantined, failed = _split(df, failures)
+    checks = {name: mask.sum() for name, mask in failures.items()}
+
+    # Gaps between consecutive valid bars, in business days
+    days = np.sort(dates[~failed].values.astype("datetime64[D]"))
+    missing_days = np.busday_count(days[:-1], days[1:]) - 1 if len(days) > 1 else np.array([], dtype=int)
+    gaps = missing_days > PRICE_GAP_BUSINESS_DAYS
+    warnings = {
+        "gaps": int(gaps.sum()),
+        "largest_gap_business_days": int(missing_days.max()) if len(missing_days) else 0,
+    }
+    if gaps.any():
+        warnings["first_gap_after"] = str(days[:-1][gaps][0])
+
+    report = _report("stocks", ticker, len(df), len(valid), checks, warnings, started)
+    if report["quarantined"] or warnings["gaps"]:
+        logger.warning(f"Validation of {ticker}: {report['quarantined']} bars quarantined, {warnings['gaps']} gaps")
+    return valid, quarantined, report
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.features import build_features
+from src.services.feature_store import FeatureStore
+
+
+def make_prices(count, seed=0):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    return pd.DataFrame(
+        {"Close": closes, "Volume": rng.integers(1e5, 1e6, count).astype(float)},
+        index=pd.bdate_range("2020-01-01", periods=count, name="Date")
+    )
+
+
+def assert_same_features(actual, expected):
+    assert list(actual.columns) == list(expected.columns)
+    assert (actual.index == expected.index).all()
+    # Wilder RSI smoothing never fully forgets, so appended rows match to rounding
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=1e-6, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize("appends", [[1], [1, 1, 1], [5, 40], [300]])
+def test_appends_match_full_rebuild(tmp_path, appends):
+    prices = make_prices(500 + sum(appends))
+    store = FeatureStore(str(tmp_path))
+
+    end = 500
+    assert store.update("AAA", prices.iloc[:end]) == end
+    for count in appends:
+        end += count
+        assert store.update("AAA", prices.iloc[:end]) == count
+    assert store.update("AAA", prices) == 0
+
+    assert_same_features(store.load("AAA"), build_features(prices))
+
+
+def test_adjusted_history_is_rebuilt(tmp_path):
+    prices = make_prices(300, seed=1)
+    store = FeatureStore(str(tmp_path))
+    store.update("AAA", prices.iloc[:250])
+
+    # A split adjustment changes the stored bars, so the whole history is recomputed
+    adjusted = prices.copy()
+    adjusted["Close"] /= 2
+    assert store.update("AAA", adjusted) == len(adjusted)
+    assert_same_features(store.load("AAA"), build_features(adjusted))
+
+
+def test_definition_change_starts_a_new_store(tmp_path):
+    prices = make_prices(200, seed=2)
+    FeatureStore(str(tmp_path)).update("AAA", prices)
+
+    store = FeatureStore(str(tmp_path), {"return_1d": ("return", {"periods": 1})})
+    assert store.update("AAA", prices) == len(prices)
+    assert list(store.load("AAA").columns) == ["Close", "return_1d"]
+    assert len(list((tmp_path / "AAA").glob("features_*.csv"))) == 1
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+from src.services.data_manager import DataManager
+
+
+def notion_rows(*rows):
+    return pd.DataFrame(rows, columns=["Date", "Category", "Description", "Amount", "PageId"])
+
+
+def sheet_rows(*rows):
+    return pd.DataFrame(rows, columns=["Date", "Category", "Description", "Amount"])
+
+
+@pytest.fixture
+def data_manager(tmp_path):
+    return DataManager(str(tmp_path / "raw"))
+
+
+def ledger_by_id(data_manager):
+    ledger = data_manager.load_finance_data()
+    return ledger.set_index("TransactionId")
+
+
+def change_ids(data_manager):
+    return {kind: set(frame["TransactionId"]) for kind, frame in data_manager.last_changes.items()
+            if kind in ("inserted", "updated", "deleted")}
+
+
+def test_merge_applies_inserts_updates_and_deletes(data_manager):
+    data_manager.combine_finance_data(
+        notion_rows(
+            ("2024-01-01", "Food", "Lunch", 12.5, "p1"),
+            ("2024-01-02", "Rent", "January rent", 900.0, "p2"),
+            ("2024-01-03", "Fun", "Cinema", 15.0, "p3"),
+        ),
+        sheet_rows(("2024-01-04", "Transport", "Train", 30.0)),
+    )
+    assert len(data_manager.load_finance_data()) == 4
+    assert data_manager.load_finance_state()["version"] == 1
+
+    # p2 edited, p3 removed, p4 added; the sheet failed to fetch this time
+    data_manager.combine_finance_data(
+        notion_rows(
+            ("2024-01-01", "Food", "Lunch", 12.5, "p1"),
+            ("2024-01-02", "Rent", "January rent", 950.0, "p2"),
+            ("2024-01-05", "Food", "Groceries", 40.0, "p4"),
+        ),
+        sheet_rows(),
+    )
+
+    changes = change_ids(data_manager)
+    assert changes == {"inserted": {"notion:p4"}, "updated": {"notion:p2"}, "deleted": {"notion:p3"}}
+
+    ledger = ledger_by_id(data_manager)
+    assert sorted(ledger[ledger["Source"] == "notion"].index) == ["notion:p1", "notion:p2", "notion:p4"]
+    assert ledger.loc["notion:p2", "Amount"] == 950.0
+    # Rows of a source that returned nothing are kept
+    assert (ledger["Source"] == "sheets").sum() == 1
+
+    state = data_manager.load_finance_state()
+    assert state["version"] == 2
+    assert state["last_changes"] == {"inserted": 1, "updated": 1, "deleted": 1, "categorized": 0}
+    assert data_manager.load_finance_aggregates()["total"] == pytest.approx(12.5 + 950.0 + 40.0 + 30.0)
+
+
+def test_unchanged_sync_keeps_the_version(data_manager):
+    rows = notion_rows(("2024-01-01", "Food", "Lunch", 12.5, "p1"))
+    data_manager.combine_finance_data(rows, sheet_rows())
+    data_manager.combine_finance_data(rows, sheet_rows())
+
+    assert data_manager.load_finance_state()["version"] == 1
+    assert all(frame.empty for frame in data_manager.last_changes.values())
+
+
+def test_identical_sheet_rows_stay_distinct(data_manager):
+    train = ("2024-01-04", "Transport", "Train", 30.0)
+    data_manager.combine_finance_data(notion_rows(), sheet_rows(train, train))
+    assert len(data_manager.load_finance_data()) == 2
+
+    data_manager.combine_finance_data(notion_rows(), sheet_rows(train))
+    changes = change_ids(data_manager)
+    assert not changes["inserted"] and not changes["updated"] and len(changes["deleted"]) == 1
+    assert len(data_manager.load_finance_data()) == 1
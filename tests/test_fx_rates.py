@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.fx_rates import RATE_LOOKBACK_DAYS, FxRateTable, normalize_currencies, required_rates
+
+
+def rate_series(rates):
+    return pd.Series(list(rates.values()), index=pd.DatetimeIndex(list(rates)))
+
+
+EUR_RATES = {"2024-01-02": 1.10, "2024-01-04": 1.12, "2024-01-08": 1.08}
+
+
+@pytest.fixture
+def table(tmp_path):
+    table = FxRateTable(str(tmp_path / "fx"), "USD")
+    table.update("EUR", lambda start: rate_series(EUR_RATES), "2024-01-02")
+    return table
+
+
+def test_convert_uses_the_rate_in_effect_on_each_date(table):
+    dates = ["2024-01-02", "2024-01-03", "2024-01-06", "2024-01-08", "2024-02-01"]
+    converted = table.convert([100.0] * 5, ["EUR"] * 5, dates)
+
+    # Days without a rate (weekends, holidays, after the last rate) use the previous one
+    np.testing.assert_allclose(converted, [110.0, 110.0, 112.0, 108.0, 108.0])
+
+
+def test_convert_edges(table):
+    converted = table.convert(
+        [100.0, 100.0, 100.0, 50.0, 100.0, "n/a"],
+        ["EUR", "EUR", "EUR", "USD", "GBP", "EUR"],
+        ["2023-12-25", None, "not a date", "2024-01-03", "2024-01-03", "2024-01-03"],
+    )
+
+    # Before the first rate: the first rate; undated rows: the latest rate
+    assert converted[0] == pytest.approx(110.0)
+    assert converted[1] == pytest.approx(108.0)
+    assert converted[2] == pytest.approx(108.0)
+    # Base currency amounts are unchanged; unknown currencies and amounts are NaN
+    assert converted[3] == 50.0
+    assert np.isnan(converted[4]) and np.isnan(converted[5])
+
+
+def test_update_fetches_only_missing_days(table):
+    requested = []
+
+    def fetch(start):
+        requested.append(pd.Timestamp(start))
+        return rate_series({"2024-01-08": 1.09, "2024-01-09": 1.07})
+
+    assert table.update("EUR", fetch, "2024-01-03") is not None
+    # The last stored day is fetched again, since it may have been partial
+    assert requested == [pd.Timestamp("2024-01-08")]
+    assert table.coverage("EUR") == (pd.Timestamp("2024-01-02"), pd.Timestamp("2024-01-09"))
+    np.testing.assert_allclose(table.convert([100.0], ["EUR"], ["2024-01-08"]), [109.0])
+
+    table.update("EUR", fetch, "2023-12-20")
+    assert requested[-1] == pd.Timestamp("2023-12-20") - pd.Timedelta(days=RATE_LOOKBACK_DAYS)
+    assert table.update("USD", fetch, "2020-01-01") is None
+
+
+def test_currency_codes_are_normalized():
+    assert normalize_currencies([" eur", None, "", "USD"], "USD").tolist() == ["EUR", "USD", "USD", "USD"]
+
+    frames = [
+        pd.DataFrame({"Date": ["2024-03-01", "2024-01-15", "2024-02-01"], "Currency": ["eur", "EUR", None]}),
+        pd.DataFrame({"Date": ["2023-12-01"], "Currency": ["GBP"]}),
+    ]
+    assert required_rates(frames, "USD") == {"EUR": pd.Timestamp("2024-01-15"), "GBP": pd.Timestamp("2023-12-01")}
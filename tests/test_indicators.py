@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.models.features import FEATURE_LOOKBACK, build_features
+from src.models.indicators import RSI_WINDOW, STATE_TAIL, compute_indicators, update_indicators, wilder_rsi
+
+
+def make_closes(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+
+
+def assert_same_indicators(actual, expected):
+    assert (actual.isna().to_numpy() == expected.isna().to_numpy()).all()
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=0, atol=1e-8, equal_nan=True)
+
+
+@pytest.mark.parametrize("history", [5, RSI_WINDOW, RSI_WINDOW + 1, STATE_TAIL, STATE_TAIL + 1, 1000])
+@pytest.mark.parametrize("appended", [1, 3, 64, 65, 500])
+def test_update_matches_full_recomputation(history, appended):
+    closes = make_closes(history + appended)
+    initial, state = compute_indicators(closes[:history])
+    new_rows, _ = update_indicators(state, closes[history:])
+
+    expected, _ = compute_indicators(closes)
+    assert_same_indicators(pd.concat([initial, new_rows], ignore_index=True), expected)
+
+
+def test_repeated_updates_match_full_recomputation():
+    closes = make_closes(3000, seed=1)
+    cuts = [0, 15, 199, 201, 1500, 2995, 3000]
+    frames, state = [], None
+    for begin, end in zip(cuts, cuts[1:]):
+        if state is None:
+            frame, state = compute_indicators(closes[begin:end])
+        else:
+            frame, state = update_indicators(state, closes[begin:end])
+        frames.append(frame)
+
+    expected, expected_state = compute_indicators(closes)
+    assert_same_indicators(pd.concat(frames, ignore_index=True), expected)
+    assert state["rows"] == expected_state["rows"]
+    assert state["avg_gain"] == pytest.approx(expected_state["avg_gain"], abs=1e-12)
+
+
+def test_rsi_feature_is_the_indicator_rsi():
+    closes = make_closes(600, seed=2)
+    prices = pd.DataFrame(
+        {"Close": closes, "Volume": 1.0},
+        index=pd.bdate_range("2020-01-01", periods=len(closes), name="Date")
+    )
+    features = build_features(prices)
+    indicators, _ = compute_indicators(closes)
+    np.testing.assert_allclose(features["rsi_14"].to_numpy(), indicators["RSI"].to_numpy(), equal_nan=True)
+
+    # Computing from the tail the feature store keeps matches the full history
+    tail = build_features(prices.iloc[-FEATURE_LOOKBACK:])
+    np.testing.assert_allclose(tail["rsi_14"].iloc[-1], features["rsi_14"].iloc[-1], rtol=1e-7)
+
+
+def test_wilder_rsi_of_short_history_is_undefined():
+    rsi, avg_gain, avg_loss = wilder_rsi(make_closes(RSI_WINDOW))
+    assert np.isnan(rsi).all()
+    assert avg_gain is None and avg_loss is None
@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.notion_decoder import (
+    DECODE_BLOCK,
+    EXTRACTORS,
+    FINANCE_SCHEMA,
+    PropertySpec,
+    decode_pages,
+    make_synthetic_pages,
+    parse_schema,
+)
+
+
+def make_page(page_id, **properties):
+    return {"object": "page", "id": page_id, "properties": properties}
+
+
+def finance_properties(date="2024-01-05", category="Food", description="Lunch", amount=12.5):
+    return {
+        "Date": {"type": "date", "date": {"start": date, "end": None}},
+        "Category": {"type": "select", "select": {"name": category}},
+        "Description": {"type": "title", "title": [{"type": "text", "plain_text": description}]},
+        "Amount": {"type": "number", "number": amount},
+    }
+
+
+def reference_decode(pages, schema=FINANCE_SCHEMA):
+    rows = []
+    for page in pages:
+        props = page.get("properties") or {}
+        rows.append([EXTRACTORS[spec.type](props.get(spec.property) or {}) for spec in schema] + [page.get("id")])
+    frame = pd.DataFrame(rows, columns=[spec.column for spec in schema] + ["PageId"], dtype=object)
+    for spec in schema:
+        if spec.type == "number":
+            frame[spec.column] = frame[spec.column].astype(float)
+    return frame
+
+
+def test_decodes_well_formed_pages():
+    pages = [make_page(f"p{i}", **finance_properties(amount=float(i))) for i in range(3)]
+    frame = decode_pages(pages)
+
+    assert list(frame.columns) == ["Date", "Category", "Description", "Amount", "PageId"]
+    assert frame["Amount"].dtype == float
+    assert frame["Amount"].tolist() == [0.0, 1.0, 2.0]
+    assert frame["Description"].tolist() == ["Lunch"] * 3
+    assert frame["PageId"].tolist() == ["p0", "p1", "p2"]
+
+
+def test_missing_properties_decode_to_none():
+    props = finance_properties()
+    del props["Category"], props["Amount"]
+    frame = decode_pages([make_page("p0", **finance_properties()), make_page("p1", **props), {"id": "p2"}])
+
+    assert frame["Category"].tolist() == ["Food", None, None]
+    assert frame["Date"].tolist() == ["2024-01-05", "2024-01-05", None]
+    assert np.isnan(frame["Amount"].iloc[1]) and np.isnan(frame["Amount"].iloc[2])
+    assert frame["PageId"].tolist() == ["p0", "p1", "p2"]
+
+
+def test_null_and_blank_values_decode_to_none():
+    props = finance_properties()
+    props["Date"]["date"] = None
+    props["Category"]["select"] = None
+    props["Description"]["title"] = []
+    props["Amount"]["number"] = None
+    frame = decode_pages([make_page("p0", **props), make_page("p1", Date=None), make_page("p2", **finance_properties(amount=0.0))])
+
+    assert frame[["Date", "Category", "Description"]].iloc[:2].isna().all().all()
+    assert np.isnan(frame["Amount"].iloc[0])
+    # A zero amount stays zero rather than reading as missing
+    assert frame["Amount"].iloc[2] == 0.0
+
+
+def test_extra_properties_follow_the_schema():
+    schema = FINANCE_SCHEMA + parse_schema("Currency:select, Tags:multi_select, Paid:checkbox, Note")
+    props = finance_properties()
+    props.update({
+        "Currency": {"type": "select", "select": {"name": "EUR"}},
+        "Tags": {"type": "multi_select", "multi_select": [{"name": "work"}, {"name": "travel"}]},
+        "Paid": {"type": "checkbox", "checkbox": True},
+        "Note": {"type": "rich_text", "rich_text": [{"plain_text": "client dinner"}]},
+        "Unlisted": {"type": "number", "number": 3},
+    })
+    frame = decode_pages([make_page("p0", **props), make_page("p1", **finance_properties())], schema)
+
+    assert list(frame.columns) == ["Date", "Category", "Description", "Amount", "Currency", "Tags", "Paid", "Note", "PageId"]
+    assert frame.iloc[0][["Currency", "Tags", "Paid", "Note"]].tolist() == ["EUR", "work, travel", True, "client dinner"]
+    assert frame.iloc[1][["Currency", "Tags", "Paid", "Note"]].tolist() == [None, None, None, None]
+
+
+def test_parse_schema_rejects_unknown_types():
+    assert parse_schema("Currency:select") == [PropertySpec("Currency", "Currency", "select")]
+    with pytest.raises(ValueError):
+        parse_schema("Currency:formula")
+
+
+def test_matches_per_value_extraction_across_blocks():
+    pages = make_synthetic_pages(DECODE_BLOCK * 2 + 7, seed=3)
+    # Malformed pages in one block only fall back for that block
+    pages[DECODE_BLOCK + 1]["properties"]["Category"] = None
+    pages[DECODE_BLOCK + 2]["properties"]["Description"] = {"type": "title", "title": [{"type": "text"}]}
+    pages[DECODE_BLOCK + 3]["properties"] = None
+
+    pd.testing.assert_frame_equal(decode_pages(pages), reference_decode(pages), check_dtype=False)
+    assert decode_pages([]).empty
@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+from src.models.portfolio import net_worth_series, parse_holdings, price_panel
+
+DATES = pd.date_range("2024-01-01", "2024-01-07", freq="D")
+
+
+def test_cash_flows_are_bucketed_by_day_and_accumulated():
+    cash_dates = pd.to_datetime([
+        "2023-12-15",  # before the first date: counts on the first date
+        "2024-01-03", "2024-01-03",
+        "2024-01-05",
+        None,          # undated flows are ignored
+        "2024-01-06",  # NaN flows are ignored
+        "2024-02-01",  # after the last date: counts on the last date
+    ])
+    flows = [100.0, -10.0, -5.0, -20.0, -1000.0, np.nan, 7.0]
+    series = net_worth_series(DATES, np.zeros((len(DATES), 0)), [], cash_dates, flows)
+
+    assert list(series.columns) == ["Holdings", "Cash", "NetWorth"]
+    assert series.index.name == "Date"
+    assert series["Cash"].tolist() == [100.0, 100.0, 85.0, 85.0, 65.0, 65.0, 72.0]
+    assert series["NetWorth"].tolist() == series["Cash"].tolist()
+
+
+def test_holdings_value_uses_the_last_close_on_or_before_each_day():
+    closes = {
+        # Weekend and holiday gaps carry the previous close forward
+        "AAA": pd.Series([10.0, 11.0, 12.0], index=pd.to_datetime(["2024-01-01", "2024-01-02", "2024-01-05"])),
+        # Worth nothing before its first bar
+        "BBB": pd.Series([50.0, np.nan, 55.0], index=pd.to_datetime(["2024-01-03", "2024-01-04", "2024-01-06"])),
+    }
+    panel = price_panel(closes, DATES)
+    np.testing.assert_array_equal(panel[:, 0], [10, 11, 11, 11, 12, 12, 12])
+    np.testing.assert_array_equal(panel[:, 1], [np.nan, np.nan, 50, 50, 50, 55, 55])
+
+    series = net_worth_series(DATES, panel, [2, 1], pd.to_datetime(["2024-01-04"]), [-30.0])
+    assert series["Holdings"].tolist() == [20, 22, 72, 72, 74, 79, 79]
+    assert series["NetWorth"].tolist() == [20, 22, 72, 42, 44, 49, 49]
+
+
+def test_parse_holdings_reads_columns_by_header():
+    rows = [
+        ["Ticker", "Shares", "Total Cost"],
+        ["aapl", "10", "$1,500.00"],
+        ["msft", "n/a"],
+        ["", "3", "1"],
+    ]
+    holdings = parse_holdings(rows)
+    assert holdings["Ticker"].tolist() == ["AAPL", "MSFT"]
+    np.testing.assert_array_equal(holdings["Quantity"], [10.0, np.nan])
+    np.testing.assert_array_equal(holdings["CostBasis"], [1500.0, np.nan])
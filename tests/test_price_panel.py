@@ -0,0 +1,89 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from src.services.price_panel import DAY_CHUNK, MIN_TICKER_CAPACITY, PANEL_FIELDS, PricePanel, attach_price_panel
+
+
+def make_prices(start, count, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    return pd.DataFrame(
+        {"Open": close - 0.5, "High": close + 1, "Low": close - 1, "Close": close, "Volume": rng.integers(1e5, 1e6, count)},
+        index=pd.bdate_range(start, periods=count, name="Date")
+    )
+
+
+@pytest.fixture
+def panel(tmp_path):
+    return PricePanel(str(tmp_path / "panel"))
+
+
+def assert_ticker_bars(view, ticker, prices):
+    bars = view.ticker(ticker)
+    assert (bars.index == prices.index).all()
+    np.testing.assert_array_equal(bars[PANEL_FIELDS].to_numpy(), prices[PANEL_FIELDS].to_numpy(dtype=float))
+
+
+def test_attach_before_first_write_is_none(panel):
+    assert panel.attach() is None
+
+
+def test_update_and_attach(panel):
+    prices = make_prices("2024-01-01", 30)
+    panel.update_ticker("AAA", prices, version="v1")
+
+    view = attach_price_panel(panel.panel_dir)
+    assert view.tickers == ["AAA"]
+    assert view.fields == PANEL_FIELDS
+    # Calendar days from the first to the last bar; weekends hold NaN
+    assert view.dates[0] == prices.index[0] and view.dates[-1] == prices.index[-1]
+    assert len(view.dates) == (prices.index[-1] - prices.index[0]).days + 1
+    assert np.isnan(view.field("Close")[5, 0])
+    assert_ticker_bars(view, "AAA", prices)
+    assert panel.load_index()["versions"] == {"AAA": "v1"}
+    # Readers map the file read-only
+    assert not view.values.flags.writeable
+
+
+def test_later_bars_extend_the_file_in_place(panel):
+    prices = make_prices("2024-01-01", 200, seed=1)
+    panel.update_ticker("AAA", prices.iloc[:20])
+    index = panel.load_index()
+
+    panel.update_ticker("AAA", prices)
+    extended = panel.load_index()
+    assert extended["file"] == index["file"]
+    assert extended["days"] > index["days"] and extended["days"] % DAY_CHUNK == 0
+    assert_ticker_bars(panel.attach(), "AAA", prices)
+
+    # A shorter history replaces the ticker's slot entirely
+    panel.update_ticker("AAA", prices.iloc[:10])
+    assert panel.attach().ticker("AAA").index[-1] == prices.index[9]
+
+
+def test_growth_copies_into_a_new_file(panel):
+    histories = {f"T{i:02d}": make_prices("2024-03-01", 40, seed=i) for i in range(MIN_TICKER_CAPACITY + 1)}
+    for ticker, prices in histories.items():
+        panel.update_ticker(ticker, prices)
+
+    index = panel.load_index()
+    assert index["capacity"] == MIN_TICKER_CAPACITY * 2
+    view = panel.attach()
+    assert view.tickers == list(histories)
+    for ticker, prices in histories.items():
+        assert_ticker_bars(view, ticker, prices)
+
+    # An earlier start date also moves the panel to a new file and removes the old one
+    before = panel.attach()
+    older = make_prices("2023-06-01", 300, seed=99)
+    panel.update_ticker("OLD", older)
+    moved = panel.load_index()
+    assert moved["file"] != index["file"] and moved["start"] < index["start"]
+    assert not os.path.exists(os.path.join(panel.panel_dir, index["file"]))
+    view = panel.attach()
+    assert_ticker_bars(view, "OLD", older)
+    assert_ticker_bars(view, "T00", histories["T00"])
+
+    # A view attached before the move keeps reading the file it mapped
+    assert_ticker_bars(before, "T00", histories["T00"])
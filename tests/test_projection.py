@@ -0,0 +1,62 @@
+import numpy as np
+import pytest
+from src.models.projection import (
+    MONTH_DAYS, PERCENTILES, SERIES, bands_frame, combine_batches, monthly_returns, simulate_batch
+)
+
+RETURN_POOL = np.random.default_rng(0).normal(0.005, 0.04, 250)
+SPENDING_POOL = np.random.default_rng(1).gamma(2.0, 500.0, 36)
+
+
+def simulate(seed, paths=2000, months=24, **kwargs):
+    return simulate_batch(seed, paths, months, RETURN_POOL, SPENDING_POOL, 10000.0, 500.0,
+                          monthly_income=1500.0, monthly_investment=200.0, **kwargs)
+
+
+def test_same_seed_reproduces_the_batch():
+    first, second = simulate(7), simulate(7)
+    np.testing.assert_array_equal(first["bands"], second["bands"])
+    np.testing.assert_array_equal(first["shortfall"], second["shortfall"])
+    assert not np.array_equal(first["bands"], simulate(8)["bands"])
+
+    # Spawned seed sequences give the same batches however they are scheduled
+    seeds = np.random.SeedSequence(7).spawn(3)
+    batches = [simulate(seed) for seed in seeds]
+    again = [simulate(seed) for seed in reversed(np.random.SeedSequence(7).spawn(3))][::-1]
+    for batch, repeat in zip(batches, again):
+        np.testing.assert_array_equal(batch["bands"], repeat["bands"])
+
+
+def test_batch_shape_and_starting_values():
+    result = simulate(3, paths=500, months=12, keep_final=True)
+    assert result["paths"] == 500
+    assert result["bands"].shape == (len(SERIES), len(PERCENTILES), 13)
+    assert result["shortfall"].shape == (13,)
+    # Month 0 is the starting balance on every path
+    np.testing.assert_allclose(result["bands"][:, :, 0], [[10000.0] * 5, [500.0] * 5, [10500.0] * 5])
+    # Bands are ordered and the final totals give the last month's total bands
+    assert (np.diff(result["bands"], axis=1) >= 0).all()
+    np.testing.assert_allclose(np.percentile(result["final"], PERCENTILES), result["bands"][2, :, -1])
+    assert "final" not in simulate(3, paths=500, months=12)
+
+
+def test_combined_bands_are_weighted_by_paths():
+    small, large = simulate(1, paths=1000), simulate(2, paths=3000)
+    combined = combine_batches([small, large])
+    assert combined["paths"] == 4000
+    np.testing.assert_allclose(combined["bands"], 0.25 * small["bands"] + 0.75 * large["bands"])
+
+    frame = bands_frame(combined)
+    assert frame.index.name == "Month" and len(frame) == 25
+    assert frame["Total p50"].iloc[-1] == pytest.approx(combined["bands"][2, 2, -1])
+    np.testing.assert_allclose(frame["Cash Shortfall"], combined["shortfall"])
+
+
+def test_monthly_returns_from_daily_values():
+    values = 100 * 1.001 ** np.arange(100)
+    returns = monthly_returns(values)
+    assert len(returns) == 99 - MONTH_DAYS + 1
+    np.testing.assert_allclose(returns, MONTH_DAYS * np.log(1.001))
+    # Short histories are scaled up from their daily returns
+    np.testing.assert_allclose(monthly_returns(values[:5]), MONTH_DAYS * np.log(1.001))
+    np.testing.assert_array_equal(monthly_returns([np.nan, 100.0]), [0.0])
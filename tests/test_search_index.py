@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+from src.services.search_index import TransactionSearchIndex
+
+
+def ledger_rows(*rows):
+    return pd.DataFrame(rows, columns=["TransactionId", "Date", "Category", "Description", "Amount"])
+
+
+LEDGER = ledger_rows(
+    ("t1", "2024-01-05", "Food", "Starbucks coffee", 4.5),
+    ("t2", "2024-02-10", "Food", "Star Diner lunch", 12.0),
+    ("t3", "2024-03-15", "Transport", "Train to Stockholm", 80.0),
+    ("t4", "2024-03-20", "Food", "Coffee beans", 15.0),
+    ("t5", None, "Fun", "Starlight cinema", 10.0),
+)
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TransactionSearchIndex(str(tmp_path / "search.db"))
+    index.rebuild(LEDGER, version=3)
+    return index
+
+
+def descriptions(result):
+    return result["Description"].tolist()
+
+
+def test_prefix_tokens_match_newest_first(index):
+    assert index.version() == 3
+    assert descriptions(index.search("star")) == ["Star Diner lunch", "Starbucks coffee", "Starlight cinema"]
+    # Every token must match, each as a prefix, in the description or the category
+    assert descriptions(index.search("star cof")) == ["Starbucks coffee"]
+    assert descriptions(index.search("food coffee")) == ["Coffee beans", "Starbucks coffee"]
+    assert descriptions(index.search("STO")) == ["Train to Stockholm"]
+    assert index.search("  !? ").empty
+
+
+def test_date_range_is_inclusive(index):
+    result = index.search("food", start=pd.Timestamp("2024-02-10"), end=pd.Timestamp("2024-03-20"))
+    assert descriptions(result) == ["Coffee beans", "Star Diner lunch"]
+    assert result["Date"].tolist() == [pd.Timestamp("2024-03-20"), pd.Timestamp("2024-02-10")]
+
+    # Undated rows only match unbounded searches
+    assert descriptions(index.search("star", start=pd.Timestamp("2024-01-01"))) == ["Star Diner lunch", "Starbucks coffee"]
+    assert descriptions(index.search("coffee", end=pd.Timestamp("2024-01-04"))) == []
+
+
+def test_limit_keeps_the_newest_matches(index):
+    assert descriptions(index.search("food", limit=2)) == ["Coffee beans", "Star Diner lunch"]
+
+
+def test_changes_are_applied_by_transaction_id(index):
+    inserts = ledger_rows(("t6", "2024-03-20", "Food", "Coffee to go", 3.0))
+    updates = ledger_rows(("t1", "2024-01-05", "Food", "Tea house", 4.5))
+    deletes = ledger_rows(("t4", "2024-03-20", "Food", "Coffee beans", 15.0))
+    index.apply_changes(inserts, updates, deletes, version=4)
+
+    assert index.version() == 4
+    assert descriptions(index.search("coffee")) == ["Coffee to go"]
+    assert descriptions(index.search("tea")) == ["Tea house"]
@@ -0,0 +1,56 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+from src.models.stock_analyzer import StockPredictor
+
+FEATURES = ['MA50', 'Volume']
+
+
+def make_datasets(count, rows=120, seed=0):
+    rng = np.random.default_rng(seed)
+    datasets = {}
+    for i in range(count):
+        length = rows - 7 * i
+        X = np.column_stack([rng.normal(100, 10, length), rng.normal(1e6, 1e5, length)])
+        y = X @ np.array([0.9, 2e-6]) + rng.normal(0, 1, length)
+        datasets[f"T{i}"] = pd.DataFrame({'MA50': X[:, 0], 'Volume': X[:, 1], 'Close': y})
+    return datasets
+
+
+def test_batch_matches_one_sklearn_fit_per_ticker():
+    datasets = make_datasets(6)
+    results = StockPredictor().train_batch(datasets, FEATURES, 'Close')
+
+    assert set(results) == set(datasets)
+    for ticker, data in datasets.items():
+        predictor = StockPredictor()
+        predictions = predictor.train_model(data, FEATURES, 'Close')
+        result = results[ticker]
+
+        np.testing.assert_allclose(result["predictions"], predictions, rtol=0, atol=1e-6)
+        assert result["metrics"]["mse"] == pytest.approx(predictor.metrics["mse"], abs=1e-8)
+        assert result["intercept"] == pytest.approx(predictor.model.intercept_, abs=1e-6)
+        np.testing.assert_allclose([result["coef"][feature] for feature in FEATURES], predictor.model.coef_, rtol=1e-6)
+
+
+def test_batch_fit_matches_sklearn_with_collinear_features():
+    data = make_datasets(1, rows=60, seed=2)["T0"]
+    data["MA50x2"] = data["MA50"] * 2
+    features = FEATURES + ["MA50x2"]
+    result = StockPredictor().train_batch({"T0": data}, features, 'Close')["T0"]
+
+    # Minimum-norm solution, like LinearRegression's lstsq
+    train = data.iloc[:48]
+    model = LinearRegression().fit(train[features], train['Close'])
+    np.testing.assert_allclose(result["predictions"], model.predict(data.iloc[48:][features]), rtol=0, atol=1e-6)
+
+
+def test_batch_skips_short_histories():
+    datasets = make_datasets(2)
+    datasets["short"] = datasets["T0"].iloc[:5]
+    datasets["empty"] = datasets["T0"].iloc[:0]
+
+    results = StockPredictor().train_batch(datasets, FEATURES, 'Close')
+    assert set(results) == {"T0", "T1"}
+    assert StockPredictor().train_batch({"short": datasets["short"]}, FEATURES, 'Close') == {}
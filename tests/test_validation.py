@@ -0,0 +1,69 @@
+import pandas as pd
+from src.services.data_manager import DataManager
+from src.services.refresh import validate_source
+from src.services.validation import validate_finance
+
+
+def finance_rows(*rows):
+    return pd.DataFrame(rows, columns=["Date", "Category", "Description", "Amount", "PageId"])
+
+
+def test_failing_rows_are_quarantined_with_reasons():
+    rows = finance_rows(
+        ("2024-01-01", "Food", "Lunch", 12.5, "ok"),
+        ("2024-01-02", "Fun", "Refund", 0, "zero"),
+        ("03/15/2024", "Food", "Dinner", 20.0, "us-date"),
+        ("not a date", "Food", "Bad date", 5.0, "bad-date"),
+        ("1900-01-01", "Food", "Too old", 5.0, "old"),
+        ("2024-01-03", "Food", "No amount", None, "blank"),
+        ("2024-01-03", "Food", "Text amount", "ten", "text"),
+        ("2024-01-03", "Food", "Huge", 5e9, "huge"),
+        ("2024-01-04", "Food", "First copy", 1.0, "dup"),
+        ("2024-01-05", "Food", "Second copy", 2.0, "dup"),
+    )
+    valid, quarantined, report = validate_finance(rows, "notion")
+
+    assert valid["PageId"].tolist() == ["ok", "zero", "us-date", "dup"]
+    # Dates only the fallback parsers understand are rewritten as ISO dates
+    assert valid.loc[valid["PageId"] == "us-date", "Date"].item() == "2024-03-15"
+    assert valid.loc[valid["PageId"] == "dup", "Description"].item() == "Second copy"
+
+    reasons = dict(zip(quarantined["PageId"], quarantined["Reason"]))
+    assert reasons == {
+        "bad-date": "invalid_date",
+        "old": "date_out_of_range",
+        "blank": "missing_amount",
+        "text": "invalid_amount",
+        "huge": "amount_out_of_range",
+        "dup": "duplicate_id",
+    }
+    assert report["rows"] == 10 and report["valid"] == 4 and report["quarantined"] == 6
+    assert report["warnings"]["zero_amount"] == 1
+    assert report["warnings"]["rescued_dates"] == 1
+
+
+def test_rows_can_fail_several_checks():
+    rows = pd.DataFrame({"Date": ["never"], "Amount": [None], "Currency": ["EURO"]})
+    valid, quarantined, report = validate_finance(rows, "sheets")
+
+    assert valid.empty
+    assert quarantined["Reason"].item() == "invalid_date;missing_amount;invalid_currency"
+    # Missing optional columns are added empty; only a missing Date or Amount fails the row
+    assert report["checks"]["missing_column"] == 0
+    assert quarantined["Category"].isna().all()
+
+    _, quarantined, report = validate_finance(pd.DataFrame({"Date": ["2024-01-01"], "Category": ["Food"]}), "sheets")
+    assert quarantined["Reason"].item() == "missing_column;missing_amount"
+
+
+def test_validate_source_writes_quarantine_and_quality_log(tmp_path):
+    data_manager = DataManager(str(tmp_path / "raw"))
+    rows = finance_rows(("2024-01-01", "Food", "Lunch", 12.5, "ok"), ("bad", "Food", "Bad", 1.0, "bad"))
+
+    valid, quarantined_count = validate_source(data_manager, validate_finance, "finance", "notion", rows)
+
+    assert valid["PageId"].tolist() == ["ok"] and quarantined_count == 1
+    quarantine_files = list((tmp_path / "raw" / "quarantine" / "finance").glob("notion_*.csv"))
+    assert len(quarantine_files) == 1
+    assert pd.read_csv(quarantine_files[0])["PageId"].tolist() == ["bad"]
+    assert data_manager.load_quality_metrics()[-1]["quarantined"] == 1
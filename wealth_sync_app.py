@@ -1,16 +1,13 @@
 import streamlit as st
 import os
-from dotenv import load_dotenv
 from src.components.sidebar import render_sidebar
 from pages.dashboard.main_dashboard import render_dashboard
 from pages.analytics.stock_analysis import render_stock_analysis
 from pages.analytics.financial_data import render_financial_data
+from pages.analytics.projections import render_projections
 from pages.settings.settings_page import render_settings
 from src.utils.logger import setup_logger
 
-# Load environment variables from .env file
-load_dotenv()
-
 # Set up logger
 logger = setup_logger("wealth_sync_app")
 
@@ -35,6 +32,8 @@ def main():
             render_stock_analysis()
         elif selected_page == "financial_data":
             render_financial_data()
+        elif selected_page == "projections":
+            render_projections()
         elif selected_page == "settings":
             render_settings()
         else: